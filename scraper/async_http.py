@@ -0,0 +1,132 @@
+import os
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+import requests
+from urllib3.util.retry import Retry
+
+from http_client import get_http_client, host_profile, POOL_SIZE
+from rate_limiter import get_rate_limiter
+
+# 💡 asyncio 파이프라인의 공급자별 동시 요청 수 상한 (ASYNC_<PROVIDER>_CONCURRENCY 환경변수로 조절)
+#    호출 간격은 동기 파이프라인과 같은 RateLimiter가 맞추고, 여기서는 동시에 열려 있는 요청 수만 제한합니다.
+CONCURRENCY = {
+    "naver": int(os.environ.get("ASYNC_NAVER_CONCURRENCY", "8")),
+    "supabase": int(os.environ.get("ASYNC_SUPABASE_CONCURRENCY", "4")),
+    "image": int(os.environ.get("ASYNC_IMAGE_CONCURRENCY", "16")),   # 이미지 서버 HEAD 검사 (공급자 없는 호스트)
+    "groq": int(os.environ.get("ASYNC_GROQ_CONCURRENCY", "4")),
+    "gemini": int(os.environ.get("ASYNC_GEMINI_CONCURRENCY", "2")),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 💡 urllib3 Retry 기본값과 같이 멱등 메서드만 다시 보냅니다. POST(insert)를 재시도하면 행이 중복 저장될 수 있습니다.
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+def _retry_delay(res, attempt):
+    """Retry-After 헤더(초 또는 HTTP 날짜)가 있으면 그만큼, 없으면 지수 백오프만큼 기다립니다."""
+    retry_after = res.headers.get("Retry-After")
+    if retry_after and res.status_code in Retry.RETRY_AFTER_STATUS_CODES:
+        try:
+            return Retry().parse_retry_after(retry_after)
+        except Exception:
+            pass
+    return 0.5 * (2 ** attempt)
+
+
+class AsyncHttpClient:
+    """httpx.AsyncClient 기반 비동기 HTTP 클라이언트. 타임아웃/속도 제한은 HttpClient와 같은 호스트 정책을 쓰고,
+    호스트별 통계도 HttpClient 표에 함께 기록합니다. 응답 객체는 httpx.Response(requests와 같은 주요 속성)이고,
+    네트워크 오류는 호출부가 그대로 쓸 수 있도록 requests 예외로 바꿔서 올립니다."""
+
+    def __init__(self):
+        self._clients = {}
+        self._slots = {}
+        # 💡 transport(method, url, **kwargs) 코루틴을 지정하면 실제 네트워크 대신 그쪽으로 요청을 보냅니다. (replay.py 재생용)
+        self.transport = None
+
+    def slot(self, provider):
+        """공급자별 동시 요청 수를 제한하는 세마포어 (이벤트 루프 안에서만 사용)"""
+        semaphore = self._slots.get(provider)
+        if semaphore is None:
+            semaphore = self._slots[provider] = asyncio.Semaphore(CONCURRENCY.get(provider, POOL_SIZE))
+        return semaphore
+
+    def _httpx(self, verify):
+        # 인증서 검사를 끄는 요청(이미지 HEAD 검사)은 별도 풀을 써서 다른 API 호출에는 영향이 없도록 합니다.
+        client = self._clients.get(verify)
+        if client is None:
+            import httpx
+            limits = httpx.Limits(max_connections=POOL_SIZE * 2, max_keepalive_connections=POOL_SIZE)
+            client = self._clients[verify] = httpx.AsyncClient(limits=limits, verify=verify)
+        return client
+
+    async def request(self, method, url, **kwargs):
+        host = urlparse(url).netloc.lower()
+        profile = host_profile(host)
+        kwargs.setdefault("timeout", profile["timeout"])
+        provider = profile.get("provider") or "image"
+
+        async with self.slot(provider):
+            if profile.get("provider"):
+                await get_rate_limiter(provider).acquire_async()
+            started = time.perf_counter()
+            failed, size = True, 0
+            try:
+                # HttpClient의 urllib3 Retry와 같은 정책: 멱등 메서드의 429/5xx는 Retry-After 또는 지수 백오프 후
+                # profile["retries"]번까지 다시 시도
+                retries = profile["retries"] if method.upper() in RETRY_METHODS else 0
+                for attempt in range(retries + 1):
+                    res = await (self.transport or self.send)(method, url, **kwargs)
+                    if res.status_code not in RETRY_STATUSES or attempt == retries:
+                        break
+                    await asyncio.sleep(_retry_delay(res, attempt))
+                failed = res.status_code >= 400
+                size = len(res.content or b"")
+                return res
+            finally:
+                get_http_client().record(host, time.perf_counter() - started, failed, size)
+
+    async def send(self, method, url, timeout=None, verify=True, allow_redirects=True, **kwargs):
+        """실제 네트워크 요청. requests 스타일 인자(allow_redirects 등)를 httpx에 맞게 바꿉니다."""
+        import httpx
+        try:
+            return await self._httpx(verify).request(method, url, timeout=timeout, follow_redirects=allow_redirects, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e))
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url, **kwargs):
+        return await self.request("HEAD", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self):
+        """이벤트 루프가 끝나기 전에 커넥션 풀을 닫습니다. (다음 asyncio.run에서는 새로 만듭니다)"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+        self._slots = {}
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_async_http_client():
+    """asyncio 파이프라인이 함께 쓰는 프로세스 단위 공용 AsyncHttpClient."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = AsyncHttpClient()
+        return _shared_client
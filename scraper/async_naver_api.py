@@ -0,0 +1,218 @@
+import asyncio
+
+from naver_api import (
+    NaverNewsAPI, LiveNewsWriter, RankOrderBatcher,
+    _scan_queries, _log_scan, _rank_targets, _deep_dive_display, _recent_articles,
+    _image_links, _image_candidates, _image_result, _print_log,
+)
+from orchestrator import run_categories_async
+from naver_quota import get_naver_quota
+from async_http import get_async_http_client
+from instrumentation import StageTimeline, span
+from token_budget import agenerate_chunked
+
+
+class AsyncNaverNewsAPI(NaverNewsAPI):
+    """NaverNewsAPI의 asyncio 구현 (opt-in, python main.py news --async).
+    프롬프트/필터/요약 묶음 규칙은 부모 클래스의 코드를 그대로 쓰고, 네이버 검색·이미지 검사·LLM·DB 쓰기만 코루틴으로 바꿔
+    스레드 대신 이벤트 루프 하나에서 대기 시간을 겹칩니다. 동시 요청 수는 async_http.CONCURRENCY의 공급자별 상한을 따릅니다."""
+
+    def run_categories(self, categories, parallel=1):
+        """카테고리들을 이벤트 루프 1개에서 실행하고 실행 요약 리스트를 돌려줍니다. (run_categories와 같은 형식)"""
+        return asyncio.run(self._run_categories(categories, parallel))
+
+    async def _run_categories(self, categories, parallel):
+        try:
+            return await run_categories_async("NEWS", categories, self.arun_pipeline, parallel=parallel)
+        finally:
+            # 비동기 커넥션 풀과 Lock은 이 이벤트 루프에 묶여 있으므로 루프가 끝나기 전에 정리합니다.
+            await self.model_manager.aclose()
+            await get_async_http_client().aclose()
+            self.naver_search.reset_async()
+
+    async def arun_pipeline(self, target_category):
+        """run_pipeline의 asyncio 버전. 저장한 기사 수를 돌려줍니다."""
+        timeline = StageTimeline("news", category=target_category)
+        try:
+            return await self._arun_pipeline_steps(target_category, timeline)
+        finally:
+            timeline.close()
+
+    async def _arun_pipeline_steps(self, target_category, timeline):
+        clock = self._pipeline_clock(target_category)
+        if not clock:
+            return 0
+        kst, now_kst, time_limit = clock
+
+        timeline.enter("step2_scan")
+        title_list = await self.ascan_stage(target_category, now_kst, time_limit)
+        if not title_list:
+            return 0
+
+        timeline.enter("step3_4_rank")
+        top_20_data = await self.arank_stage(title_list)
+        if not top_20_data:
+            return 0
+
+        timeline.enter("step5_9_stream")
+        saved_rows = await self.astream_stage(top_20_data, target_category, kst, time_limit)
+        return self._final_report(saved_rows)
+
+    async def ascan_stage(self, target_category, now_kst, time_limit):
+        """Step 2: 검색어별 광역 스캔을 동시에 실행합니다. (검색어마다 표식/창이 따로라서 서로 겹치지 않음)"""
+        print(f"  📡 Step 2: Multi-Query Broad Scan for '{target_category}'...")
+        queries = _scan_queries(target_category)
+        results = await asyncio.gather(
+            *(self.broad_scanner.ascan(q, now_kst, time_limit) for q in queries), return_exceptions=True
+        )
+        unique_titles = set()
+        for q, result in zip(queries, results):
+            if isinstance(result, Exception):
+                print(f"    ⚠️ Broad scan failed for '{q}': {result}")
+                continue
+            unique_titles.update(_log_scan(q, result))
+        return self._finish_scan(unique_titles)
+
+    async def arank_stage(self, title_list):
+        """Step 3 & 4: 로컬 빈도 계산은 그대로, LLM 검증 묶음만 동시에 요청합니다."""
+        candidates, subjects = self._count_candidates(title_list)
+        if not candidates:
+            return []
+        if subjects is None:
+            chunks = await agenerate_chunked(self.model_manager, candidates, self._subject_prompt,
+                                             validate=self._accepts_subject_validation)
+            subjects = self._merge_subject_validations([ai_res_text for _, ai_res_text in chunks])
+        return self._finish_rank(title_list, candidates, subjects)
+
+    async def astream_stage(self, top_20_data, target_category, kst, time_limit):
+        """Step 5~9: 주제마다 deep dive → 이미지 후보 검색을 코루틴 하나로 흘리고, 끝나는 대로 순위 순서로 풀어
+        이미지를 고른 뒤 묶음에 넣어 요약/저장합니다. (이미지 선점 순서가 동기 경로와 같아서 결과도 같음)"""
+        targets = _rank_targets(top_20_data)
+        print(f"  🔍 Step 5~9: Streaming {len(targets)} subjects (asyncio, up to {self.summary_batch_size} per request)...")
+        used_image_urls = set()
+        dropped = set()
+        batcher = RankOrderBatcher(dropped, self._fits_summary_batch)
+        writer = AsyncLiveNewsWriter(self.db)
+
+        async def prepare(item):
+            with span("news.deep_dive.subject", category=target_category, subject=item.get("name")):
+                result, log = await self._adeep_dive_subject(item, kst, time_limit)
+            _print_log(log)
+            if not result:
+                dropped.add(item["rank"])
+                return None
+            result["rank"] = item["rank"]
+            with span("news.image.subject", category=target_category, subject=item["name"]):
+                result, log = await self._aattach_image(result)
+            _print_log(log)
+            if not result:
+                dropped.add(item["rank"])
+            return result
+
+        async def summarize(batch):
+            with span("news.summarize.batch", category=target_category, size=len(batch)):
+                rows, log = await self._asummarize_batch(batch, target_category)
+            _print_log(log)
+            for row in rows:
+                await writer.aadd(row)
+
+        summaries = []
+
+        async def settle(ready):
+            # 풀려난 주제는 순위 순서대로 1개씩 이미지를 고르므로 앞 순위가 항상 먼저 가져갑니다.
+            for item in ready:
+                picked, log = await self._apick_image(item, used_image_urls)
+                _print_log(log)
+                if not picked:
+                    continue
+                for batch in batcher.add(picked):
+                    summaries.append(asyncio.create_task(summarize(batch)))
+
+        for prepared in asyncio.as_completed([prepare(item) for item in targets]):
+            # 탈락한 주제(None)도 넣어야 뒤 순위 묶음이 그 자리를 건너뛰고 풀립니다.
+            await settle(batcher.release(await prepared))
+        await settle(batcher.release_rest())
+        for batch in batcher.flush():
+            summaries.append(asyncio.create_task(summarize(batch)))
+        await asyncio.gather(*summaries)
+        return await writer.aclose()
+
+    async def _adeep_dive_subject(self, item, kst, time_limit):
+        name, score = item.get("name"), item.get("score")
+        log = [f"\n    🔎 Deep Dive: {name} (Score: {score})"]
+        try:
+            raw_articles = await self.naver_search.anews(name, display=_deep_dive_display(score), sort="sim", timeout=10)
+            valid_articles = _recent_articles(raw_articles, kst, time_limit)
+        except Exception as e:
+            log.append(f"      ⏭️ API Error. Skipping. ({e})")
+            return None, log
+        return self._pool_snippets(item, raw_articles, valid_articles, log)
+
+    async def _aattach_image(self, item):
+        log = [f"    🖼️ Image Search: {item['name']}"]
+        try:
+            img_items = await self.naver_search.aimages(item["name"], display=get_naver_quota().image_candidates(10), sort="sim", timeout=5)
+        except Exception as e:
+            return _image_result(item, "", log)
+        candidates = _image_links(img_items)
+        await self.image_validator.avalid_urls(candidates, limit=1)
+        return dict(item, image_candidates=candidates), log
+
+    async def _apick_image(self, item, used_image_urls):
+        item = dict(item)
+        candidates = _image_candidates(item.pop("image_candidates", []), used_image_urls)
+        best_img_url = await self.image_validator.afirst_valid(candidates)
+        if best_img_url:
+            used_image_urls.add(best_img_url)
+        return _image_result(item, best_img_url, [f"    🖼️ Image Pick: {item['name']}"])
+
+    async def _asummarize_subject(self, item, target_category):
+        log = [f"    📝 Generating AI summary & Category for: {item['name']}..."]
+        try:
+            ai_res_text = await self.model_manager.agenerate_json(prompt=self._summary_prompt(item),
+                                                                  validate=self._summary_validator(item, target_category))
+        except Exception as e:
+            log.append(f"      ❌ AI Generation Error for {item['name']}: {e}")
+            return None, log
+        return self._summary_row(item, ai_res_text, target_category, log)
+
+    async def _asummarize_batch(self, items, target_category):
+        if len(items) == 1:
+            row, log = await self._asummarize_subject(items[0], target_category)
+            return [row] if row else [], log
+
+        log = [f"    📝 Generating AI summaries for {len(items)} subjects in one request: {', '.join(item['name'] for item in items)}..."]
+        try:
+            ai_res_text = await self.model_manager.agenerate_json(prompt=self._batch_prompt(items),
+                                                                  validate=self._batch_validator(items, target_category))
+        except Exception as e:
+            ai_res_text = e
+        rows, retry = self._split_batch_response(items, ai_res_text, target_category, log)
+        retried = await asyncio.gather(*(self._asummarize_subject(item, target_category) for item in retry))
+        return self._merge_retries(rows, retry, retried, log)
+
+
+class AsyncLiveNewsWriter(LiveNewsWriter):
+    """LiveNewsWriter의 asyncio 버전. 여러 요약 태스크가 동시에 넣어도 저장은 한 번에 하나씩 순서대로 합니다."""
+
+    def __init__(self, db):
+        super().__init__(db)
+        self._write_lock = asyncio.Lock()
+
+    async def aadd(self, row):
+        async with self._write_lock:
+            if self._accepts(row) and len(self.pending) >= self.FLUSH_SIZE:
+                await self._aflush()
+
+    async def _aflush(self):
+        batch = self._take_batch()
+        if not batch:
+            return
+        with span("news.persist.flush", size=len(batch)):
+            saved_count = await self.db.asave_live_news_batch(batch)
+        self._record_saved(batch, saved_count)
+
+    async def aclose(self):
+        async with self._write_lock:
+            await self._aflush()
+        return list(self.saved.values())
@@ -0,0 +1,128 @@
+import os
+from email.utils import parsedate_to_datetime
+
+from local_cache import JsonFileCache
+from instrumentation import count
+from text_normalize import clean_items
+
+# 💡 증분 스캔 상태(쿼리별 최신 기사 위치 + 최근 24시간 제목 창) 보관 시간. 하루 넘게 안 돌면 처음부터 다시 스캔합니다.
+STATE_TTL = 26 * 3600
+WINDOW_SECONDS = 24 * 3600
+
+# 💡 표식(high-water mark)까지 따라 내려갈 최대 페이지 수 (일일 호출 한도 보호). NAVER_INCREMENTAL_SCAN=0이면 매번 전체 스캔.
+MAX_PAGES = int(os.environ.get("NAVER_SCAN_MAX_PAGES", "3"))
+INCREMENTAL = os.environ.get("NAVER_INCREMENTAL_SCAN", "1") != "0"
+
+PAGE_SIZE = 100          # 네이버 검색 API의 display 최대값
+MIN_PAGE_SIZE = 20
+MAX_START = 1000         # 네이버 검색 API의 start 최대값
+
+
+class IncrementalBroadScanner:
+    """Step 2 광역 스캔을 증분으로 수행합니다. 지난 실행 이후 새로 나온 기사만 받아서, 저장해둔 24시간 제목 창과 합칩니다."""
+
+    def __init__(self, naver_search, store=None):
+        self.naver_search = naver_search
+        self.store = store or JsonFileCache("broad_scan_state.json", STATE_TTL, persist=INCREMENTAL)
+
+    def _first_page_size(self, state, now_ts):
+        # 지난 실행의 시간당 신규 기사 수로 이번에 나올 기사 수를 추정해 첫 페이지 크기를 줄입니다.
+        if not state:
+            return PAGE_SIZE
+        hours = max(0.0, (now_ts - state["scanned_at"]) / 3600)
+        expected = state.get("rate", PAGE_SIZE) * hours * 1.2 + 10
+        return int(max(MIN_PAGE_SIZE, min(PAGE_SIZE, expected)))
+
+    def scan(self, query, now, time_limit):
+        """(최근 24시간 제목 목록, 이번에 새로 받은 기사 수, 호출한 페이지 수)를 돌려줍니다. HTTP 오류는 예외로 올립니다."""
+        steps = self._scan_steps(query, now, time_limit)
+        try:
+            page = next(steps)
+            while True:
+                page = steps.send(self.naver_search.news(query, **page))
+        except StopIteration as done:
+            return done.value
+
+    async def ascan(self, query, now, time_limit):
+        """scan()의 asyncio 버전 (페이지 요청만 비동기이고 표식/창 계산은 같은 코드를 씁니다)."""
+        steps = self._scan_steps(query, now, time_limit)
+        try:
+            page = next(steps)
+            while True:
+                page = steps.send(await self.naver_search.anews(query, **page))
+        except StopIteration as done:
+            return done.value
+
+    def _scan_steps(self, query, now, time_limit):
+        # 네트워크 없이 스캔 절차만 담은 생성기: 받을 페이지 인자를 yield하고 그 페이지의 items를 send로 받습니다.
+        now_ts, limit_ts = now.timestamp(), time_limit.timestamp()
+        state = self.store.get(f"mark:{query}")
+        window = [entry for entry in self.store.get(f"window:{query}") or [] if entry[0] >= limit_ts]
+        seen_links = {entry[2] for entry in window}
+
+        fresh = []
+        # 💡 target: 지금 따라 내려가는 표식(처음엔 지난 최신 기사). gap: 지난 실행이 페이지 한도 때문에 못 받은 구간의 끝.
+        #    covered는 맨 위부터 빈틈없이 받은 마지막 위치(start 기준)입니다.
+        target, gap = state, (state or {}).get("gap")
+        start, display, pages, covered = 1, self._first_page_size(state, now_ts), 0, 0
+        reached = exhausted = False
+        while start <= MAX_START:
+            items = yield {"display": display, "sort": "date", "start": start, "timeout": 5}
+            pages += 1
+            reached = False
+            covered = start + len(items) - 1
+            for offset, item in enumerate(clean_items(items)):
+                link = item.get("link", "")
+                pub_ts = parsedate_to_datetime(item["pubDate"]).timestamp()
+                if target and (link == target["link"] or pub_ts < target["pub_ts"]):
+                    reached, covered = True, start + offset
+                    break
+                if pub_ts < limit_ts:
+                    # 24시간 창 밖이면 그보다 오래된 빈틈도 받을 필요가 없습니다.
+                    reached, gap = True, None
+                    break
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+                fresh.append([pub_ts, item["clean_title"], link])
+
+            exhausted = len(items) < display
+            if exhausted:
+                gap = None
+            if reached and gap:
+                # 지난 최신 기사 아래로 지난번에 받은 구간은 건너뛰고, 빈틈 위치부터 이어서 받습니다. (1개 겹치게)
+                covered += gap["depth"] - 1
+                target, gap, reached = gap, None, False
+                if pages < MAX_PAGES and covered <= MAX_START:
+                    start, display = covered, PAGE_SIZE
+                    continue
+                break
+            # 첫 실행(표식 없음)은 예전처럼 한 페이지만, 이후에는 표식에 닿을 때까지 페이지를 넘깁니다.
+            if reached or not state or exhausted or pages >= MAX_PAGES:
+                break
+            start += display
+            display = PAGE_SIZE
+
+        # 표식에 닿기 전에 페이지 한도에서 멈췄으면 그 아래가 빈틈으로 남습니다. 다음 실행이 이어 받도록 남겨 두고 집계합니다.
+        truncated = bool(state) and not reached and not exhausted
+        count("naver.scan_pages", pages, query=query)
+        count("naver.scan_new_items", len(fresh), query=query)
+        if truncated:
+            count("naver.scan_truncated", 1, query=query)
+
+        window = sorted(fresh + window, key=lambda entry: entry[0], reverse=True)
+        if window:
+            newest = window[0]
+            # 시간당 신규 기사 수: 지난 스캔 이후 경과 시간(첫 실행이면 받은 기사들이 걸친 시간) 기준
+            covered_since = state["scanned_at"] if state else min((entry[0] for entry in fresh), default=now_ts)
+            rate = len(fresh) / max(0.25, (now_ts - covered_since) / 3600)
+            mark = {"pub_ts": newest[0], "link": newest[2], "scanned_at": now_ts, "rate": rate}
+            end = gap or target
+            if truncated and covered < MAX_START:
+                mark["gap"] = {"pub_ts": end["pub_ts"], "link": end["link"], "depth": covered}
+            self.store.set(f"mark:{query}", mark)
+            self.store.set(f"window:{query}", window)
+        return [entry[1] for entry in window], len(fresh), pages
+
+    def save(self):
+        self.store.save()
@@ -1,29 +1,75 @@
 import os
 import json
-import requests
 from datetime import datetime, timedelta
 import pytz
 import urllib3
 import re
-import time
-from urllib.parse import quote
 
 # ✅ 똑똑해진 ModelManager 임포트
 from model_manager import ModelManager 
+from image_validator import get_image_validator
+from http_client import get_http_client
+from naver_search import get_naver_search
+from naver_quota import get_naver_quota
+from text_normalize import clean_items
+from local_cache import JsonFileCache
+from instrumentation import stage, span
+from concurrency import run_parallel
+from orchestrator import run_categories
+from delta_sync import plan_delta, apply_delta
+from token_budget import fit_items, generate_chunked, MAX_OUTPUT_TOKENS
 
 # SSL 프록시 접속 경고창 영구 숨김 처리
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# 💡 K-Culture 하위 카테고리 동시 처리 수 (1이면 순차). 호출 간격은 공급자별 RateLimiter가 맞춥니다.
+KCULTURE_PARALLEL = int(os.environ.get("KCULTURE_PARALLEL", "4"))
+
+# 번역 메모 키/조회수 교체용 패턴
+_COUNT_PATTERN = re.compile(r'\d[\d,]*')
+_VIEWS_PATTERN = re.compile(r'Views:\s*[\d,]+')
+
+
+def _json_list(ai_res_text):
+    """AI 응답 JSON에서 항목 리스트를 꺼냅니다. (딕셔너리로 감싸져서 와도 안쪽 리스트를 강제로 꺼냄)"""
+    items = json.loads(ai_res_text, strict=False)
+    if isinstance(items, dict):
+        items = next(iter(items.values())) if items else []
+        if isinstance(items, dict):
+            items = [items]
+    return items
+
+
+def _filled(value):
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _translation_complete(batch, ai_res_text):
+    # 묶음의 모든 id가 (빈 제목 없이) 번역되어 온 응답만 LLM 캐시에 남깁니다.
+    translated_ids = {str(t.get('id')) for t in _json_list(ai_res_text) if isinstance(t, dict) and _filled(t.get('title'))}
+    return all(item['id'] in translated_ids for item in batch)
+
+
+def _memoizable(category, translated):
+    """메모에 남겨도 되는 번역인지: 제목이 비어 있지 않고, info를 재구성하는 k-pop은 info도 비어 있지 않아야 합니다."""
+    return _filled(translated.get('title')) and (category != 'k-pop' or _filled(translated.get('info')))
+
 class ChartAPI:
     def __init__(self, db):
         self.db = db
+        self.http = get_http_client()
         self.kobis_key = os.environ.get("KOBIS_API_KEY") 
         self.tmdb_key = os.environ.get("TMDB_API_KEY") 
         self.naver_id = os.environ.get("NAVER_CLIENT_ID")
         self.naver_secret = os.environ.get("NAVER_CLIENT_SECRET")
         
         # ✅ 복잡한 제미나이 클라이언트 초기화 삭제. ModelManager만 부르면 끝!
-        self.model_manager = ModelManager()
+        self.model_manager = ModelManager(db)
+        self.image_validator = get_image_validator()
+        self.naver_search = get_naver_search()
+
+        # 💡 차트 제목 번역 메모 (한 번 번역한 제목은 다시 LLM에 보내지 않음)
+        self.translation_memo = JsonFileCache("chart_translations.json", default_ttl=30 * 24 * 3600)
 
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0 Safari/537.36",
@@ -31,41 +77,47 @@ class ChartAPI:
         }
 
     def update_chart(self, category):
+        """카테고리 1개의 차트(또는 K-Culture 매거진)를 갱신하고, 저장한 항목 수를 돌려줍니다."""
         # 💡 K-Culture는 별도의 AI 매거진 파이프라인을 타고 live_news 테이블로 직행합니다.
         if category == 'k-culture':
-            self._update_k_culture_magazine()
-            return
+            with stage("chart.k-culture_magazine"):
+                return self._update_k_culture_magazine()
 
         # 기존 차트 로직 (live_rankings 테이블 저장용)
         results = []
-        if category == 'k-movie':
-            results = self._get_kobis_box_office()
-        elif category == 'k-drama':
-            results = self._get_tmdb_ranking(is_drama=True)
-        elif category == 'k-entertain':
-            results = self._get_tmdb_ranking(is_drama=False)
-        elif category == 'k-pop':
-            results = self._get_music_chart()
+        with stage("chart.fetch"):
+            if category == 'k-movie':
+                results = self._get_kobis_box_office()
+            elif category == 'k-drama':
+                results = self._get_tmdb_ranking(is_drama=True)
+            elif category == 'k-entertain':
+                results = self._get_tmdb_ranking(is_drama=False)
+            elif category == 'k-pop':
+                results = self._get_music_chart()
 
         if results:
-            results = self._translate_chart_titles(results, category)
-            self.db.save_chart_results(category, results)
+            with stage("chart.translate"):
+                results = self._translate_chart_titles(results, category)
+            with stage("chart.save"):
+                self.db.save_chart_results(category, results)
             print(f"  ✅ Chart updated for {category} ({len(results)} items saved).")
+            return len(results)
         else:
             print(f"  ⚠️ No chart data retrieved for {category}.")
+            return 0
 
     # 🚀 AI K-Culture 매거진 에디터 파이프라인 (델타 업데이트 & 15개 항시 유지)
     def _update_k_culture_magazine(self):
         print("  🚀 Starting K-Culture Magazine Delta Update with Amazon Monetization...")
         if not self.naver_id or not self.naver_secret:
             print("  ❌ Error: NAVER_CLIENT_ID or NAVER_CLIENT_SECRET is missing.")
-            return
+            return 0
 
         supabase_url = os.environ.get("SUPABASE_URL")
         supabase_key = os.environ.get("SUPABASE_KEY")
         if not supabase_url or not supabase_key:
             print("  ❌ Error: SUPABASE_URL or SUPABASE_KEY is missing.")
-            return
+            return 0
 
         supa_headers = {
             "apikey": supabase_key,
@@ -73,11 +125,6 @@ class ChartAPI:
             "Content-Type": "application/json"
         }
 
-        naver_headers = {
-            "X-Naver-Client-Id": self.naver_id,
-            "X-Naver-Client-Secret": self.naver_secret
-        }
-
         categories = {
             'k-food': '먹거리 유행',
             'k-beauty': '뷰티 트렌드',
@@ -85,197 +132,201 @@ class ChartAPI:
             'k-lifestyle': '라이프스타일 트렌드'
         }
 
-        for sub_cat, query in categories.items():
-            print(f"\n  [{sub_cat}] Fetching news & analyzing trends...")
-            try:
-                # 0. 기존 DB에서 현재 데이터 가져오기 (비교용)
-                get_url = f"{supabase_url}/rest/v1/live_news?category=eq.{sub_cat}&select=id,title,summary,score,likes"
-                old_res = requests.get(get_url, headers=supa_headers)
-                old_items = old_res.json() if old_res.status_code == 200 else []
-                
-                # 기존 타이틀을 딕셔너리로 저장하여 매칭에 사용
-                old_dict = {item['title']: item for item in old_items}
-                old_titles_list = list(old_dict.keys())
+        def update_one(sub_cat):
+            with span("kculture.subcategory", sub_category=sub_cat):
+                return self._update_k_culture_subcategory(sub_cat, categories[sub_cat], supabase_url, supa_headers)
 
-                # 1. 네이버 뉴스 검색 API 호출 (한국어 원문 수집)
-                news_url = f"https://openapi.naver.com/v1/search/news.json?query={quote(query)}&display=25&sort=sim"
-                news_res = requests.get(news_url, headers=naver_headers, timeout=10)
-                news_res.raise_for_status()
-                items = news_res.json().get('items', [])
+        # 하위 카테고리끼리는 서로 독립이므로 동시에 처리합니다. (로그는 하위 카테고리별로 모아서 출력)
+        summary = run_categories("k-culture", list(categories), update_one, parallel=KCULTURE_PARALLEL)
+        total_processed = sum(row["items"] for row in summary)
 
-                snippets = [{"title": re.sub(r'<[^>]+>', '', i['title']), "desc": re.sub(r'<[^>]+>', '', i['description'])} for i in items]
+        self.image_validator.save()
+        print("  🎉 K-Culture Magazine Delta Update Complete!")
+        return total_processed
 
-                # 2. 프롬프트 (15개 타겟으로 수정)
-                prompt = f"""
-                You are a K-Culture Magazine Editor. Analyze these recent Korean news snippets about {sub_cat} and identify the Top 20 hottest trends.
-                
-                CRITICAL RULE FOR FILTERING:
-                You MUST ONLY extract trends that perfectly match the '{sub_cat}' category. 
-                If an article mentions '{sub_cat}' but its main focus shifts to another category, COMPLETELY IGNORE IT.
-                If there are not enough relevant trends, just return a smaller array. DO NOT invent or use unrelated news.
-                
-                CRITICAL RULE FOR TITLES:
-                Here are the previous trend titles: {old_titles_list}
-                If a current trend is about the EXACT SAME TOPIC as one of the previous titles, you MUST use the EXACT SAME string from the previous titles list. Do not rephrase it.
-                If it is a completely new trend, create a new Catchy English Title.
-
-                ✅ CRITICAL RULE FOR SUMMARY (AEO Optimization):
-                The 'summary' field MUST strictly follow this exact structure:
-                1. A brief 1-2 sentence English explanation.
-                2. Use bullet points (-) for the 2 most important facts.
-                3. End with a strict Q&A format starting with "Q: Why is this trending?\nA: [1-sentence answer]".
-
-                Return ONLY a valid JSON array of objects. Format:
-                [
-                  {{
-                      "title": "Exact old title OR Catchy new English title",
-                      "summary": "Brief explanation...\n\n- Key Fact 1...\n- Key Fact 2...\n\nQ: Why is this trending?\nA: Because...",
-                      "keyword": "A short exact Korean noun for image search",
-                      "amazon_keyword": "1-4 English words to buy this on Amazon. MUST STRICTLY BELONG TO THE '{sub_cat}' CATEGORY",
-                      "score": <integer from 20 (1st) down to 1>
-                  }}
-                ]
-                
-                News snippets: {json.dumps(snippets, ensure_ascii=False)}
-                """
-                
-                # ModelManager로 텍스트 생성 요청
-                ai_res_text = self.model_manager.generate_json(prompt=prompt)
-                
-                if not ai_res_text:
-                    print("      ⏭️ [DISCARDED] AI API failed to return JSON.")
-                    continue
-                
-                # JSON 파싱 (strict=False 추가)
-                trends = json.loads(ai_res_text, strict=False)
+    def _update_k_culture_subcategory(self, sub_cat, query, supabase_url, supa_headers):
+        """K-Culture 하위 카테고리 1개의 뉴스 수집 → AI 트렌드 분석 → 델타 업데이트. 처리한 트렌드 수를 돌려줍니다."""
+        print(f"\n  [{sub_cat}] Fetching news & analyzing trends...")
+        try:
+            # 0. 기존 DB에서 현재 데이터 가져오기 (비교용)
+            # 업서트할 때 기존 행을 통째로 다시 보내므로 필요한 컬럼을 모두 받아 둡니다.
+            get_url = (f"{supabase_url}/rest/v1/live_news?category=eq.{sub_cat}"
+                       f"&select=id,category,keyword,title,summary,link,image_url,score,likes,amazon_keyword,created_at")
+            old_res = self.http.get(get_url, headers=supa_headers)
+            old_items = old_res.json() if old_res.status_code == 200 else []
+            
+            # 기존 타이틀을 딕셔너리로 저장하여 매칭에 사용
+            old_dict = {item['title']: item for item in old_items}
+            old_titles_list = list(old_dict.keys())
+
+            # 1. 네이버 뉴스 검색 API 호출 (한국어 원문 수집)
+            items = self.naver_search.news(query, display=get_naver_quota().display(25, minimum=10), sort="sim", timeout=10)
 
-                # 딕셔너리로 응답이 왔다면 안쪽에 있는 리스트를 강제로 꺼냄
-                if isinstance(trends, dict):
-                    trends = next(iter(trends.values())) if trends else []
-                    if isinstance(trends, dict):
-                        trends = [trends]
+            snippets = [{"title": i['clean_title'], "desc": i['clean_description']} for i in clean_items(items)]
 
-                # 3. 데이터 비교 및 델타 업데이트 실행
-                processed_count = 0 
+            # 2. 프롬프트 (15개 타겟으로 수정)
+            def build_prompt(batch):
+                return f"""
+            You are a K-Culture Magazine Editor. Analyze these recent Korean news snippets about {sub_cat} and identify the Top 20 hottest trends.
+            
+            CRITICAL RULE FOR FILTERING:
+            You MUST ONLY extract trends that perfectly match the '{sub_cat}' category. 
+            If an article mentions '{sub_cat}' but its main focus shifts to another category, COMPLETELY IGNORE IT.
+            If there are not enough relevant trends, just return a smaller array. DO NOT invent or use unrelated news.
+            
+            CRITICAL RULE FOR TITLES:
+            Here are the previous trend titles: {old_titles_list}
+            If a current trend is about the EXACT SAME TOPIC as one of the previous titles, you MUST use the EXACT SAME string from the previous titles list. Do not rephrase it.
+            If it is a completely new trend, create a new Catchy English Title.
+
+            ✅ CRITICAL RULE FOR SUMMARY (AEO Optimization):
+            The 'summary' field MUST strictly follow this exact structure:
+            1. A brief 1-2 sentence English explanation.
+            2. Use bullet points (-) for the 2 most important facts.
+            3. End with a strict Q&A format starting with "Q: Why is this trending?\nA: [1-sentence answer]".
+
+            Return ONLY a valid JSON array of objects. Format:
+            [
+              {{
+                  "title": "Exact old title OR Catchy new English title",
+                  "summary": "Brief explanation...\n\n- Key Fact 1...\n- Key Fact 2...\n\nQ: Why is this trending?\nA: Because...",
+                  "keyword": "A short exact Korean noun for image search",
+                  "amazon_keyword": "1-4 English words to buy this on Amazon. MUST STRICTLY BELONG TO THE '{sub_cat}' CATEGORY",
+                  "score": <integer from 20 (1st) down to 1>
+              }}
+            ]
+            
+            News snippets: {json.dumps(batch, ensure_ascii=False)}
+            """
+
+            # 💡 스니펫이 프롬프트 예산을 넘으면 관련도 순으로 앞쪽만 보냅니다.
+            fitted = fit_items(snippets, build_prompt)
+            if len(fitted) < len(snippets):
+                print(f"      ✂️ Trimmed snippets {len(snippets)} → {len(fitted)} to fit the prompt budget.")
 
-                for t in trends:
-                    # ✅ [수정] 15개가 채워지면 루프 종료
-                    if processed_count >= 15:
-                        break 
+            # ModelManager로 텍스트 생성 요청
+            # 트렌드가 1개 이상 들어 있는 응답만 LLM 캐시에 남깁니다.
+            ai_res_text = self.model_manager.generate_json(prompt=build_prompt(fitted), validate=lambda text: bool(_json_list(text)))
+            
+            if not ai_res_text:
+                print("      ⏭️ [DISCARDED] AI API failed to return JSON.")
+                return 0
+            
+            # JSON 파싱 (strict=False 추가, 딕셔너리로 응답이 왔다면 안쪽에 있는 리스트를 강제로 꺼냄)
+            trends = _json_list(ai_res_text)
 
+            # 3. 데이터 비교 및 델타 업데이트 실행
+            processed_count = 0 
+
+            def find_image(t):
+                # 이미 있는 트렌드는 기존 이미지를 그대로 쓰므로 검색하지 않습니다.
+                keyword = t.get('keyword', '')
+                if not keyword or t.get('title', 'Unknown Trend') in old_dict:
+                    return ""
+                try:
+                    img_items = self.naver_search.images(keyword, display=3, sort="sim", timeout=5)
+                    # 💡 후보들을 동시에 검사하고, 캐시에 있는 URL은 재검사 없이 재사용
+                    return self.image_validator.first_valid([img_item.get('link', '') for img_item in img_items])
+                except Exception as e:
+                    print(f"      ⚠️ Image Search API Error for '{keyword}': {e}")
+                    return ""
+
+            # 💡 이미지 검색은 남은 자리 수만큼 묶어서 동시에 하고, 이미지가 없어 드롭된 자리는 다음 후보들로 다시 채웁니다.
+            #    같은 제목이 두 번 나오면 처음 것만 씁니다. (한 번의 업서트에 같은 행이 두 번 들어가지 않도록)
+            pending, seen_titles = [], set()
+            for t in trends:
+                if isinstance(t, dict) and t.get('title', 'Unknown Trend') not in seen_titles:
+                    seen_titles.add(t.get('title', 'Unknown Trend'))
+                    pending.append(t)
+
+            new_rows = []
+            while pending and processed_count < 15:
+                # ✅ [수정] 15개가 채워지면 루프 종료
+                wave, pending = pending[:15 - processed_count], pending[15 - processed_count:]
+                images = run_parallel(find_image, wave, max_workers=len(wave))
+
+                for t, img_url in zip(wave, images):
                     title = t.get('title', 'Unknown Trend')
-                    new_summary = t.get('summary', '')
-                    # ✅ [수정] 순위를 15점 만점부터 차례대로 재부여
-                    new_score = 15 - processed_count 
                     keyword = t.get('keyword', '') 
-                    
                     default_keyword = f"Korean {sub_cat.replace('k-', '')}"
-                    amazon_keyword = t.get('amazon_keyword', default_keyword).strip()
-
-                    # 이미지 유효성 검사
-                    img_url = ""
-                    if keyword:
-                        img_search_url = f"https://openapi.naver.com/v1/search/image?query={quote(keyword)}&display=3&sort=sim"
-                        try:
-                            img_res = requests.get(img_search_url, headers=naver_headers, timeout=5)
-                            if img_res.status_code == 200:
-                                img_items = img_res.json().get('items', [])
-                                for img_item in img_items:
-                                    candidate_url = img_item.get('link', '')
-                                    try:
-                                        check = requests.head(candidate_url, timeout=2, verify=False)
-                                        if check.status_code == 200:
-                                            content_type = check.headers.get('Content-Type', '')
-                                            if content_type.startswith('image/'):
-                                                img_url = candidate_url
-                                                break 
-                                    except:
-                                        continue 
-                        except Exception as e:
-                            print(f"      ⚠️ Image Search API Error for '{keyword}': {e}")
 
                     # 유효한 이미지를 찾지 못했다면 드롭
                     if not img_url and title not in old_dict:
                          print(f"      ⏭️ No valid image found for '{keyword}'. Dropping trend: {title}")
                          continue
 
+                    new_rows.append({
+                        "category": sub_cat,
+                        "keyword": keyword, 
+                        "title": title,
+                        "summary": t.get('summary', ''),
+                        "link": "",
+                        "image_url": img_url,
+                        # ✅ [수정] 순위를 15점 만점부터 차례대로 재부여
+                        "score": 15 - processed_count,
+                        "likes": 0,
+                        "amazon_keyword": t.get('amazon_keyword', default_keyword).strip()
+                    })
                     processed_count += 1 
 
-                    if title in old_dict:
-                        # [유지 & 업데이트]
-                        old_item = old_dict[title]
-                        item_id = old_item['id']
-                        
-                        if old_item['summary'] != new_summary or old_item['score'] != new_score:
-                            patch_data = {
-                                "summary": new_summary, 
-                                "score": new_score,
-                                "amazon_keyword": amazon_keyword
-                            }
-                            patch_res = requests.patch(f"{supabase_url}/rest/v1/live_news?id=eq.{item_id}", headers=supa_headers, json=patch_data)
-                            
-                            if patch_res.status_code >= 400:
-                                print(f"      ❌ DB Update Error ({title}): {patch_res.text}")
-                            else:
-                                print(f"      🔄 Updated: {title} (Amazon: {amazon_keyword})")
-                        else:
-                            print(f"      ➖ Kept (No change): {title}")
-                            
-                    else:
-                        # [신규 진입]
-                        post_data = {
-                            "category": sub_cat,
-                            "keyword": keyword, 
-                            "title": title,
-                            "summary": new_summary,
-                            "link": "",
-                            "image_url": img_url,
-                            "score": new_score,
-                            "likes": 0,
-                            "amazon_keyword": amazon_keyword 
-                        }
-                        post_res = requests.post(f"{supabase_url}/rest/v1/live_news", headers=supa_headers, json=post_data)
-                        
-                        if post_res.status_code >= 400:
-                            print(f"      ❌ DB Insert Error ({title}): {post_res.text}")
-                        else:
-                            print(f"      ✨ New Entry: {title} (Amazon: {amazon_keyword})")
-
-                # 4. 💡 15개 한도 룰 적용 (15개 초과분만 오래된 순으로 삭제)
-                try:
-                    count_url = f"{supabase_url}/rest/v1/live_news?category=eq.{sub_cat}&select=id"
-                    current_res = requests.get(count_url, headers=supa_headers)
-                    if current_res.status_code == 200:
-                        current_items = current_res.json()
-                        total_count = len(current_items)
-                        
-                        # ✅ [수정] 15개를 초과할 때만 정리
-                        if total_count > 15:
-                            excess = total_count - 15
-                            oldest_url = f"{supabase_url}/rest/v1/live_news?category=eq.{sub_cat}&select=id&order=created_at.asc&limit={excess}"
-                            oldest_res = requests.get(oldest_url, headers=supa_headers)
-                            
-                            if oldest_res.status_code == 200:
-                                drop_ids = [str(item['id']) for item in oldest_res.json()]
-                                if drop_ids:
-                                    del_url = f"{supabase_url}/rest/v1/live_news?id=in.({','.join(drop_ids)})"
-                                    requests.delete(del_url, headers=supa_headers)
-                                    print(f"      🗑️ Dropped {excess} oldest items to maintain exactly 15.")
-                except Exception as e:
-                    print(f"      ⚠️ Cleanup Error: {e}")
+            # 4. 💡 메모리에서 델타(신규/갱신/유지)를 계산한 뒤, 최대 2번의 일괄 요청으로 반영
+            #    15개 초과분 삭제는 실행 끝에 retention의 보존 정책(KCULTURE_MAX_ROWS)이 한 번에 처리합니다.
+            delta = plan_delta(old_items, new_rows, key="title", compare=("summary", "score"),
+                               update_columns=("summary", "score", "amazon_keyword"))
+            results = apply_delta(self.http, f"{supabase_url}/rest/v1", "live_news", supa_headers, delta)
 
-                time.sleep(3) 
+            if results["insert"]:
+                for row in delta["insert"]:
+                    print(f"      ✨ New Entry: {row['title']} (Amazon: {row['amazon_keyword']})")
+            if results["update"]:
+                for row in delta["update"]:
+                    print(f"      🔄 Updated: {row['title']} (Amazon: {row['amazon_keyword']})")
+            for row in delta["unchanged"]:
+                print(f"      ➖ Kept (No change): {row['title']}")
 
-            except Exception as e:
-                print(f"    ❌ Error processing {sub_cat}: {e}")
+            return processed_count
 
-        print("  🎉 K-Culture Magazine Delta Update Complete!")
+        except Exception as e:
+            print(f"    ❌ Error processing {sub_cat}: {e}")
+            return 0
+
+    # 🗂️ 번역 메모 키: (카테고리, 원문 제목, 원문 info). 조회수/관객수처럼 매번 바뀌는 숫자는 #로 가려서 비교합니다.
+    def _translation_memo_key(self, category, item):
+        masked_info = _COUNT_PATTERN.sub('#', item['info'])
+        return f"{category}\x1f{item['title']}\x1f{masked_info}"
+
+    def _apply_translation(self, item, category, translated):
+        raw_info = item['info']
+        item['title'] = translated.get('title') or item['title']
+
+        # k-pop만 info를 재구성하고, 그 외 카테고리는 info 원문(최신 숫자)을 그대로 유지
+        if category == 'k-pop':
+            info = translated.get('info') or raw_info
+            current_views = _VIEWS_PATTERN.search(raw_info)
+            if current_views and _VIEWS_PATTERN.search(info):
+                # 메모에 저장된 예전 조회수를 이번 실행의 조회수로 교체
+                info = _VIEWS_PATTERN.sub(current_views.group(0), info)
+            item['info'] = info
 
     # 🤖 AI 영문 일괄 번역기 (K-Pop, K-Movie 등 기존 차트용)
     def _translate_chart_titles(self, chart_data, category):
-        items_to_translate = [{"title": item['title'], "info": item['info']} for item in chart_data]
-        
-        prompt = f"""
+        # 💡 이미 번역해 둔 제목은 메모에서 바로 적용하고, 처음 보는 제목만 LLM에 보냅니다.
+        pending = []
+        for item in chart_data:
+            memo = self.translation_memo.get(self._translation_memo_key(category, item))
+            if memo:
+                self._apply_translation(item, category, memo)
+            else:
+                pending.append(item)
+
+        print(f"    🗂️ Translation memo: {len(chart_data) - len(pending)} reused, {len(pending)} new titles to translate.")
+        if not pending:
+            return chart_data
+
+        items_to_translate = [{"id": str(i), "title": item['title'], "info": item['info']} for i, item in enumerate(pending)]
+
+        def build_prompt(batch):
+            return f"""
         You are an expert K-Culture data cleaner and professional translator. 
         Current Category: {category}
         
@@ -292,32 +343,42 @@ class ChartAPI:
         1. TRANSLATE TITLE: Translate the Korean title to natural English. If it's a proper noun (like a person's name), Romanize it perfectly (e.g., "김수현" -> "Kim Soo-hyun").
         2. 'info': DO NOT change the 'info' text at all. Leave it exactly as it is.
 
-        You MUST return ONLY a valid JSON array of objects containing 'title' and 'info' keys. No markdown, no extra text.
+        You MUST return ONLY a valid JSON array of objects containing 'id', 'title' and 'info' keys. Copy each item's 'id' exactly as given. No markdown, no extra text.
         
         Items to translate/clean:
-        {json.dumps(items_to_translate, ensure_ascii=False)}
+        {json.dumps(batch, ensure_ascii=False)}
         """
-        try:
-            ai_res_text = self.model_manager.generate_json(prompt=prompt)
+
+        # 💡 항목이 많으면 프롬프트 예산(응답도 항목 수에 비례하므로 출력 한도의 절반)에 맞춰 여러 번 나눠 보내고, id로 합칩니다.
+        translated_by_id = {}
+        chunks = generate_chunked(self.model_manager, items_to_translate, build_prompt,
+                                  item_budget=MAX_OUTPUT_TOKENS // 2, validate=_translation_complete)
+        for _, ai_res_text in chunks:
             if not ai_res_text:
-                return chart_data
-                
-            translated_items = json.loads(ai_res_text, strict=False)
-            
-            # 딕셔너리로 감싸져서 올 경우 대비
-            if isinstance(translated_items, dict):
-                translated_items = next(iter(translated_items.values())) if translated_items else []
-                if isinstance(translated_items, dict):
-                    translated_items = [translated_items]
-            
-            for i, item in enumerate(chart_data):
-                if i < len(translated_items):
-                    item['title'] = translated_items[i].get('title', item['title'])
-                    item['info'] = translated_items[i].get('info', item['info'])
-                    
-        except Exception as e:
-            print(f"    ⚠️ AI Translation Error: {e}")
-            
+                continue
+            try:
+                # 딕셔너리로 감싸져서 올 경우 대비
+                translated_items = _json_list(ai_res_text)
+            except Exception as e:
+                print(f"    ⚠️ AI Translation Error: {e}")
+                continue
+
+            # 💡 목록 순서가 아니라 id로 매칭 (AI가 순서를 바꾸거나 일부를 빠뜨려도 엉뚱한 제목이 붙지 않도록)
+            translated_by_id.update({str(t.get('id')): t for t in translated_items if isinstance(t, dict)})
+
+        for i, item in enumerate(pending):
+            translated = translated_by_id.get(str(i))
+            if not translated:
+                continue
+            if not _memoizable(category, translated):
+                # 빈 번역은 메모에 남기지 않고 이번 실행에만 원문으로 대체합니다. (다음 실행에서 다시 번역)
+                self._apply_translation(item, category, translated)
+                continue
+            memo = {"title": translated['title'], "info": translated.get('info') or item['info']}
+            self.translation_memo.set(self._translation_memo_key(category, item), memo)
+            self._apply_translation(item, category, memo)
+
+        self.translation_memo.save()
         return chart_data
 
     # 🎬 1. K-Movie: 영화진흥위원회(KOBIS) 박스오피스 API
@@ -328,7 +389,7 @@ class ChartAPI:
         url = f"http://www.kobis.or.kr/kobisopenapi/webservice/rest/boxoffice/searchDailyBoxOfficeList.json?key={self.kobis_key}&targetDt={yesterday}"
         
         try:
-            res = requests.get(url, timeout=10).json()
+            res = self.http.get(url, timeout=10).json()
             movies = res.get('boxOfficeResult', {}).get('dailyBoxOfficeList', [])
             chart = []
             for m in movies[:10]:
@@ -363,7 +424,7 @@ class ChartAPI:
         url = f"https://api.themoviedb.org/3/discover/tv?api_key={self.tmdb_key}&with_original_language=ko{genre_filter}{date_filter}&sort_by=popularity.desc&language=ko-KR"
         
         try:
-            res = requests.get(url, timeout=10).json()
+            res = self.http.get(url, timeout=10).json()
             shows = res.get('results', [])
             chart = []
             rank = 1
@@ -390,7 +451,7 @@ class ChartAPI:
         url = f"https://www.googleapis.com/youtube/v3/videos?part=snippet,statistics&chart=mostPopular&regionCode=KR&videoCategoryId=10&maxResults=10&key={youtube_key}"
         
         try:
-            res = requests.get(url, timeout=10)
+            res = self.http.get(url, timeout=10)
             res.raise_for_status()
             items = res.json().get('items', [])
             
@@ -0,0 +1,53 @@
+import queue
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_parallel(func, items, max_workers):
+    """items 각각에 func를 제한된 스레드 풀로 동시에 적용하고, 결과를 입력 순서 그대로 돌려줍니다."""
+    items = list(items)
+    if not items:
+        return []
+
+    workers = max(1, min(int(max_workers or 1), len(items)))
+    if workers == 1:
+        # 워커가 1개면 스레드를 띄우지 않고 기존처럼 순차 실행
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 작업마다 호출 시점의 컨텍스트를 복사해서 실행 (카테고리별 로그 버퍼 등이 워커 스레드까지 이어지도록)
+        futures = [executor.submit(contextvars.copy_context().run, func, item) for item in items]
+        return [f.result() for f in futures]
+
+
+_DONE = object()
+
+
+def stream_map(func, items, max_workers):
+    """items(생성기 가능)를 제한된 스레드 풀로 처리하며, 끝나는 순서대로 결과를 바로 내보냅니다.
+    앞 단계의 stream_map 결과를 그대로 넘기면 단계끼리 파이프라인처럼 겹쳐서 실행됩니다."""
+    workers = max(1, int(max_workers or 1))
+    results = queue.Queue()
+    context = contextvars.copy_context()
+
+    def feed():
+        # 위쪽 단계를 소비하면서 작업을 넣는 쪽은 별도 스레드 (아래쪽으로 결과를 내보내는 것이 막히지 않도록)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for item in items:
+                    future = executor.submit(context.copy().run, func, item)
+                    future.add_done_callback(results.put)
+        except BaseException as e:
+            results.put(e)
+        finally:
+            results.put(_DONE)
+
+    threading.Thread(target=context.copy().run, args=(feed,), daemon=True).start()
+    while True:
+        entry = results.get()
+        if entry is _DONE:
+            return
+        if isinstance(entry, BaseException):
+            raise entry
+        yield entry.result()
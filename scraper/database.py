@@ -1,9 +1,40 @@
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
+from urllib.parse import quote
 from supabase import create_client, Client
+from postgrest.types import CountMethod, ReturnMethod
+
+from async_http import get_async_http_client
+
+
+def _dedupe_live_rows(items):
+    """같은 (카테고리, 키워드)가 여러 번 나오면 점수가 가장 높은 1개만 남깁니다."""
+    deduped = {}
+    for item in items:
+        key = (item["category"], item["keyword"])
+        if key not in deduped or item.get("score", 0) > deduped[key].get("score", 0):
+            deduped[key] = item
+    return list(deduped.values())
+
+
+def _in_filter(values):
+    # PostgREST in.(...) 목록: 쉼표/괄호가 들어간 키워드도 통째로 비교되도록 큰따옴표로 감쌉니다.
+    quoted = ",".join('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return quote(f"({quoted})", safe="")
+
 
 class Database:
-    def __init__(self):
+    def __init__(self, client=None):
+        # 💡 asyncio 파이프라인은 supabase 클라이언트 대신 같은 서버의 REST 엔드포인트를 비동기 HTTP로 직접 호출합니다.
+        supabase_key = os.environ.get("SUPABASE_KEY")
+        self.rest_url = f"{os.environ.get('SUPABASE_URL', '').rstrip('/')}/rest/v1"
+        self.rest_headers = {"apikey": supabase_key, "Authorization": f"Bearer {supabase_key}", "Content-Type": "application/json"}
+
+        # 💡 client를 직접 넘기면 그대로 사용 (오프라인 재생용 인메모리 PostgREST 등)
+        if client is not None:
+            self.client = client
+            return
+
         url: str = os.environ.get("SUPABASE_URL")
         key: str = os.environ.get("SUPABASE_KEY")
         if not url or not key:
@@ -65,49 +96,101 @@ class Database:
             self.client.table("search_archive").insert(live_news_data).execute()
             
             print(f"✅ Saved {len(results)} new articles to '{category}' (live_news & search_archive).")
-            
-            # 3. live_news는 최신 50개 제한 유지
-            self._enforce_max_50_limit(category)
-            
-            # 💡 [추가 완료] live_news는 24시간 지난 데이터 가차없이 삭제
-            self._cleanup_24hours_live_news()
-            
-            # 💡 4. [추가 완료] search_archive는 7일이 지난 데이터 자동 삭제
-            self._cleanup_7days_archive()
+            # 💡 개수/보관 기간 정리는 실행 끝에 retention.enforce_retention이 한 번에 합니다.
             
         except Exception as e:
             print(f"❌ DB Save Error: {e}")
 
-    def _enforce_max_50_limit(self, category: str):
-        """live_news 테이블: 카테고리당 최신 기사 50개만 남기고 삭제"""
+    def save_live_news_batch(self, items: list) -> int:
+        """뉴스 파이프라인 결과를 몇 번의 요청으로 일괄 저장합니다. (카테고리+키워드 중복 제거 → 교체 저장)
+        카테고리별 최대 개수는 실행 끝에 retention.enforce_retention이 정리합니다."""
+        if not self.client or not items: return 0
+
+        # 1. 같은 (카테고리, 키워드)가 여러 번 나오면 점수가 가장 높은 1개만 남김
+        rows = _dedupe_live_rows(items)
+
+        try:
+            # 2. 기존 기사 교체: 항목별 delete 대신 카테고리당 1번의 in_() 삭제
+            keywords_by_category = {}
+            for row in rows:
+                keywords_by_category.setdefault(row["category"], []).append(row["keyword"])
+            for cat, keywords in keywords_by_category.items():
+                self.client.table("live_news").delete().eq("category", cat).in_("keyword", keywords).execute()
+
+            # 3. 기록보관소 / 메인 테이블에 각각 1번씩 벌크 insert
+            self.client.table("search_archive").insert(rows).execute()
+            self.client.table("live_news").insert(rows).execute()
+            print(f"    ✅ Insertion complete. ({len(rows)} articles, {len(items) - len(rows)} duplicates merged)")
+        except Exception as e:
+            print(f"    ❌ DB Save Error: {e}")
+            return 0
+
+        return len(rows)
+
+    async def asave_live_news_batch(self, items: list) -> int:
+        """save_live_news_batch의 asyncio 버전. 같은 순서(카테고리별 삭제 → 기록보관소 → 메인 테이블)로 REST 요청을 보냅니다."""
+        if not self.client or not items: return 0
+
+        rows = _dedupe_live_rows(items)
+        http = get_async_http_client()
+        write_headers = {**self.rest_headers, "Prefer": "return=minimal"}
+
+        def check(res):
+            if res.status_code >= 400:
+                raise RuntimeError(f"{res.status_code} {res.text}")
+
         try:
-            res = self.client.table("live_news").select("id").eq("category", category).order("created_at", desc=True).execute()
-            if res.data and len(res.data) > 50:
-                ids_to_delete = [item["id"] for item in res.data[50:]]
-                self.client.table("live_news").delete().in_("id", ids_to_delete).execute()
-                print(f"🧹 Cleaned up {len(ids_to_delete)} old articles. Maintained exactly 50 for '{category}'.")
+            keywords_by_category = {}
+            for row in rows:
+                keywords_by_category.setdefault(row["category"], []).append(row["keyword"])
+            for cat, keywords in keywords_by_category.items():
+                check(await http.delete(f"{self.rest_url}/live_news?category=eq.{quote(cat, safe='')}&keyword=in.{_in_filter(keywords)}", headers=write_headers))
+
+            check(await http.post(f"{self.rest_url}/search_archive", headers=write_headers, json=rows))
+            check(await http.post(f"{self.rest_url}/live_news", headers=write_headers, json=rows))
+            print(f"    ✅ Insertion complete. ({len(rows)} articles, {len(items) - len(rows)} duplicates merged)")
         except Exception as e:
-            print(f"⚠️ Error enforcing max 50 limit: {e}")
+            print(f"    ❌ DB Save Error: {e}")
+            return 0
+
+        return len(rows)
 
-    # 💡 [새로 추가된 함수] live_news 24시간(하루) 경과 데이터 무조건 삭제
-    def _cleanup_24hours_live_news(self):
-        """live_news 테이블: 현재 시간 기준 24시간 전 데이터 가차없이 삭제"""
+    def apply_retention(self, policy: list) -> list:
+        """서버 함수 apply_retention(supabase/migrations)으로 보존 정책을 1번에 적용합니다. 함수가 없으면 예외를 올립니다."""
+        res = self.client.rpc("apply_retention", {"policy": policy}).execute()
+        return res.data or []
+
+    def delete_older_than(self, table: str, cutoff: str, categories: list = None) -> int:
+        """created_at이 cutoff보다 오래된 행을 1번의 삭제로 지웁니다. categories가 None이면 테이블 전체.
+        지운 행은 내려받지 않고 개수만 받습니다."""
         try:
-            twenty_four_hours_ago = (datetime.utcnow() - timedelta(hours=24)).isoformat()
-            self.client.table("live_news").delete().lt("created_at", twenty_four_hours_ago).execute()
+            query = self.client.table(table).delete(count=CountMethod.exact, returning=ReturnMethod.minimal).lt("created_at", cutoff)
+            if categories is not None:
+                query = query.in_("category", categories)
+            return query.execute().count or 0
         except Exception as e:
-            print(f"⚠️ Error cleaning up 24-hour old live_news: {e}")
+            print(f"⚠️ Error cleaning up old rows in {table}: {e}")
+            return 0
 
-    # 💡 [새로 추가된 함수] search_archive 일주일(7일) 경과 데이터 삭제
-    def _cleanup_7days_archive(self):
-        """search_archive 테이블: 현재 시간 기준 7일 전 데이터 삭제"""
+    def trim_categories(self, categories: list, cap: int, table: str = "live_news") -> int:
+        """여러 카테고리의 id 목록을 1번에 조회하고, 최신 cap개를 넘는 행을 1번의 삭제로 정리합니다."""
+        if not categories: return 0
         try:
-            seven_days_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-            
-            # created_at이 7일 전 시간보다 과거(lt)인 데이터 일괄 삭제
-            self.client.table("search_archive").delete().lt("created_at", seven_days_ago).execute()
+            res = self.client.table(table).select("id,category").in_("category", categories).order("created_at", desc=True).execute()
+            kept = {}
+            drop_ids = []
+            for row in res.data or []:
+                kept[row["category"]] = kept.get(row["category"], 0) + 1
+                if kept[row["category"]] > cap:
+                    drop_ids.append(row["id"])
+
+            if drop_ids:
+                self.client.table(table).delete(returning=ReturnMethod.minimal).in_("id", drop_ids).execute()
+                print(f"    🧹 Purged {len(drop_ids)} old rows to keep {cap} per category ({', '.join(categories)}).")
+            return len(drop_ids)
         except Exception as e:
-            print(f"⚠️ Error cleaning up 7-day old search_archive: {e}")
+            print(f"    ⚠️ Error trimming categories to {cap}: {e}")
+            return 0
 
     def save_chart_results(self, category: str, results: list):
         if not self.client or not results: return
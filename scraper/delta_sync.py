@@ -0,0 +1,41 @@
+from instrumentation import count
+
+
+def plan_delta(old_rows, new_rows, key, compare, update_columns=None):
+    """기존 행(old_rows)과 이번에 남길 행(new_rows)을 key 컬럼으로 맞춰 보고, 메모리에서 델타를 계산합니다.
+    compare 컬럼 중 하나라도 다르면 update(update_columns 값만 덮어씀), 모두 같으면 unchanged, 처음 보는 key면 insert.
+    개수 제한(오래된 행 삭제)은 retention의 보존 정책이 맡습니다."""
+    update_columns = update_columns or compare
+    old_by_key = {row[key]: row for row in old_rows}
+    delta = {"insert": [], "update": [], "unchanged": []}
+    for row in new_rows:
+        old = old_by_key.get(row[key])
+        if old is None:
+            delta["insert"].append(row)
+        elif any(old.get(col) != row.get(col) for col in compare):
+            # 업서트는 NOT NULL 컬럼까지 통째로 보내야 하므로 기존 행에 새 값을 덮어씁니다.
+            delta["update"].append({**old, **{col: row.get(col) for col in update_columns}})
+        else:
+            delta["unchanged"].append(old)
+
+    return delta
+
+
+def apply_delta(http, rest_url, table, headers, delta):
+    """델타를 최대 2번의 요청(insert 1번, merge-duplicates 업서트 1번)으로 반영합니다.
+    단계별 성공 여부 {"insert", "update"}를 돌려줍니다. (할 일이 없던 단계는 None)"""
+    results = {"insert": None, "update": None}
+    write_headers = {**headers, "Prefer": "return=minimal"}
+
+    def check(step, res):
+        results[step] = res.status_code < 400
+        count("db.bulk_requests", table=table, step=step)
+        if not results[step]:
+            print(f"      ❌ DB {step} Error ({len(delta[step])} rows): {res.text}")
+
+    if delta["insert"]:
+        check("insert", http.post(f"{rest_url}/{table}", headers=write_headers, json=delta["insert"]))
+    if delta["update"]:
+        upsert_headers = {**headers, "Prefer": "resolution=merge-duplicates,return=minimal"}
+        check("update", http.post(f"{rest_url}/{table}?on_conflict=id", headers=upsert_headers, json=delta["update"]))
+    return results
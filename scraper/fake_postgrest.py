@@ -0,0 +1,347 @@
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse, parse_qsl
+
+import requests
+
+# 쿼리스트링에서 필터가 아닌 예약 파라미터
+_RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+
+def _parse_time(value):
+    if not isinstance(value, str) or len(value) < 10 or value[4] != "-":
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _comparable(row_value, filter_value):
+    """행 값과 필터 값을 비교 가능한 같은 타입으로 맞춥니다. (REST 필터는 항상 문자열로 들어오므로)"""
+    if isinstance(row_value, bool):
+        return str(row_value).lower(), str(filter_value).lower()
+    if isinstance(row_value, (int, float)):
+        try:
+            return float(row_value), float(filter_value)
+        except (TypeError, ValueError):
+            return str(row_value), str(filter_value)
+    row_time, filter_time = _parse_time(row_value), _parse_time(filter_value)
+    if row_time and filter_time:
+        return row_time, filter_time
+    return ("" if row_value is None else str(row_value)), str(filter_value)
+
+
+def _sort_key(value):
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (1, float(value))
+    parsed = _parse_time(value)
+    if parsed:
+        return (2, parsed.timestamp())
+    return (3, str(value))
+
+
+def _matches(row, filters):
+    for column, op, value in filters:
+        row_value = row.get(column)
+        if op == "in":
+            if not any(_comparable(row_value, v)[0] == _comparable(row_value, v)[1] for v in value):
+                return False
+            continue
+        if op == "is":
+            if str(value).lower() == "null" and row_value is not None:
+                return False
+            continue
+        if row_value is None:
+            return False
+        a, b = _comparable(row_value, value)
+        if op == "eq" and not a == b: return False
+        if op == "neq" and not a != b: return False
+        if op == "lt" and not a < b: return False
+        if op == "lte" and not a <= b: return False
+        if op == "gt" and not a > b: return False
+        if op == "gte" and not a >= b: return False
+    return True
+
+
+def _split_in_list(raw):
+    """'(a,"b,c",d)' → ['a', 'b,c', 'd'] (큰따옴표 안의 쉼표는 구분자로 보지 않음)"""
+    raw = raw.strip()
+    if raw.startswith("(") and raw.endswith(")"):
+        raw = raw[1:-1]
+    values, current, quoted = [], "", False
+    for ch in raw:
+        if ch == '"':
+            quoted = not quoted
+        elif ch == "," and not quoted:
+            values.append(current)
+            current = ""
+        else:
+            current += ch
+    if raw:
+        values.append(current)
+    return values
+
+
+class FakePostgrest:
+    """live_news / search_archive / live_rankings / system_status에 쓰는 연산만 지원하는 최소 인메모리 PostgREST."""
+
+    def __init__(self, seed=None, clock=None):
+        # clock: created_at 기본값에 쓸 현재 시각 함수 (재생 시 기록 당시 시각으로 고정)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        self.tables = {}
+        self._next_id = 1
+        self.request_count = 0
+        # 어떤 PostgREST 기능이 쓰였는지 (filter:in, upsert:id, rpc:apply_retention 등) 횟수를 남깁니다. (스모크 테스트 확인용)
+        self.operations = Counter()
+        for table, rows in (seed or {}).items():
+            self.tables[table] = [dict(r) for r in rows]
+            for r in rows:
+                if isinstance(r.get("id"), int):
+                    self._next_id = max(self._next_id, r["id"] + 1)
+
+    # ---------- 공통 연산 ----------
+    def _count_request(self, filters=(), *extra):
+        self.request_count += 1
+        self.operations.update([f"filter:{op}" for _, op, _ in filters] + list(extra))
+
+    def select(self, table, filters=(), columns="*", order=None, limit=None, offset=0):
+        with self._lock:
+            self._count_request(filters)
+            rows = [r for r in self.tables.get(table, []) if _matches(r, filters)]
+        total = len(rows)
+        for column, desc in reversed(order or []):
+            rows.sort(key=lambda r: _sort_key(r.get(column)), reverse=desc)
+        rows = rows[offset:]
+        if limit is not None:
+            rows = rows[:limit]
+        if columns and columns.strip() != "*":
+            keep = [c.strip() for c in columns.split(",")]
+            rows = [{c: r.get(c) for c in keep} for r in rows]
+        return [dict(r) for r in rows], total
+
+    def insert(self, table, rows, upsert=False, on_conflict="id"):
+        rows = rows if isinstance(rows, list) else [rows]
+        conflict_cols = [c.strip() for c in (on_conflict or "id").split(",")]
+        inserted = []
+        now = self.clock().isoformat()
+        with self._lock:
+            self._count_request((), f"upsert:{on_conflict}" if upsert else "insert")
+            target = self.tables.setdefault(table, [])
+            for row in rows:
+                row = dict(row)
+                if upsert and all(row.get(c) is not None for c in conflict_cols):
+                    existing = next((r for r in target if all(str(r.get(c)) == str(row.get(c)) for c in conflict_cols)), None)
+                    if existing is not None:
+                        existing.update(row)
+                        inserted.append(dict(existing))
+                        continue
+                if row.get("id") is None:
+                    row["id"] = self._next_id
+                    self._next_id += 1
+                row.setdefault("created_at", now)
+                target.append(row)
+                inserted.append(dict(row))
+        return inserted
+
+    def update(self, table, filters, values):
+        with self._lock:
+            self._count_request(filters)
+            updated = []
+            for r in self.tables.get(table, []):
+                if _matches(r, filters):
+                    r.update(values)
+                    updated.append(dict(r))
+        return updated
+
+    def delete(self, table, filters):
+        with self._lock:
+            self._count_request(filters)
+            rows = self.tables.get(table, [])
+            removed = [dict(r) for r in rows if _matches(r, filters)]
+            self.tables[table] = [r for r in rows if not _matches(r, filters)]
+        return removed
+
+    def apply_retention(self, policy):
+        """supabase/migrations의 apply_retention 서버 함수와 같은 규칙으로 보존 정책을 적용합니다."""
+        results = []
+        now = self.clock()
+        for rule in policy:
+            table, category = rule["table"], rule.get("category")
+            scope = [("category", "eq", category)] if category is not None else []
+            deleted = 0
+            if rule.get("max_age_hours") is not None:
+                cutoff = (now - timedelta(hours=rule["max_age_hours"])).isoformat()
+                deleted += len(self.delete(table, scope + [("created_at", "lt", cutoff)]))
+            if rule.get("max_rows") is not None:
+                rows, _ = self.select(table, scope, order=[("created_at", True), ("id", True)])
+                drop_ids = [str(r["id"]) for r in rows[rule["max_rows"]:]]
+                if drop_ids:
+                    deleted += len(self.delete(table, [("id", "in", drop_ids)]))
+            results.append({"target_table": table, "category": category, "deleted": deleted})
+        return results
+
+    def call(self, function, params):
+        with self._lock:
+            self.operations[f"rpc:{function}"] += 1
+        if function == "apply_retention":
+            return self.apply_retention(params.get("policy") or [])
+        raise ValueError(f"Unknown function {function}")
+
+    # ---------- supabase-py 스타일 클라이언트 ----------
+    def table(self, name):
+        return _FakeQuery(self, name)
+
+    def rpc(self, function, params=None):
+        return _FakeRpc(self, function, params or {})
+
+    # ---------- 원시 REST (/rest/v1/...) ----------
+    def handle_rest(self, method, url, json_body=None, headers=None):
+        """HttpClient transport에서 호출되는 PostgREST 흉내. requests.Response를 돌려줍니다."""
+        parsed = urlparse(url)
+        table = parsed.path.rsplit("/", 1)[-1]
+        params = parse_qsl(parsed.query, keep_blank_values=True)
+        prefer = (headers or {}).get("Prefer", "")
+
+        filters, columns, order, limit, offset, on_conflict = [], "*", [], None, 0, "id"
+        for key, value in params:
+            if key == "select":
+                columns = value
+            elif key == "order":
+                for part in value.split(","):
+                    column, _, direction = part.partition(".")
+                    order.append((column, direction.startswith("desc")))
+            elif key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif key == "on_conflict":
+                on_conflict = value
+            elif key not in _RESERVED_PARAMS:
+                op, _, raw = value.partition(".")
+                filters.append((key, op, _split_in_list(raw) if op == "in" else raw))
+
+        method = method.upper()
+        if "/rpc/" in parsed.path:
+            try:
+                return _make_response(200, self.call(table, json_body or {}))
+            except ValueError as e:
+                return _make_response(404, {"message": str(e)})
+        if method == "GET":
+            rows, _ = self.select(table, filters, columns, order, limit, offset)
+            return _make_response(200, rows)
+        if method == "POST":
+            rows = self.insert(table, json_body, upsert="merge-duplicates" in prefer, on_conflict=on_conflict)
+            return _make_response(201, rows if "return=representation" in prefer else None)
+        if method == "PATCH":
+            rows = self.update(table, filters, json_body or {})
+            return _make_response(200 if "return=representation" in prefer else 204, rows if "return=representation" in prefer else None)
+        if method == "DELETE":
+            rows = self.delete(table, filters)
+            res = _make_response(200 if "return=representation" in prefer else 204, rows if "return=representation" in prefer else None)
+            if "count=exact" in prefer:
+                res.headers["Content-Range"] = f"*/{len(rows)}"
+            return res
+        return _make_response(405, {"message": f"Unsupported method {method}"})
+
+
+def _make_response(status, payload):
+    res = requests.Response()
+    res.status_code = status
+    res._content = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    res.encoding = "utf-8"
+    res.headers["Content-Type"] = "application/json"
+    return res
+
+
+class _FakeResult:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class _FakeRpc:
+    """supabase-py의 rpc() 호출 흉내"""
+
+    def __init__(self, store, function, params):
+        self.store = store
+        self.function = function
+        self.params = params
+
+    def execute(self):
+        return _FakeResult(self.store.call(self.function, self.params))
+
+
+class _FakeQuery:
+    """supabase-py의 table() 쿼리 빌더 중 파이프라인이 쓰는 메서드만 흉내냅니다."""
+
+    def __init__(self, store, table):
+        self.store = store
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.filters = []
+        self._order = []
+        self._limit = None
+        self._count = None
+        self._minimal = False
+        self._on_conflict = "id"
+
+    def select(self, columns="*", count=None):
+        self.action, self.columns, self._count = "select", columns, count
+        return self
+
+    def insert(self, rows):
+        self.action, self.payload = "insert", rows
+        return self
+
+    def upsert(self, rows, on_conflict="id"):
+        self.action, self.payload, self._on_conflict = "upsert", rows, on_conflict
+        return self
+
+    def update(self, values):
+        self.action, self.payload = "update", values
+        return self
+
+    def delete(self, count=None, returning=None):
+        self.action, self._count = "delete", count
+        self._minimal = getattr(returning, "value", returning) == "minimal"
+        return self
+
+    def _filter(self, column, op, value):
+        self.filters.append((column, op, value))
+        return self
+
+    def eq(self, column, value): return self._filter(column, "eq", value)
+    def neq(self, column, value): return self._filter(column, "neq", value)
+    def lt(self, column, value): return self._filter(column, "lt", value)
+    def lte(self, column, value): return self._filter(column, "lte", value)
+    def gt(self, column, value): return self._filter(column, "gt", value)
+    def gte(self, column, value): return self._filter(column, "gte", value)
+    def in_(self, column, values): return self._filter(column, "in", list(values))
+
+    def order(self, column, desc=False):
+        self._order.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        if self.action == "select":
+            rows, total = self.store.select(self.table, self.filters, self.columns, self._order, self._limit)
+            return _FakeResult(rows, total if self._count else None)
+        if self.action in ("insert", "upsert"):
+            return _FakeResult(self.store.insert(self.table, self.payload, upsert=self.action == "upsert", on_conflict=self._on_conflict))
+        if self.action == "update":
+            return _FakeResult(self.store.update(self.table, self.filters, self.payload))
+        removed = self.store.delete(self.table, self.filters)
+        return _FakeResult([] if self._minimal else removed, len(removed) if self._count else None)
@@ -0,0 +1,144 @@
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import count
+from rate_limiter import get_rate_limiter
+
+# 💡 호스트별 기본 타임아웃/재시도 정책 (호출부에서 timeout을 직접 넘기면 그 값이 우선합니다)
+#    provider가 있으면 보내기 전에 해당 공급자의 RateLimiter로 호출 간격을 맞춥니다.
+HOST_PROFILES = {
+    "openapi.naver.com": {"timeout": 10, "retries": 2, "provider": "naver"},
+    "api.themoviedb.org": {"timeout": 10, "retries": 2},
+    "www.kobis.or.kr": {"timeout": 10, "retries": 2},
+    "www.googleapis.com": {"timeout": 10, "retries": 2},
+    "supabase": {"timeout": 15, "retries": 2, "provider": "supabase"},
+}
+
+# 이미지 서버 등 그 외 호스트: 짧은 타임아웃, 재시도 없음 (HEAD 검사가 길어지지 않도록)
+DEFAULT_PROFILE = {"timeout": 5, "retries": 0}
+
+POOL_SIZE = 32
+
+
+def host_profile(host):
+    """호스트의 타임아웃/재시도/공급자 정책 (동기/비동기 클라이언트 공용)"""
+    if host in HOST_PROFILES:
+        return HOST_PROFILES[host]
+    if host.endswith(".supabase.co"):
+        return HOST_PROFILES["supabase"]
+    return DEFAULT_PROFILE
+
+
+class HttpClient:
+    """호스트별로 커넥션 풀(keep-alive) Session을 재사용하는 공용 HTTP 클라이언트. 호스트별 호출 횟수와 지연시간을 집계합니다."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+        # 💡 transport(method, url, **kwargs)를 지정하면 실제 네트워크 대신 그쪽으로 요청을 보냅니다. (replay.py의 기록/재생용)
+        self.transport = None
+
+    def _session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                retry = Retry(
+                    total=host_profile(host)["retries"],
+                    backoff_factor=0.5,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def record(self, host, elapsed, failed, size):
+        """요청 1건의 호스트별 통계를 남깁니다. (AsyncHttpClient도 같은 표에 기록합니다)"""
+        with self._lock:
+            stat = self._stats.setdefault(host, {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "bytes": 0})
+            stat["count"] += 1
+            stat["total"] += elapsed
+            stat["max"] = max(stat["max"], elapsed)
+            stat["bytes"] += size
+            if failed:
+                stat["errors"] += 1
+
+        # 실행 리포트용 호스트별 카운터
+        count("http.requests", host=host)
+        count("http.bytes", size, host=host)
+        count("http.latency_ms", round(elapsed * 1000, 1), host=host)
+        if failed:
+            count("http.errors", host=host)
+
+    def request(self, method, url, **kwargs):
+        host = urlparse(url).netloc.lower()
+        profile = host_profile(host)
+        kwargs.setdefault("timeout", profile["timeout"])
+        if profile.get("provider"):
+            get_rate_limiter(profile["provider"]).acquire()
+
+        started = time.perf_counter()
+        failed, size = True, 0
+        try:
+            res = (self.transport or self.send)(method, url, **kwargs)
+            failed = res.status_code >= 400
+            size = len(res.content or b"")
+            return res
+        finally:
+            self.record(host, time.perf_counter() - started, failed, size)
+
+    def send(self, method, url, **kwargs):
+        """호스트별 풀링 Session으로 실제 네트워크 요청을 보냅니다."""
+        host = urlparse(url).netloc.lower()
+        return self._session(host).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def report(self):
+        """실행 종료 시 호스트별 요청 수 / 평균·최대 지연시간을 출력합니다."""
+        with self._lock:
+            stats = sorted(self._stats.items(), key=lambda kv: kv[1]["count"], reverse=True)
+        if not stats:
+            return
+
+        print("\n📶 [HTTP] Per-host request summary")
+        print(f"  {'Host':<40} {'Reqs':>6} {'Errs':>6} {'Avg(ms)':>9} {'Max(ms)':>9} {'KB':>8}")
+        for host, s in stats:
+            avg_ms = s["total"] / s["count"] * 1000
+            print(f"  {host[:40]:<40} {s['count']:>6} {s['errors']:>6} {avg_ms:>9.0f} {s['max'] * 1000:>9.0f} {s['bytes'] / 1024:>8.1f}")
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_http_client():
+    """모든 파이프라인이 함께 쓰는 프로세스 단위 공용 HttpClient."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
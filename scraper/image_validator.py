@@ -0,0 +1,157 @@
+import os
+import asyncio
+import threading
+import requests
+import urllib3
+
+from http_client import get_http_client
+from async_http import get_async_http_client
+from local_cache import JsonFileCache
+from concurrency import run_parallel
+
+# SSL 프록시 접속 경고창 영구 숨김 처리
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+# 이미지 후보 검사 결과 종류
+OK = "ok"
+BAD_STATUS = "bad_status"
+BAD_CONTENT_TYPE = "bad_content_type"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+# 💡 결과별 캐시 유지 시간 (정상 이미지는 오래, 일시적 장애는 짧게 기억)
+OUTCOME_TTL = {
+    OK: 7 * 24 * 3600,
+    BAD_CONTENT_TYPE: 3 * 24 * 3600,
+    BAD_STATUS: 24 * 3600,
+    TIMEOUT: 6 * 3600,
+    ERROR: 6 * 3600,
+}
+
+# 💡 한 번에 동시에 검사할 후보 수. 앞쪽 묶음에서 정상 이미지를 찾으면 뒤쪽 후보는 검사하지 않습니다.
+PROBE_WAVE = max(1, int(os.environ.get("IMAGE_PROBE_WAVE", "3")))
+
+
+def _outcome(check):
+    if check.status_code != 200:
+        return BAD_STATUS
+    if not check.headers.get('Content-Type', '').startswith('image/'):
+        return BAD_CONTENT_TYPE
+    return OK
+
+
+class ImageValidator:
+    """이미지 URL 후보를 앞에서부터 작은 묶음으로 동시에 HEAD 검사하고, 결과를 실행 간에 유지되는 TTL 캐시에 기록합니다."""
+
+    def __init__(self, max_workers=None, cache=None):
+        self.max_workers = max_workers or int(os.environ.get("IMAGE_PROBE_WORKERS", "8"))
+        self.cache = cache or JsonFileCache("image_validity.json", default_ttl=OUTCOME_TTL[OK])
+        self.http = get_http_client()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.probes = 0
+
+    def _probe_network(self, url):
+        try:
+            check = self.http.head(url, timeout=2, verify=False)
+        except requests.exceptions.Timeout:
+            return TIMEOUT
+        except Exception:
+            return ERROR
+        return _outcome(check)
+
+    async def _aprobe_network(self, url):
+        try:
+            check = await get_async_http_client().head(url, timeout=2, verify=False)
+        except requests.exceptions.Timeout:
+            return TIMEOUT
+        except Exception:
+            return ERROR
+        return _outcome(check)
+
+    def _cached(self, url):
+        cached = self.cache.get(url)
+        if cached:
+            with self._stats_lock:
+                self.hits += 1
+        return cached
+
+    def _remember(self, url, outcome):
+        self.cache.set(url, outcome, ttl=OUTCOME_TTL[outcome])
+        with self._stats_lock:
+            self.probes += 1
+        return outcome
+
+    def probe(self, url):
+        """URL 1개의 검사 결과를 돌려줍니다. 캐시에 있으면 네트워크 요청 없이 바로 응답합니다."""
+        if not url:
+            return ERROR
+        return self._cached(url) or self._remember(url, self._probe_network(url))
+
+    async def aprobe(self, url):
+        """probe()의 asyncio 버전 (같은 결과 캐시를 씁니다)."""
+        if not url:
+            return ERROR
+        return self._cached(url) or self._remember(url, await self._aprobe_network(url))
+
+    def _waves(self, candidates, outcomes, limit):
+        """결과를 모르는 후보를 앞에서부터 PROBE_WAVE개씩 내보냅니다. 캐시에 있는 결과는 outcomes에 바로 채우고,
+        앞쪽에서 정상 이미지를 limit개 찾았으면 다음 묶음은 만들지 않습니다. (호출부가 묶음 결과를 채운 뒤 다음 묶음을 받음)"""
+        wave = []
+        for url in candidates:
+            cached = self._cached(url)
+            if cached:
+                outcomes[url] = cached
+                continue
+            if not wave and limit is not None and list(outcomes.values()).count(OK) >= limit:
+                return
+            wave.append(url)
+            if len(wave) == PROBE_WAVE:
+                yield wave
+                wave = []
+        if wave:
+            yield wave
+
+    def valid_urls(self, candidates, limit=None):
+        """후보를 앞에서부터 작은 묶음으로 동시에 검사하여, 정상 이미지 URL만 원래 후보 순서대로 돌려줍니다.
+        limit개를 찾으면 남은 후보 중 캐시에 결과가 있는 것만 반영하고 네트워크 검사는 멈춥니다."""
+        candidates = [url for url in dict.fromkeys(candidates) if url]
+        outcomes = {}
+        for wave in self._waves(candidates, outcomes, limit):
+            outcomes.update(zip(wave, run_parallel(self.probe, wave, self.max_workers)))
+        return [url for url in candidates if outcomes.get(url) == OK]
+
+    async def avalid_urls(self, candidates, limit=None):
+        """valid_urls()의 asyncio 버전. 동시 검사 수는 AsyncHttpClient의 공급자별 상한이 제한합니다."""
+        candidates = [url for url in dict.fromkeys(candidates) if url]
+        outcomes = {}
+        for wave in self._waves(candidates, outcomes, limit):
+            outcomes.update(zip(wave, await asyncio.gather(*(self.aprobe(url) for url in wave))))
+        return [url for url in candidates if outcomes.get(url) == OK]
+
+    def first_valid(self, candidates):
+        """정상 이미지 중 첫 번째 URL (없으면 빈 문자열)."""
+        valid = self.valid_urls(candidates, limit=1)
+        return valid[0] if valid else ""
+
+    async def afirst_valid(self, candidates):
+        """first_valid()의 asyncio 버전."""
+        valid = await self.avalid_urls(candidates, limit=1)
+        return valid[0] if valid else ""
+
+    def save(self):
+        self.cache.save()
+        print(f"  🖼️ [ImageValidator] Cache hits: {self.hits}, Network probes: {self.probes}, Cached URLs: {len(self.cache)}")
+
+
+_shared_validator = None
+_shared_lock = threading.Lock()
+
+
+def get_image_validator():
+    """뉴스/차트 파이프라인이 함께 쓰는 프로세스 단위 공용 ImageValidator."""
+    global _shared_validator
+    with _shared_lock:
+        if _shared_validator is None:
+            _shared_validator = ImageValidator()
+        return _shared_validator
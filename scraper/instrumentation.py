@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from contextlib import contextmanager
+
+# 💡 실행 리포트 저장 폴더 (RUN_REPORT_DIR 환경변수로 변경 가능)
+REPORT_DIR = os.environ.get(
+    "RUN_REPORT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+)
+
+# 💡 파이프라인 계측 저장소 (프로세스 단위). OpenTelemetry의 span/counter를 흉내낸 가벼운 버전입니다.
+_lock = threading.Lock()
+_spans = []
+_counters = {}
+_run_started = time.time()
+
+
+def _label_key(labels):
+    return ",".join(f"{k}={labels[k]}" for k in sorted(labels)) if labels else ""
+
+
+def record_span(name, started, elapsed, attrs=None):
+    with _lock:
+        _spans.append({
+            "name": name,
+            "start": round(started, 3),
+            "duration_ms": round(elapsed * 1000, 1),
+            "attrs": attrs or {}
+        })
+
+
+@contextmanager
+def span(name, **attrs):
+    """with span("news.deep_dive.subject", subject=name): ... 블록의 벽시계 시간을 속성과 함께 기록합니다.
+    as로 받은 속성 딕셔너리에 값을 넣으면 (예: 응답 크기) 함께 기록됩니다."""
+    started_wall = time.time()
+    started = time.perf_counter()
+    try:
+        yield attrs
+    finally:
+        record_span(name, started_wall, time.perf_counter() - started, attrs)
+
+
+def stage(name, **attrs):
+    """단계(stage) 단위 span. with stage("chart.fetch"): ..."""
+    return span(name, **attrs)
+
+
+class StageTimeline:
+    """순서대로 진행되는 단계들의 시간을 잽니다. enter()가 이전 단계를 닫고 다음 단계를 엽니다."""
+
+    def __init__(self, prefix, **attrs):
+        self.prefix = prefix
+        self.attrs = attrs
+        self._current = None
+        self._started = 0.0
+        self._started_wall = 0.0
+
+    def enter(self, name):
+        self.close()
+        self._current = name
+        self._started = time.perf_counter()
+        self._started_wall = time.time()
+
+    def close(self):
+        if self._current:
+            record_span(f"{self.prefix}.{self._current}", self._started_wall, time.perf_counter() - self._started, self.attrs)
+            self._current = None
+
+
+def count(name, value=1, **labels):
+    """카운터 증가. 예) count("http.bytes", 2048, host="openapi.naver.com")"""
+    key = (name, _label_key(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def counter_snapshot():
+    """{카운터 이름: {라벨 문자열: 값}} 형태로 돌려줍니다."""
+    with _lock:
+        result = {}
+        for (name, labels), value in _counters.items():
+            result.setdefault(name, {})[labels] = value
+        return result
+
+
+def stage_snapshot():
+    """span 이름별 {count, total, max}(초) 집계"""
+    with _lock:
+        spans = list(_spans)
+    stages = {}
+    for s in spans:
+        stat = stages.setdefault(s["name"], {"count": 0, "total": 0.0, "max": 0.0})
+        elapsed = s["duration_ms"] / 1000
+        stat["count"] += 1
+        stat["total"] += elapsed
+        stat["max"] = max(stat["max"], elapsed)
+    return stages
+
+
+def reset():
+    global _run_started
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _run_started = time.time()
+
+
+def build_report(job, extra=None):
+    """실행 간 diff가 가능한 JSON 리포트 딕셔너리를 만듭니다."""
+    with _lock:
+        spans = sorted(_spans, key=lambda s: s["start"])
+    finished = time.time()
+    return {
+        "job": job,
+        "started_at": datetime.fromtimestamp(_run_started, timezone.utc).isoformat(),
+        "finished_at": datetime.fromtimestamp(finished, timezone.utc).isoformat(),
+        "duration_s": round(finished - _run_started, 2),
+        "stages": {name: {"count": s["count"], "total_s": round(s["total"], 3), "max_s": round(s["max"], 3)}
+                   for name, s in stage_snapshot().items()},
+        "counters": counter_snapshot(),
+        "spans": spans,
+        "extra": extra or {},
+    }
+
+
+def write_report(job, extra=None):
+    """리포트를 reports/{job}-{UTC시각}.json 과 reports/{job}-latest.json 으로 저장하고 경로를 돌려줍니다."""
+    report = build_report(job, extra)
+    try:
+        os.makedirs(REPORT_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        path = os.path.join(REPORT_DIR, f"{job}-{stamp}.json")
+        for target in (path, os.path.join(REPORT_DIR, f"{job}-latest.json")):
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True, default=str)
+        print(f"\n🧾 [Report] Run report written to {path}")
+        return path
+    except OSError as e:
+        print(f"⚠️ [Report] Failed to write run report: {e}")
+        return None
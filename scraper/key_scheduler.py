@@ -0,0 +1,97 @@
+import re
+import time
+import threading
+
+# 429 응답에 대기시간 정보가 없을 때 적용할 기본 쿨다운 (초)
+DEFAULT_COOLDOWN = 60
+
+_DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+
+
+def parse_duration(value):
+    """Groq 리셋 헤더('2m59.56s', '7.66s', '150ms', '12')를 초 단위 float로 변환합니다."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PATTERN.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class KeyScheduler:
+    """API 키들을 라운드로빈으로 분배하고, 응답 헤더로 키별 남은 쿼터와 429 이후 쿨다운을 추적합니다."""
+
+    def __init__(self, num_keys, start_index=0):
+        self.num_keys = num_keys
+        self._cursor = start_index % num_keys if num_keys else 0
+        self._lock = threading.Lock()
+        self._state = [{"remaining_requests": None, "remaining_tokens": None, "cooldown_until": 0.0} for _ in range(num_keys)]
+
+    @property
+    def cursor(self):
+        return self._cursor
+
+    def _is_available(self, index, now):
+        return self._state[index]["cooldown_until"] <= now
+
+    def next_order(self):
+        """이번 요청에서 시도할 키 인덱스 순서. 커서를 한 칸 전진시키고, 쿨다운 중인 키는 요청 없이 건너뜁니다."""
+        with self._lock:
+            if not self.num_keys:
+                return []
+            start = self._cursor
+            self._cursor = (self._cursor + 1) % self.num_keys
+            now = time.time()
+            order = [(start + k) % self.num_keys for k in range(self.num_keys)]
+            return [i for i in order if self._is_available(i, now)]
+
+    def cooldown_remaining(self, index):
+        return max(0.0, self._state[index]["cooldown_until"] - time.time())
+
+    def record_success(self, index, headers):
+        """성공 응답의 x-ratelimit-* 헤더로 남은 쿼터를 갱신하고, 바닥났으면 리셋 시각까지 쉬게 합니다."""
+        if headers is None:
+            return
+        remaining_requests = _to_int(headers.get("x-ratelimit-remaining-requests"))
+        remaining_tokens = _to_int(headers.get("x-ratelimit-remaining-tokens"))
+
+        with self._lock:
+            state = self._state[index]
+            state["remaining_requests"] = remaining_requests
+            state["remaining_tokens"] = remaining_tokens
+
+            wait = 0.0
+            if remaining_requests == 0:
+                wait = max(wait, parse_duration(headers.get("x-ratelimit-reset-requests")) or DEFAULT_COOLDOWN)
+            if remaining_tokens == 0:
+                wait = max(wait, parse_duration(headers.get("x-ratelimit-reset-tokens")) or DEFAULT_COOLDOWN)
+            if wait:
+                state["cooldown_until"] = time.time() + wait
+
+    def record_rate_limit(self, index, headers=None):
+        """429를 받은 키를 retry-after(또는 리셋 헤더)만큼 쿨다운시킵니다."""
+        wait = None
+        if headers is not None:
+            wait = (parse_duration(headers.get("retry-after"))
+                    or parse_duration(headers.get("x-ratelimit-reset-tokens"))
+                    or parse_duration(headers.get("x-ratelimit-reset-requests")))
+        wait = wait or DEFAULT_COOLDOWN
+
+        with self._lock:
+            state = self._state[index]
+            state["remaining_requests"] = 0
+            state["cooldown_until"] = max(state["cooldown_until"], time.time() + wait)
+        return wait
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+from local_cache import cache_path
+
+# 💡 LLM 응답 캐시 정책 (환경변수로 조절)
+LLM_CACHE_TTL = int(os.environ.get("LLM_CACHE_TTL", str(24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "3000"))
+LLM_CACHE_MAX_BYTES = int(os.environ.get("LLM_CACHE_MAX_BYTES", str(30 * 1024 * 1024)))
+
+# 쓰기 N회마다 한 번씩 크기 기준 정리
+_EVICT_EVERY = 50
+
+
+def prompt_key(prompt, family):
+    """프롬프트 원문 + 모델 계열(groq/gemini)로 만든 내용 주소(content-addressed) 키"""
+    return hashlib.sha256(f"{family}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """프롬프트 해시 → JSON 응답 캐시. SQLite 파일 1개에 저장되며 TTL과 크기 한도를 넘으면 오래된 항목부터 정리합니다."""
+
+    def __init__(self, filename="llm_responses.sqlite3", ttl=LLM_CACHE_TTL,
+                 max_entries=LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._conn = sqlite3.connect(cache_path(filename), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, family TEXT, response TEXT,"
+            " size INTEGER, created_at REAL, last_used REAL)"
+        )
+        self._conn.commit()
+        self.evict()
+
+    def get(self, prompt, families):
+        """families 순서대로 캐시를 찾아 첫 번째 적중 응답을 돌려줍니다. (없으면 None)"""
+        now = time.time()
+        with self._lock:
+            for family in families:
+                key = prompt_key(prompt, family)
+                row = self._conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at > ?",
+                    (key, now - self.ttl)
+                ).fetchone()
+                if row:
+                    self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    self.hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def set(self, prompt, family, response, validate=None):
+        """호출부가 받아들인 JSON 응답만 저장합니다. 파싱이 안 되거나 빈 껍데기({}, [])이거나 validate(response)가 False면
+        저장하지 않습니다. (깨졌거나 일부만 온 응답이 캐시에 남아 TTL 동안 재사용되지 않도록)"""
+        try:
+            if not json.loads(response, strict=False):
+                return
+            if validate and not validate(response):
+                return
+        except (TypeError, ValueError):
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, family, response, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (prompt_key(prompt, family), family, response, len(response.encode("utf-8")), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            should_evict = self._writes % _EVICT_EVERY == 0
+
+        if should_evict:
+            self.evict()
+
+    def evict(self):
+        """만료 항목을 지우고, 개수/용량 한도를 넘으면 가장 오래 안 쓴 항목부터 삭제합니다."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (time.time() - self.ttl,))
+
+            count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if count > self.max_entries or total_bytes > self.max_bytes:
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall()
+                drop_keys = []
+                for key, size in rows:
+                    if count <= self.max_entries and total_bytes <= self.max_bytes:
+                        break
+                    drop_keys.append((key,))
+                    count -= 1
+                    total_bytes -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", drop_keys)
+            self._conn.commit()
+
+    def report(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0
+        print(f"  🗃️ [LLM Cache] Hits: {self.hits}, Misses: {self.misses} (Hit rate: {rate:.0f}%)")
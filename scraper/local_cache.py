@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import threading
+
+# 💡 실행(run) 간에 유지되는 로컬 캐시 폴더 (GitHub Actions에서는 actions/cache로 복원/저장됩니다)
+CACHE_DIR = os.environ.get(
+    "SCRAPER_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+)
+
+
+def cache_path(filename):
+    """캐시 폴더 안의 파일 경로를 돌려줍니다. (폴더가 없으면 생성)"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+class JsonFileCache:
+    """만료시간(TTL)이 있는 키-값 저장소. JSON 파일 1개로 실행 간에 유지되며 스레드에 안전합니다. (persist=False면 메모리 전용)"""
+
+    def __init__(self, filename, default_ttl, persist=True):
+        self.path = cache_path(filename) if persist else None
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 여러 스레드가 동시에 save()해도 임시 파일이 겹치지 않도록
+        self._dirty = False
+        self._data = self._load() if persist else {}
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        # 불러올 때 이미 만료된 항목은 버립니다.
+        now = time.time()
+        return {k: v for k, v in raw.items() if isinstance(v, dict) and v.get("expires_at", 0) > now}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry:
+                return default
+            if entry["expires_at"] <= time.time():
+                del self._data[key]
+                self._dirty = True
+                return default
+            return entry["value"]
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._data[key] = {"value": value, "expires_at": time.time() + ttl}
+            self._dirty = True
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._dirty = True
+
+    def __len__(self):
+        return len(self._data)
+
+    def save(self):
+        """변경사항이 있을 때만 파일에 기록합니다. (임시 파일에 쓴 뒤 교체하여 중간에 깨지지 않도록)"""
+        if not self.path:
+            return  # persist=False: 메모리 전용 캐시
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._data)
+            self._dirty = False
+
+        tmp_path = f"{self.path}.tmp"
+        with self._save_lock:
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(snapshot, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ [Cache] Failed to save {os.path.basename(self.path)}: {e}")
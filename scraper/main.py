@@ -1,12 +1,20 @@
 import os
 import sys
+import argparse
 from datetime import datetime
 import pytz
 from database import Database
 from naver_api import NaverNewsAPI
+from async_naver_api import AsyncNaverNewsAPI
 from chart_api import ChartAPI
+from http_client import get_http_client
+from naver_search import get_naver_search
+from naver_quota import get_naver_quota
+from orchestrator import run_categories, print_summary
+from instrumentation import write_report
+from retention import enforce_retention
 
-def run_news(db):
+def run_news(db, parallel=1, use_async=False):
     # [뉴스 모드] 4시간마다 실행되어 4개 카테고리 전부 한 번에 업데이트 (k-culture 제외)
     kst = pytz.timezone('Asia/Seoul')
     now_kst = datetime.now(kst)
@@ -18,16 +26,31 @@ def run_news(db):
     print(f"🕒 [NEWS KST Time] {now_kst.strftime('%Y-%m-%d %H:%M:%S')}")
     print("📰 [Target Categories] ALL (4 Categories Batch Mode)")
     print("=" * 60)
+    # 📊 네이버 일일 한도에서 이번 실행 예산을 정하고, 빠듯하면 요청 크기를 줄입니다.
+    get_naver_quota().plan("news")
     
-    news_api = NaverNewsAPI(db)
-    
-    # 💡 [핵심 수정] 1개만 고르던 로직을 지우고, 4개를 연속으로 모두 실행!
-    for cat in categories:
-        news_api.run_pipeline(cat)
-        
+    # 💡 --async(또는 NEWS_ASYNC=1)이면 스레드 대신 asyncio 이벤트 루프 1개로 같은 파이프라인을 실행합니다.
+    if use_async:
+        news_api = AsyncNaverNewsAPI(db)
+        summary = news_api.run_categories(categories, parallel=parallel)
+    else:
+        news_api = NaverNewsAPI(db)
+        # 💡 [핵심 수정] 1개만 고르던 로직을 지우고, 4개를 모두 실행! (--parallel N이면 N개씩 동시에)
+        summary = run_categories("NEWS", categories, news_api.run_pipeline, parallel=parallel)
+
+    print_summary("NEWS", summary)
+    # 🧹 카테고리별 개수 제한 / 보관 기간 정리를 실행당 1번 서버에서 적용
+    enforce_retention(db)
+    news_api.model_manager.save_key_cursor()
+    news_api.model_manager.report_cache()
+    get_naver_search().report()
+    get_naver_quota().report()
+    get_http_client().report()
+    # 🧾 단계별 시간 / 호스트별 HTTP / 키별 LLM 카운터를 JSON 리포트로 남깁니다 (실행 간 비교용)
+    write_report("news", extra={"categories": summary, "naver_quota": get_naver_quota().snapshot()})
     print("\n✅ 4-Hour News Automation Job Completed.")
 
-def run_chart(db):
+def run_chart(db, parallel=1):
     # [차트 모드] 12시간마다 실행되어 5개 카테고리 전부 한 번에 업데이트
     kst = pytz.timezone('Asia/Seoul')
     now_kst = datetime.now(kst)
@@ -36,27 +59,43 @@ def run_chart(db):
     print(f"🕒 [CHART KST Time] {now_kst.strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"📊 Starting Chart Data Update for ALL Categories...")
     print("=" * 60)
+    get_naver_quota().plan("chart")
 
     chart_api = ChartAPI(db)
     categories = ['k-pop', 'k-movie', 'k-drama', 'k-entertain', 'k-culture']
     
-    for cat in categories:
-        chart_api.update_chart(cat)
-        
+    summary = run_categories("CHART", categories, chart_api.update_chart, parallel=parallel)
+
+    print_summary("CHART", summary)
+    enforce_retention(db)
+    chart_api.model_manager.save_key_cursor()
+    chart_api.model_manager.report_cache()
+    get_naver_search().report()
+    get_naver_quota().report()
+    get_http_client().report()
+    # 🧾 단계별 시간 / 호스트별 HTTP / 키별 LLM 카운터를 JSON 리포트로 남깁니다 (실행 간 비교용)
+    write_report("chart", extra={"categories": summary, "naver_quota": get_naver_quota().snapshot()})
     print("\n✅ 12-Hour Chart Automation Job Completed.")
 
 def main():
+    # 실행 시 전달된 인수(argument) 확인: python main.py [news|chart] [--parallel N] [--async]
+    parser = argparse.ArgumentParser(description="K-Enter news & chart scraper")
+    parser.add_argument("mode", nargs="?", default="news", type=str.lower, choices=["news", "chart"])
+    parser.add_argument("--parallel", type=int, default=1, help="number of categories to run at the same time")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        default=os.environ.get("NEWS_ASYNC", "0") == "1", help="run the news pipeline on asyncio")
+    args = parser.parse_args()
+
     db = Database()
     if not db.client:
         print("❌ DB connection failed. Exiting.")
         return
 
-    # 실행 시 전달된 인수(argument) 확인
-    if len(sys.argv) > 1 and sys.argv[1].lower() == "chart":
-        run_chart(db)
+    if args.mode == "chart":
+        run_chart(db, parallel=args.parallel)
     else:
         # 인수가 없거나 'news'이면 뉴스로 실행 (기본값)
-        run_news(db)
+        run_news(db, parallel=args.parallel, use_async=args.use_async)
 
 if __name__ == "__main__":
     main()
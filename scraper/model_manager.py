@@ -1,7 +1,35 @@
 import os
+import asyncio
+import hashlib
+import threading
+
+from local_cache import JsonFileCache
+from key_scheduler import KeyScheduler
+from llm_cache import LLMResponseCache
+from instrumentation import count, span
+from rate_limiter import get_rate_limiter
+from async_http import get_async_http_client
+from token_budget import estimate_tokens, prompt_budget, MAX_OUTPUT_TOKENS
+
+# 💡 모델 목록 조회 결과 유지 시간 (기본 6시간, MODEL_CACHE_TTL 환경변수로 조절)
+MODEL_CACHE_TTL = int(os.environ.get("MODEL_CACHE_TTL", str(6 * 3600)))
+
+
+def _key_fingerprint(api_key):
+    """API 키 원문 대신 캐시 키로 쓸 짧은 해시 (디스크 스냅샷에 키가 남지 않도록)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _is_model_not_found(error):
+    """완료 요청이 '모델 없음' 때문에 실패했는지 판별합니다. (이때만 모델 캐시를 무효화)"""
+    if getattr(error, "status_code", None) == 404:
+        return True
+    message = str(error).lower()
+    return any(x in message for x in ["model_not_found", "model not found", "does not exist", "decommissioned"])
+
 
 class ModelManager:
-    def __init__(self):
+    def __init__(self, db=None, model_snapshot=None):
         # GitHub Actions에 등록된 GROQ_API_KEY1 ~ GROQ_API_KEY20 등을 모두 찾아 리스트에 담습니다.
         self.groq_keys = []
         for i in range(1, 8):  
@@ -12,14 +40,89 @@ class ModelManager:
         # 제미나이 백업 키
         self.gemini_key = os.environ.get("GEMINI_API_KEY")
 
+        # 💡 키별 클라이언트 재사용 & 모델 선택 결과 캐시 (매 호출마다 models.list()를 부르지 않도록)
+        if model_snapshot is None:
+            model_snapshot = os.environ.get("MODEL_CACHE_SNAPSHOT", "1") != "0"
+        self._model_cache = JsonFileCache("model_selection.json", default_ttl=MODEL_CACHE_TTL, persist=model_snapshot)
+        self._groq_clients = {}
+        self._async_groq_clients = {}
+        self._gemini_client = None
+        self._lock = threading.Lock()
+
+        # 💡 키 로테이션 커서: db가 주어지면 system_status 테이블에 저장된 지점부터 이어서 시작
+        self.db = db
+        self.persist_cursor = db is not None and os.environ.get("GROQ_CURSOR_PERSIST", "1") != "0"
+        start_index = self.db.get_groq_index() if self.persist_cursor and self.groq_keys else 0
+        self.key_scheduler = KeyScheduler(len(self.groq_keys), start_index=start_index)
+
+        # 💡 프롬프트 해시 기반 응답 캐시 (LLM_CACHE=0이면 비활성화)
+        self.response_cache = LLMResponseCache() if os.environ.get("LLM_CACHE", "1") != "0" else None
+
+    def report_cache(self):
+        """이번 실행의 응답 캐시 적중/미스 횟수를 출력합니다."""
+        if self.response_cache:
+            self.response_cache.report()
+
+    def save_key_cursor(self):
+        """다음 실행이 이어서 시작하도록 현재 로테이션 커서를 system_status에 기록합니다."""
+        if self.persist_cursor and self.groq_keys:
+            self.db.update_groq_index(self.key_scheduler.cursor)
+
+    def _get_groq_client(self, Groq, api_key):
+        with self._lock:
+            client = self._groq_clients.get(api_key)
+            if client is None:
+                # 429 재시도는 SDK가 같은 키로 반복하지 않고 KeyScheduler가 다른 키로 넘기도록 max_retries=0
+                client = Groq(api_key=api_key, max_retries=0)
+                self._groq_clients[api_key] = client
+            return client
+
+    def _get_async_groq_client(self, AsyncGroq, api_key):
+        with self._lock:
+            client = self._async_groq_clients.get(api_key)
+            if client is None:
+                client = AsyncGroq(api_key=api_key, max_retries=0)
+                self._async_groq_clients[api_key] = client
+            return client
+
+    def _get_gemini_client(self, genai):
+        with self._lock:
+            if self._gemini_client is None:
+                self._gemini_client = genai.Client(api_key=self.gemini_key)
+            return self._gemini_client
+
+    def _resolve_model(self, provider, api_key, client):
+        """키별로 모델을 한 번만 조회하고, TTL 동안 캐시된 결과를 재사용합니다."""
+        cache_key = f"{provider}:{_key_fingerprint(api_key)}"
+        model_name = self._model_cache.get(cache_key)
+        if model_name:
+            return model_name
+
+        if provider == "groq":
+            model_name, is_fallback = self._select_groq_model(client)
+        else:
+            model_name, is_fallback = self._select_gemini_model(client)
+
+        # 목록 조회가 실패해서 고른 기본 모델은 캐시하지 않습니다. (다음 호출에서 다시 조회)
+        if not is_fallback:
+            self._model_cache.set(cache_key, model_name)
+            self._model_cache.save()
+        return model_name
+
+    def _invalidate_model(self, provider, api_key, error):
+        if _is_model_not_found(error):
+            print(f"🧹 [ModelManager] Cached {provider} model is no longer available. Re-resolving on next call.")
+            self._model_cache.delete(f"{provider}:{_key_fingerprint(api_key)}")
+            self._model_cache.save()
+
     def _select_groq_model(self, client):
-        """API를 통해 사용 가능한 모델 리스트를 불러와 최적의 텍스트 모델을 동적 선택합니다."""
+        """API를 통해 사용 가능한 모델 리스트를 불러와 최적의 텍스트 모델을 동적 선택합니다. (모델명, 목록 조회 실패로 기본값을 썼는지)를 돌려줍니다."""
         try:
             models = client.models.list()
             all_models = models.data
             
             if not all_models:
-                return "llama-3.3-70b-versatile"
+                return "llama-3.3-70b-versatile", False
 
             valid_models = []
             for m in all_models:
@@ -30,28 +133,28 @@ class ModelManager:
                 valid_models.append(m.id)
 
             if not valid_models:
-                return "llama-3.3-70b-versatile"
+                return "llama-3.3-70b-versatile", False
 
             # 1순위: 가장 파라미터가 높고 고성능인 70b 또는 90b 모델
             high_perf = [m for m in valid_models if ("70b" in m.lower() or "90b" in m.lower()) and "preview" not in m.lower()]
             if high_perf:
-                return high_perf[0]
+                return high_perf[0], False
 
             # 2순위: 그 외 일반 Llama 모델 중 최신 버전
             llama_models = [m for m in valid_models if "llama" in m.lower()]
             if llama_models:
                 llama_models.sort(reverse=True)
-                return llama_models[0]
+                return llama_models[0], False
 
             # 3순위: 그냥 리스트에 있는 사용 가능한 첫 번째 모델
-            return valid_models[0]
+            return valid_models[0], False
             
         except Exception as e:
             print(f"⚠️ [Groq Model Fetch Error] {e}")
-            return "llama-3.3-70b-versatile"
+            return "llama-3.3-70b-versatile", True
 
     def _select_gemini_model(self, client):
-        """Gemini 실시간 리스트에서 동적으로 최신/최적 모델 1개 선택"""
+        """Gemini 실시간 리스트에서 동적으로 최신/최적 모델 1개 선택. (모델명, 목록 조회 실패로 기본값을 썼는지)를 돌려줍니다."""
         try:
             models = client.models.list()
             excluded_keywords = ["pro", "ultra", "advanced", "vision"] 
@@ -66,76 +169,237 @@ class ModelManager:
             flash_models = [m for m in candidates if "flash" in m]
             if flash_models:
                 flash_models.sort(reverse=True)
-                return flash_models[0]
+                return flash_models[0], False
             
             # 2순위: 그 외 가능한 모델 중 가장 최신 버전
             if candidates:
                 candidates.sort(reverse=True)
-                return candidates[0]
+                return candidates[0], False
 
-            return "gemini-2.5-flash"
+            return "gemini-2.5-flash", False
         except Exception as e:
             print(f"⚠️ [Gemini Model Fetch Error] {e}")
-            return "gemini-2.5-flash"
+            return "gemini-2.5-flash", True
 
 
-    def generate_json(self, prompt):
+    def generate_json(self, prompt, use_cache=True, validate=None):
         """
-        Groq API 키를 순환하며 '동적으로 불러온 최적의 모델'로 생성을 시도합니다.
+        Groq API 키를 라운드로빈으로 순환하며 '동적으로 불러온 최적의 모델'로 생성을 시도합니다.
         모두 에러가 나면 Gemini의 '동적 최적 모델'로 백업 전환합니다.
+        같은 프롬프트의 응답이 캐시에 있으면 네트워크 요청 없이 바로 돌려줍니다.
+        validate(응답 텍스트)가 주어지면 True인 응답만 캐시에 남깁니다. (호출부가 받아들인 응답만 재사용)
         """
-        
+
+        cached = self._cached_response(prompt, use_cache)
+        if cached:
+            return cached
+
+        prompt_tokens = self._measure_prompt(prompt)
+        with span("llm.generate_json", prompt_chars=len(prompt), prompt_tokens_est=prompt_tokens) as call:
+            content, family = self._generate(prompt)
+            call["model_family"] = family
+            call["response_chars"] = len(content or "")
+        return self._finish(prompt, content, family, use_cache, validate)
+
+    async def agenerate_json(self, prompt, use_cache=True, validate=None):
+        """generate_json()의 asyncio 버전. 캐시/키 로테이션/계측은 같은 코드를 쓰고 API 호출만 비동기입니다."""
+        cached = self._cached_response(prompt, use_cache)
+        if cached:
+            return cached
+
+        prompt_tokens = self._measure_prompt(prompt)
+        with span("llm.generate_json", prompt_chars=len(prompt), prompt_tokens_est=prompt_tokens) as call:
+            content, family = await self._agenerate(prompt)
+            call["model_family"] = family
+            call["response_chars"] = len(content or "")
+        return self._finish(prompt, content, family, use_cache, validate)
+
+    def _cached_response(self, prompt, use_cache):
+        # 🗃️ 0. 프롬프트 해시 캐시 조회 (Groq → Gemini 순서로 적중 확인)
+        if use_cache and self.response_cache:
+            cached = self.response_cache.get(prompt, ["groq", "gemini"])
+            if cached:
+                print("🗃️ [ModelManager] Cache hit! Skipping LLM call.")
+                count("llm.cache_hits")
+                return cached
+        return None
+
+    def _measure_prompt(self, prompt):
+        # 📏 호출마다 프롬프트/응답 크기를 기록하고, 예산을 넘는 프롬프트는 경고합니다. (호출부는 token_budget으로 나눠 보내야 함)
+        prompt_tokens = estimate_tokens(prompt)
+        count("llm.prompt_tokens_est", prompt_tokens)
+        if prompt_tokens > prompt_budget():
+            print(f"⚠️ [ModelManager] Prompt is ~{prompt_tokens} tokens (budget {prompt_budget()}). It may be rejected.")
+            count("llm.oversized_prompts")
+        return prompt_tokens
+
+    def _finish(self, prompt, content, family, use_cache, validate=None):
+        count("llm.response_chars", len(content or ""))
+        if content and use_cache and self.response_cache:
+            self.response_cache.set(prompt, family, content, validate)
+        return content
+
+    def _record_usage(self, provider, key_label, prompt_tokens, completion_tokens, retries):
+        """키별 요청 수 / 토큰 / 재시도 횟수를 실행 리포트 카운터에 기록합니다."""
+        count("llm.requests", provider=provider, key=key_label)
+        count("llm.prompt_tokens", prompt_tokens or 0, provider=provider, key=key_label)
+        count("llm.completion_tokens", completion_tokens or 0, provider=provider, key=key_label)
+        if retries:
+            count("llm.retries", retries, provider=provider, key=key_label)
+
+    def _generate(self, prompt):
+        """실제 LLM 호출 (Groq 키 로테이션 → Gemini 백업). (응답 텍스트, 모델 계열)을 돌려줍니다."""
+        attempts = 0
+
         # 🚀 1. Groq 메인 파이프라인 (키 로테이션 + 동적 모델 선택)
-        if self.groq_keys:
+        groq = self._groq_sdk()
+        for i in self._groq_key_order(groq):
+            api_key = self.groq_keys[i]
+            attempts += 1
             try:
-                from groq import Groq
-            except ImportError:
-                print("⚠️ 'groq' 라이브러리가 필요합니다. (서버에 pip install groq 확인)")
-                Groq = None
-
-            if Groq:
-                for i, api_key in enumerate(self.groq_keys):
-                    try:
-                        print(f"🔄 [ModelManager] Attempting Groq with Key {i + 1}...")
-                        client = Groq(api_key=api_key)
-                        
-                        # 💡 해당 키로 사용 가능한 모델 목록을 불러와서 최적 모델 자동 선택!
-                        model_name = self._select_groq_model(client)
-                        print(f"🤖 [ModelManager] Auto-selected Groq Model: {model_name}")
-                        
-                        response = client.chat.completions.create(
-                            model=model_name,
-                            messages=[{"role": "user", "content": prompt}],
-                            response_format={"type": "json_object"},
-                            max_tokens=4000
-                        )
-                        print(f"✅ [ModelManager] Success with Groq Key {i + 1}!")
-                        return response.choices[0].message.content
-                        
-                    except Exception as e:
-                        print(f"⚠️ [ModelManager] Groq Key {i + 1} failed: {e}")
-                        continue # 에러 발생 시 다음 키(i+2)로 이동
+                client, model_name = self._groq_model(groq, i)
+                get_rate_limiter("groq", scale=len(self.groq_keys)).acquire()
+                # 응답 헤더(x-ratelimit-*)를 읽기 위해 raw response로 호출
+                raw_response = client.chat.completions.with_raw_response.create(**_groq_request(model_name, prompt))
+                self.key_scheduler.record_success(i, raw_response.headers)
+                return self._groq_result(i, raw_response.parse(), attempts)
+            except Exception as e:
+                self._groq_failed(i, api_key, e)   # 에러 발생 시 다음 순번의 키로 이동
 
         # 🛡️ 2. Gemini 백업 파이프라인 (Groq 키가 전부 막혔을 때)
         if self.gemini_key:
-            print("🔄 [ModelManager] All Groq keys failed! Falling back to Gemini Backup...")
+            attempts += 1
             try:
-                from google import genai
-                gemini_client = genai.Client(api_key=self.gemini_key)
-                
-                # 💡 제미나이도 사용 가능한 최적 모델 자동 선택!
-                model_name = self._select_gemini_model(gemini_client)
-                print(f"✨ [ModelManager] Auto-selected Gemini Model: {model_name}")
-                
-                response = gemini_client.models.generate_content(
-                    model=model_name,
-                    contents=prompt,
-                    config={"response_mime_type": "application/json"}
-                )
-                print("✅ [ModelManager] Success with Gemini Backup!")
-                return response.text
+                gemini_client, model_name = self._gemini_model()
+                get_rate_limiter("gemini").acquire()
+                response = gemini_client.models.generate_content(**_gemini_request(model_name, prompt))
+                return self._gemini_result(response, attempts)
             except Exception as e:
-                print(f"❌ [ModelManager] Gemini Fallback also failed: {e}")
-        
+                self._gemini_failed(e)
+
         print("❌ [ModelManager] FATAL ERROR: All LLM APIs are currently down.")
-        return None
+        return None, None
+
+    async def _agenerate(self, prompt):
+        """_generate()의 asyncio 버전 (AsyncGroq → Gemini aio). 키 순서/성공·실패 처리는 같은 헬퍼를 쓰고 API 호출만 await합니다.
+        모델 선택은 처음 1번만 스레드에서 조회합니다."""
+        attempts = 0
+
+        groq = self._groq_sdk()
+        for i in self._groq_key_order(groq):
+            api_key = self.groq_keys[i]
+            attempts += 1
+            try:
+                _, model_name = await asyncio.to_thread(self._groq_model, groq, i)
+                client = self._get_async_groq_client(groq.AsyncGroq, api_key)
+                async with get_async_http_client().slot("groq"):
+                    await get_rate_limiter("groq", scale=len(self.groq_keys)).acquire_async()
+                    raw_response = await client.chat.completions.with_raw_response.create(**_groq_request(model_name, prompt))
+                self.key_scheduler.record_success(i, raw_response.headers)
+                return self._groq_result(i, await raw_response.parse(), attempts)
+            except Exception as e:
+                self._groq_failed(i, api_key, e)
+
+        if self.gemini_key:
+            attempts += 1
+            try:
+                gemini_client, model_name = await asyncio.to_thread(self._gemini_model)
+                async with get_async_http_client().slot("gemini"):
+                    await get_rate_limiter("gemini").acquire_async()
+                    response = await gemini_client.aio.models.generate_content(**_gemini_request(model_name, prompt))
+                return self._gemini_result(response, attempts)
+            except Exception as e:
+                self._gemini_failed(e)
+
+        print("❌ [ModelManager] FATAL ERROR: All LLM APIs are currently down.")
+        return None, None
+
+    def _groq_sdk(self):
+        """groq 모듈 (키가 없거나 라이브러리가 없으면 None)"""
+        if not self.groq_keys:
+            return None
+        try:
+            import groq
+        except ImportError:
+            print("⚠️ 'groq' 라이브러리가 필요합니다. (서버에 pip install groq 확인)")
+            return None
+        return groq
+
+    def _groq_key_order(self, groq):
+        # 💡 라운드로빈 순서로 키를 고르고, 쿨다운 중인 키는 요청 없이 건너뜁니다.
+        if groq is None:
+            return []
+        key_order = self.key_scheduler.next_order()
+        if not key_order:
+            print("⏳ [ModelManager] All Groq keys are cooling down after rate limits.")
+        return key_order
+
+    def _groq_model(self, groq, i):
+        """i번째 키의 동기 클라이언트와 최적 모델 (최초 1회만 목록 조회, 이후 캐시 사용)"""
+        print(f"🔄 [ModelManager] Attempting Groq with Key {i + 1}...")
+        api_key = self.groq_keys[i]
+        client = self._get_groq_client(groq.Groq, api_key)
+        model_name = self._resolve_model("groq", api_key, client)
+        print(f"🤖 [ModelManager] Auto-selected Groq Model: {model_name}")
+        return client, model_name
+
+    def _groq_result(self, i, response, attempts):
+        print(f"✅ [ModelManager] Success with Groq Key {i + 1}!")
+        usage = getattr(response, "usage", None)
+        self._record_usage("groq", f"groq{i + 1}", getattr(usage, "prompt_tokens", 0),
+                           getattr(usage, "completion_tokens", 0), attempts - 1)
+        return response.choices[0].message.content, "groq"
+
+    def _groq_failed(self, i, api_key, error):
+        if getattr(error, "status_code", None) == 429:
+            wait = self.key_scheduler.record_rate_limit(i, getattr(getattr(error, "response", None), "headers", None))
+            print(f"⏳ [ModelManager] Groq Key {i + 1} rate-limited. Cooling down for {wait:.0f}s.")
+            count("llm.failures", provider="groq", key=f"groq{i + 1}", reason="rate_limit")
+        else:
+            count("llm.failures", provider="groq", key=f"groq{i + 1}", reason="error")
+            print(f"⚠️ [ModelManager] Groq Key {i + 1} failed: {error}")
+            self._invalidate_model("groq", api_key, error)
+
+    def _gemini_model(self):
+        """Gemini 클라이언트와 최적 모델 (제미나이도 사용 가능한 최적 모델 자동 선택, 캐시 재사용)"""
+        print("🔄 [ModelManager] All Groq keys failed! Falling back to Gemini Backup...")
+        from google import genai
+        gemini_client = self._get_gemini_client(genai)
+        model_name = self._resolve_model("gemini", self.gemini_key, gemini_client)
+        print(f"✨ [ModelManager] Auto-selected Gemini Model: {model_name}")
+        return gemini_client, model_name
+
+    def _gemini_result(self, response, attempts):
+        print("✅ [ModelManager] Success with Gemini Backup!")
+        usage = getattr(response, "usage_metadata", None)
+        self._record_usage("gemini", "gemini", getattr(usage, "prompt_token_count", 0),
+                           getattr(usage, "candidates_token_count", 0), attempts - 1)
+        return response.text, "gemini"
+
+    def _gemini_failed(self, error):
+        print(f"❌ [ModelManager] Gemini Fallback also failed: {error}")
+        count("llm.failures", provider="gemini", key="gemini", reason="error")
+        self._invalidate_model("gemini", self.gemini_key, error)
+
+    async def aclose(self):
+        """asyncio 클라이언트를 닫습니다. (AsyncGroq는 만든 이벤트 루프에 묶이므로 루프가 끝나기 전에 호출)"""
+        clients, self._async_groq_clients = self._async_groq_clients, {}
+        for client in clients.values():
+            await client.close()
+
+
+def _groq_request(model_name, prompt):
+    return {
+        "model": model_name,
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+        "max_tokens": MAX_OUTPUT_TOKENS,
+    }
+
+
+def _gemini_request(model_name, prompt):
+    return {
+        "model": model_name,
+        "contents": prompt,
+        "config": {"response_mime_type": "application/json"},
+    }
@@ -1,37 +1,419 @@
 import os
 import json
-import requests
-import html
-import re
+import time
 from datetime import datetime, timedelta
 import pytz
 import urllib3
-from urllib.parse import quote
 from email.utils import parsedate_to_datetime
 
 # ✅ 똑똑해진 ModelManager 임포트
 from model_manager import ModelManager
+from concurrency import stream_map
+from instrumentation import StageTimeline, span, count
+from image_validator import get_image_validator
+from http_client import get_http_client
+from naver_search import get_naver_search
+from naver_quota import get_naver_quota
+from broad_scan import IncrementalBroadScanner
+from subject_frequency import SubjectFrequencyEngine, SKIP_LLM_RATIO
+from near_duplicate import dedupe_titles, select_snippets
+from text_normalize import clean_items
+from token_budget import generate_chunked, estimate_tokens, prompt_budget, MAX_OUTPUT_TOKENS
+
+# 💡 묶음 요약에서 기사 1개 응답에 필요하다고 보는 출력 토큰 수
+SUMMARY_OUTPUT_TOKENS = 450
 
 # SSL 프록시 접속 경고창 영구 숨김 처리
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class NaverNewsAPI:
-    def __init__(self, db_client):
+    def __init__(self, db_client, max_workers=None):
         self.db = db_client
+        self.http = get_http_client()
         
         # 네이버 API 키 세팅
         self.naver_id = os.environ.get("NAVER_CLIENT_ID")
         self.naver_secret = os.environ.get("NAVER_CLIENT_SECRET")
         
         # ModelManager가 알아서 Groq 키 리스트와 Gemini 키를 싹 다 관리합니다.
-        self.model_manager = ModelManager()
+        self.model_manager = ModelManager(db_client)
+
+        # 💡 Deep Dive 동시 처리 워커 수 (인자 또는 NAVER_DEEP_DIVE_WORKERS 환경변수로 조절, 기본 6)
+        self.max_workers = max_workers or int(os.environ.get("NAVER_DEEP_DIVE_WORKERS", "6"))
+
+        # 💡 Step 8 요약 동시 요청 수 (LLM_SUMMARY_WORKERS 환경변수, 기본값은 Groq 키 개수 기준 최대 4)
+        self.summary_workers = int(os.environ.get("LLM_SUMMARY_WORKERS", "0")) or max(1, min(4, len(self.model_manager.groq_keys)))
+        # 💡 Step 8 요청 1번에 묶을 최대 주제 수 (SUMMARY_BATCH_SIZE, 1이면 예전처럼 주제별 요청). 실제 크기는 토큰 예산에 맞춰 줄어듭니다.
+        self.summary_batch_size = max(1, int(os.environ.get("SUMMARY_BATCH_SIZE", "4")))
+        self.image_validator = get_image_validator()
+        self.naver_search = get_naver_search()
+        self.broad_scanner = IncrementalBroadScanner(self.naver_search)
+        # 📊 Step 3/4 주제 빈도는 로컬에서 세고, LLM은 짧은 후보 목록 검증(별칭 병합)에만 씁니다.
+        self.subject_engine = SubjectFrequencyEngine()
+
+    def _deep_dive_subject(self, item, kst, time_limit):
+        """Step 5의 주제 1개 처리 단위 (스니펫 풀링 + 팩트 필터). (결과 딕셔너리 또는 None, 출력할 로그 라인 리스트)를 돌려줍니다."""
+        name, score = item.get("name"), item.get("score")
+        log = [f"\n    🔎 Deep Dive: {name} (Score: {score})"]
+        try:
+            # 💡 같은 인물이 여러 카테고리에 나와도 검색은 실행당 한 번만 (공용 검색 캐시)
+            raw_articles = self.naver_search.news(name, display=_deep_dive_display(score), sort="sim", timeout=10)
+            valid_articles = _recent_articles(raw_articles, kst, time_limit)
+        except Exception as e:
+            log.append(f"      ⏭️ API Error. Skipping. ({e})")
+            return None, log
+        return self._pool_snippets(item, raw_articles, valid_articles, log)
+
+    def _pool_snippets(self, item, raw_articles, valid_articles, log):
+        """Step 5의 네트워크 없는 부분: 24시간 이내 기사에서 주제가 언급된 스니펫만 모아 근접 중복을 걸러냅니다."""
+        name, score = item.get("name"), item.get("score")
+        if not valid_articles:
+            log.append(f"      ⏭️ No recent valid articles (within 24h) found. Skipping.")
+            return None, log
+
+        snippets_pool = []
+        main_link = ""
+
+        # 정리/소문자화는 응답 묶음당 1번만 하고 항목에 붙여 둔 값을 씁니다.
+        folded_name = name.casefold()
+        for art in clean_items(valid_articles):
+            if folded_name in art['folded']:
+                snippets_pool.append(f"[Title]: {art['clean_title']}\n[Summary]: {art['clean_description']}")
+                if not main_link:
+                    main_link = art['link']
+
+        if len(snippets_pool) < 2:
+            log.append(f"      ⏭️ Not enough relevant snippets specifically about '{name}'. Dropping.")
+            return None, log
+
+        # 💡 통신사 재송고처럼 거의 같은 스니펫은 하나로 합치고, 토큰 예산 안에서 관련도 순으로 채웁니다.
+        selected = select_snippets(snippets_pool, key=_snippet_text)
+        final_combined_content = "\n\n".join(selected)
+        log.append(f"      📚 Pooled {len(selected)} of {len(snippets_pool)} snippets after near-duplicate filter (Fetched {len(raw_articles)} based on score)")
+        return {
+            "name": name,
+            "score": score,
+            "content": final_combined_content,
+            "link": main_link
+        }, log
+
+    def _attach_image(self, item):
+        """Step 6의 주제 1개 처리 단위 (이미지 후보 검색 + 미리 검사). 어떤 이미지를 쓸지는 _pick_image가 순위 순서대로 정합니다."""
+        log = [f"    🖼️ Image Search: {item['name']}"]
+        try:
+            img_items = self.naver_search.images(item["name"], display=get_naver_quota().image_candidates(10), sort="sim", timeout=5)
+        except Exception as e:
+            return _image_result(item, "", log)
+        candidates = _image_links(img_items)
+        # 💡 첫 정상 이미지까지만 미리 검사해 캐시에 남겨 두면, 순위 순서로 고를 때는 대부분 네트워크 요청 없이 끝납니다.
+        self.image_validator.valid_urls(candidates, limit=1)
+        return dict(item, image_candidates=candidates), log
+
+    def _pick_image(self, item, used_image_urls):
+        """Step 6 마무리: 순위 순서대로 불려서, 앞 순위가 가져가지 않은 첫 번째 정상 이미지를 이 주제에 붙입니다.
+        (도착 순서와 상관없이 같은 입력이면 항상 같은 이미지가 같은 주제에 붙습니다.)"""
+        item = dict(item)
+        candidates = _image_candidates(item.pop("image_candidates", []), used_image_urls)
+        best_img_url = self.image_validator.first_valid(candidates)
+        if best_img_url:
+            used_image_urls.add(best_img_url)
+        return _image_result(item, best_img_url, [f"    🖼️ Image Pick: {item['name']}"])
+
+    def _summarize_subject(self, item, target_category):
+        """Step 8의 주제 1개 처리 단위. JSON 실패 시 이 항목만 버리고 (결과 딕셔너리 또는 None, 로그 라인 리스트)를 돌려줍니다."""
+        log = [f"    📝 Generating AI summary & Category for: {item['name']}..."]
+        try:
+            ai_res_text = self.model_manager.generate_json(prompt=self._summary_prompt(item),
+                                                           validate=self._summary_validator(item, target_category))
+        except Exception as e:
+            log.append(f"      ❌ AI Generation Error for {item['name']}: {e}")
+            return None, log
+        return self._summary_row(item, ai_res_text, target_category, log)
+
+    def _summary_prompt(self, item):
+        name = item["name"]
+        content_pool = item["content"]
+
+        return f"""
+        You are a rigorous and objective K-entertainment news reporter.
+        I have gathered multiple verified news snippets specifically about '{name}'.
+
+        Article Writing Rules:
+        1. Title Format: MUST use the exact format: `[{name}] Catchy English Title`
+        2. Summary: Synthesize the provided news snippets into a single, cohesive English news summary (3-10 lines). Focus strictly on the facts presented about '{name}'.
+        3. ✅ Bullet Points: Use bullet points (-) for the 2-3 most important facts.
+        4. ✅ AEO Optimization: Add a final section strictly titled "Q: Why is this trending?" with a clear 1-sentence answer starting with "A: ".
+        5. Data Preservation: Retain all numbers (dates, rankings, amounts) and proper nouns exactly as they appear.
+        6. ✅ Categorization: Analyze the actual content and assign the most accurate category. You MUST choose EXACTLY ONE from this list: ["k-pop", "k-movie", "k-drama", "k-entertain"]. Do not invent new categories.
+
+        Verified News Snippets to analyze:
+        {content_pool}
+
+        Output valid JSON ONLY:
+        {{
+            "main_subject": "{name}",
+            "category": "<choose one from: k-pop, k-movie, k-drama, k-entertain>",
+            "title": "[{name}] ...",
+            "summary": "...\n\n- Key Point 1...\n- Key Point 2...\n\nQ: Why is this trending?\nA: ..."
+        }}
+        """
+
+    def _summary_row(self, item, ai_res_text, target_category, log):
+        if not ai_res_text:
+            log.append(f"      ⏭️ [DISCARDED] AI API failed to return JSON.")
+            return None, log
+        try:
+            data = json.loads(ai_res_text)
+            row, line = self._build_row(item, data, target_category)
+            log.append(line)
+            return row, log
+        except Exception as e:
+            log.append(f"      ❌ AI Generation Error for {item['name']}: {e}")
+            return None, log
+
+    def _summary_validator(self, item, target_category):
+        # 행으로 바뀌는 응답만 LLM 캐시에 남깁니다.
+        return lambda ai_res_text: self._summary_row(item, ai_res_text, target_category, [])[0] is not None
+
+    def _build_row(self, item, data, target_category):
+        """AI 응답(기사 1개 분량)을 live_news 행으로 바꿉니다. (행 또는 None, 로그 라인)"""
+        name = item["name"]
+        actual_subject = str(data.get("main_subject") or name).strip()
+        title = str(data.get("title") or "").strip()
+        summary = str(data.get("summary") or "").strip()
+        ai_category = str(data.get("category") or target_category).strip().lower()
+
+        valid_categories = ['k-pop', 'k-movie', 'k-drama', 'k-entertain']
+        if ai_category not in valid_categories:
+            ai_category = target_category
+
+        if not title or not summary:
+            return None, f"      ⏭️ [DISCARDED] AI failed to generate content."
+
+        final_score = item["score"] + 10
+
+        return {
+            "category": ai_category,
+            "keyword": actual_subject,
+            "title": title,
+            "summary": summary,
+            "link": item["link"],
+            "image_url": item["image"],
+            "score": final_score,
+            "likes": 0
+        }, f"      ✅ Generated: {title} (Categorized as: [{ai_category}])"
+
+    def _batch_prompt(self, items):
+        subjects_block = "\n\n".join(
+            f"### SUBJECT: {item['name']}\n{item['content']}" for item in items
+        )
+        return f"""
+        You are a rigorous and objective K-entertainment news reporter.
+        I have gathered verified news snippets for {len(items)} different subjects. Write ONE separate article for EACH subject.
+
+        Article Writing Rules (apply to every subject independently, never mix facts between subjects):
+        1. Title Format: MUST use the exact format: `[Subject Name] Catchy English Title`
+        2. Summary: Synthesize that subject's snippets into a single, cohesive English news summary (3-10 lines).
+        3. ✅ Bullet Points: Use bullet points (-) for the 2-3 most important facts.
+        4. ✅ AEO Optimization: Add a final section strictly titled "Q: Why is this trending?" with a clear 1-sentence answer starting with "A: ".
+        5. Data Preservation: Retain all numbers (dates, rankings, amounts) and proper nouns exactly as they appear.
+        6. ✅ Categorization: You MUST choose EXACTLY ONE from this list: ["k-pop", "k-movie", "k-drama", "k-entertain"].
+        7. "main_subject" MUST be copied EXACTLY from the SUBJECT line it belongs to.
+
+        {subjects_block}
+
+        Output valid JSON ONLY:
+        {{
+            "articles": [
+                {{
+                    "main_subject": "<exact SUBJECT name>",
+                    "category": "<choose one from: k-pop, k-movie, k-drama, k-entertain>",
+                    "title": "[Subject Name] ...",
+                    "summary": "...\n\n- Key Point 1...\n- Key Point 2...\n\nQ: Why is this trending?\nA: ..."
+                }}
+            ]
+        }}
+        """
+
+    def _fits_summary_batch(self, items):
+        """묶음이 프롬프트 예산과 출력 한도 안에 들어가는지 (기사 1개 응답은 약 SUMMARY_OUTPUT_TOKENS 토큰으로 가정)"""
+        if len(items) > self.summary_batch_size:
+            return False
+        if len(items) * SUMMARY_OUTPUT_TOKENS > MAX_OUTPUT_TOKENS:
+            return False
+        return estimate_tokens(self._batch_prompt(items)) <= prompt_budget()
+
+    def _summarize_batch(self, items, target_category):
+        """Step 8의 묶음 처리 단위. 여러 주제를 한 번의 요청으로 요약하고 main_subject로 결과를 매칭합니다.
+        응답이 깨졌거나 빠진 주제는 주제별 요청으로 다시 시도합니다. ([행 리스트], 로그 라인 리스트)"""
+        if len(items) == 1:
+            row, log = self._summarize_subject(items[0], target_category)
+            return [row] if row else [], log
+
+        log = [f"    📝 Generating AI summaries for {len(items)} subjects in one request: {', '.join(item['name'] for item in items)}..."]
+        try:
+            ai_res_text = self.model_manager.generate_json(prompt=self._batch_prompt(items),
+                                                           validate=self._batch_validator(items, target_category))
+        except Exception as e:
+            ai_res_text = e
+        rows, retry = self._split_batch_response(items, ai_res_text, target_category, log)
+
+        # 💡 묶음 응답에서 빠지거나 깨진 주제만 기존 방식(주제별 요청)으로 다시 요약
+        return self._merge_retries(rows, retry, [self._summarize_subject(item, target_category) for item in retry], log)
 
-        self.naver_headers = {
-            "X-Naver-Client-Id": self.naver_id,
-            "X-Naver-Client-Secret": self.naver_secret
-        }
+    def _batch_validator(self, items, target_category):
+        # 모든 주제의 기사가 들어 있는 묶음 응답만 LLM 캐시에 남깁니다. (일부만 온 응답은 다시 요청해야 하므로)
+        return lambda ai_res_text: not self._split_batch_response(items, ai_res_text, target_category, [])[1]
+
+    def _split_batch_response(self, items, ai_res_text, target_category, log):
+        """묶음 응답을 main_subject로 주제에 맞춰 행으로 바꿉니다. ([행 리스트], [다시 요약할 주제 리스트])
+        ai_res_text 자리에 예외가 오면 호출 실패로 보고 모든 주제를 다시 요약합니다."""
+        articles = {}
+        try:
+            if isinstance(ai_res_text, Exception):
+                raise ai_res_text
+            data = json.loads(ai_res_text) if ai_res_text else None
+            if isinstance(data, dict):
+                data = data.get("articles") if "articles" in data else next(iter(data.values()), None)
+            if isinstance(data, list):
+                articles = {str(a.get("main_subject", "")).strip(): a for a in data if isinstance(a, dict)}
+            else:
+                log.append("      ⚠️ Malformed batch response. Falling back to per-subject requests.")
+        except Exception as e:
+            log.append(f"      ⚠️ Batch Generation Error ({e}). Falling back to per-subject requests.")
+
+        rows, retry = [], []
+        for item in items:
+            article = articles.get(item["name"])
+            row, line = self._build_row(item, article, target_category) if article else (None, None)
+            if row:
+                log.append(line)
+                rows.append(row)
+            else:
+                retry.append(item)
+        return rows, retry
+
+    def _merge_retries(self, rows, retry, retried, log):
+        for row, item_log in retried:
+            log.extend(item_log)
+            if row:
+                rows.append(row)
+        count("llm.summary_batches")
+        count("llm.summary_batch_fallbacks", len(retry))
+        return rows, log
+
+    def _validate_subjects(self, candidates):
+        """로컬 후보 목록을 LLM에 보내 고유명사만 남기고 별칭을 병합합니다. 결과는 별칭 사전에 학습됩니다. 실패 시 None.
+        후보가 프롬프트 예산을 넘으면 여러 번 나눠 검증(map)하고 이름 기준으로 합칩니다(reduce)."""
+        chunks = generate_chunked(self.model_manager, candidates, self._subject_prompt, validate=self._accepts_subject_validation)
+        responses = [ai_res_text for _, ai_res_text in chunks]
+        return self._merge_subject_validations(responses)
+
+    def _subject_prompt(self, batch):
+        return f"""
+        These candidate MAIN SUBJECTS were counted locally from Korean entertainment news titles ("mentions" = number of titles).
+        A "Main Subject" can be:
+        1. A celebrity name (Actor, Singer, Idol, Director).
+        2. A content title (Movie, K-Drama, TV Variety Show, Song title).
+
+        CRITICAL RULES:
+        1. Keep ONLY proper nouns (specific people or specific titles). Put generic words like "컴백", "방송", "결혼" into "rejected".
+        2. Merge Aliases: If candidates are the same subject under different names (e.g., "BTS" and "방탄소년단"), return ONE entry named with the most common KOREAN official name and list the other names in "aliases".
+        3. Do NOT invent subjects that are not in the list. Do NOT compute scores.
+
+        Return a valid JSON object.
+        Format: {{"subjects": [{{"name": "Official Korean Subject Name", "aliases": ["Other name"]}}], "rejected": ["generic word"]}}
+
+        Candidates:
+        {json.dumps(batch, ensure_ascii=False)}
+        """
+
+    def _merge_subject_validations(self, responses):
+        merged, answered = {}, False
+        for ai_res_text in responses:
+            subjects = self._parse_subject_validation(ai_res_text)
+            if subjects is None:
+                continue
+            answered = True
+            for subject in subjects:
+                entry = merged.setdefault(subject["name"], {"name": subject["name"], "aliases": []})
+                entry["aliases"] = sorted(set(entry["aliases"]) | set(subject["aliases"]))
+        return list(merged.values()) if answered else None
+
+    def _parse_subject_validation(self, ai_res_text):
+        """검증 응답 1개를 파싱해 별칭 사전에 학습시키고 [{"name", "aliases"}]를 돌려줍니다. 실패 시 None."""
+        parsed = self._read_subject_validation(ai_res_text)
+        if parsed is None:
+            return None
+        subjects, rejected = parsed
+        for subject in subjects:
+            self.subject_engine.learn(subject["name"], subject["aliases"])
+        for term in rejected:
+            self.subject_engine.reject(term)
+        return subjects
+
+    def _accepts_subject_validation(self, batch, ai_res_text):
+        # 주제도 제외 단어도 하나 없는 응답은 LLM 캐시에 남기지 않습니다.
+        parsed = self._read_subject_validation(ai_res_text)
+        return parsed is not None and any(parsed)
+
+    def _read_subject_validation(self, ai_res_text):
+        """검증 응답 1개 → ([{"name", "aliases"}], [제외 단어]). 파싱 실패 시 None."""
+        if not ai_res_text:
+            return None
+        try:
+            data = json.loads(ai_res_text, strict=False)
+        except Exception as e:
+            print(f"    ❌ Subject Validation Error: {e}")
+            return None
+
+        # 💡 [핵심 안전장치] {"subjects": [...]} 외의 껍데기로 와도 안쪽 리스트를 꺼냅니다.
+        rejected = []
+        if isinstance(data, dict):
+            rejected = data.get("rejected") or []
+            data = data.get("subjects") if "subjects" in data else next(iter(data.values()), [])
+        if isinstance(data, dict):
+            data = [data]
+
+        subjects = []
+        for item in data if isinstance(data, list) else []:
+            if isinstance(item, dict) and isinstance(item.get("name"), str) and item["name"].strip():
+                aliases = [a for a in item.get("aliases") or [] if isinstance(a, str)]
+                subjects.append({"name": item["name"].strip(), "aliases": aliases})
+        rejected = [term.strip() for term in rejected if isinstance(term, str) and term.strip()]
+        return subjects, rejected
 
     def run_pipeline(self, target_category):
+        """카테고리 1개의 뉴스 파이프라인을 실행하고, 저장한 기사 수를 돌려줍니다.
+        scan → rank는 순서대로, deep-dive → image → summarize → persist는 주제 단위로 흘러가며 겹쳐서 실행됩니다."""
+        timeline = StageTimeline("news", category=target_category)
+        try:
+            return self._run_pipeline_steps(target_category, timeline)
+        finally:
+            timeline.close()
+
+    def _run_pipeline_steps(self, target_category, timeline):
+        clock = self._pipeline_clock(target_category)
+        if not clock:
+            return 0
+        kst, now_kst, time_limit = clock
+
+        timeline.enter("step2_scan")
+        title_list = self.scan_stage(target_category, now_kst, time_limit)
+        if not title_list:
+            return 0
+
+        timeline.enter("step3_4_rank")
+        top_20_data = self.rank_stage(title_list)
+        if not top_20_data:
+            return 0
+
+        timeline.enter("step5_9_stream")
+        saved_rows = self.stream_stage(top_20_data, target_category, kst, time_limit)
+        return self._final_report(saved_rows)
+
+    def _pipeline_clock(self, target_category):
+        """실행 시작 로그를 남기고 (KST 시간대, 현재 시각, 24시간 기준 시각)을 돌려줍니다. 네이버 키가 없으면 None."""
         print(f"\n🚀 [AI Newsroom] Starting Ultra-Fast Snippet Pipeline (Base Scan: {target_category})")
         
         kst = pytz.timezone('Asia/Seoul')
@@ -41,328 +423,324 @@ class NaverNewsAPI:
 
         if not self.naver_id or not self.naver_secret:
             print("  ❌ Error: NAVER API keys missing.")
-            return
+            return None
+        return kst, now_kst, time_limit
 
+    def _final_report(self, saved_rows):
         # =========================================================
-        # Step 1. 🕒 현재 시간 출력 및 🧹 DB 청소
+        # Step 7. 📊 저장된 키워드 최종 정리 (점수 순)
         # =========================================================
-        # 🧹 Step 1: Cleaning up old archive data (7 days)
-        print(f"  🧹 Step 1: Cleaning up old archive data (7 days)...")
-        try:
-            # 💡 [핵심 방어벽 1] K-Culture는 ChartAPI가 관리하므로 제외하고, 속보성 뉴스 4개만 7일 룰을 적용합니다.
-            target_categories = ['k-pop', 'k-movie', 'k-drama', 'k-entertain']
-            
-            seven_days_ago = quote((datetime.now(kst) - timedelta(days=7)).isoformat())
-            
-            # API 호출용 환경변수 세팅
-            supabase_url = os.environ.get("SUPABASE_URL")
-            supabase_key = os.environ.get("SUPABASE_KEY")
-            supa_headers = {
-                "apikey": supabase_key,
-                "Authorization": f"Bearer {supabase_key}",
-                "Content-Type": "application/json"
-            }
-            
-            del_url = f"{supabase_url}/rest/v1/live_news?category=in.({','.join(target_categories)})&created_at=lt.{seven_days_ago}"
-            del_res = requests.delete(del_url, headers=supa_headers)
-            
-            if del_res.status_code >= 400:
-                print(f"    ❌ DB Delete Error: {del_res.text}")
-            else:
-                print("    ✅ 7일 지난 속보성 아카이브 데이터 정리 완료 (K-Culture 제외).")
-        except Exception as e:
-            print(f"    ⚠️ Cleanup Error: {e}")
+        print(f"\n  🎯 Final Saved Targets: {len(saved_rows)} items")
+        for row in sorted(saved_rows, key=lambda x: x["score"], reverse=True):
+            print(f"    - {row['keyword']} [{row['category']}] (Score: {row['score']})")
 
-        # =========================================================
-        # Step 2. 📡 다중 키워드 광역 스캔
-        # =========================================================
+        self.image_validator.save()
+        print(f"🎉 [AI Newsroom] Ultimate Pipeline successfully completed!")
+        return len(saved_rows)
+
+    # =========================================================
+    # Step 2. 📡 다중 키워드 광역 스캔 → 최근 24시간 제목 목록
+    # =========================================================
+    def scan_stage(self, target_category, now_kst, time_limit):
         print(f"  📡 Step 2: Multi-Query Broad Scan for '{target_category}'...")
-        multi_queries_map = {
-            'k-pop': ['보이그룹', '걸그룹', '아이돌', '솔로가수', '신인그룹'],
-            'k-movie': ['영화', '배우', '영화감독'],
-            'k-drama': ['드라마', '안방극장'],
-            'k-entertain': ['예능']
-        }
-        queries_to_run = multi_queries_map.get(target_category, ['연예계'])
         unique_titles = set()
 
-        for q in queries_to_run:
-            search_url = f"https://openapi.naver.com/v1/search/news.json?query={quote(q)}&display=100&sort=date"
+        # 💡 지난 실행 이후 새로 나온 기사만 받아오고, 저장해둔 24시간 제목 창과 합칩니다.
+        for q in _scan_queries(target_category):
             try:
-                res = requests.get(search_url, headers=self.naver_headers, timeout=5)
-                raw_news = res.json().get('items', [])
-                for n in raw_news:
-                    pub_date = parsedate_to_datetime(n['pubDate']).astimezone(kst)
-                    if pub_date >= time_limit:
-                        clean_title = re.sub(r'<[^>]+>', '', html.unescape(n['title']))
-                        unique_titles.add(clean_title)
-            except:
+                unique_titles.update(_log_scan(q, self.broad_scanner.scan(q, now_kst, time_limit)))
+            except Exception as e:
+                print(f"    ⚠️ Broad scan failed for '{q}': {e}")
                 continue
-        
-        title_list = list(unique_titles)
+        return self._finish_scan(unique_titles)
+
+    def _finish_scan(self, unique_titles):
+        self.broad_scanner.save()
+
+        # 재현 가능한 프롬프트(LLM 캐시/기록 재생)를 위해 정렬된 순서로 고정하고, 글자만 조금 다른 재송고 제목은 하나로 합칩니다.
+        title_list = dedupe_titles(sorted(unique_titles))
         if not title_list:
             print("    ⏭️ No titles collected. Skipping.")
-            return
-        print(f"    ✅ Collected {len(title_list)} unique article titles in the last 24h.")
-
-        # =========================================================
-        # Step 3 & 4. 📊 기사 제목 빈도수 추출 및 타겟 선정 (인물, 작품, 방송 포함)
-        # =========================================================
+            return []
+        print(f"    ✅ Collected {len(title_list)} unique article titles in the last 24h ({len(unique_titles) - len(title_list)} near-duplicates merged).")
+        return title_list
+
+    # =========================================================
+    # Step 3 & 4. 📊 기사 제목 빈도수 추출 및 타겟 선정 (인물, 작품, 방송 포함)
+    # =========================================================
+    def rank_stage(self, title_list):
+        candidates, subjects = self._count_candidates(title_list)
+        if not candidates:
+            return []
+        if subjects is None:
+            subjects = self._validate_subjects(candidates)
+        return self._finish_rank(title_list, candidates, subjects)
+
+    def _count_candidates(self, title_list):
+        """로컬 빈도로 후보를 세고 (후보 목록, 확정 주제 목록)을 돌려줍니다. 확정 주제가 None이면 LLM 검증이 필요합니다."""
         print(f"  📊 Step 3 & 4: Extracting Major Subjects (People, Movies, Dramas, Shows)...")
-        prompt_frequency = f"""
-        Analyze the following Korean news article titles.
-        Extract the most prominent MAIN SUBJECTS mentioned in these titles. 
-        A "Main Subject" can be:
-        1. A celebrity name (Actor, Singer, Idol, Director).
-        2. A content title (Movie, K-Drama, TV Variety Show, Song title).
-
-        CRITICAL RULES:
-        1. Base Score: Score MUST be calculated as (total number of mentions in titles) + 10. For example, if a subject is mentioned 5 times, the score is 15.
-        2. Merge Aliases: If a subject is mentioned by different names (e.g., "BTS" and "방탄소년단"), merge their scores under the most common KOREAN official name.
-        3. Do NOT extract generic words like "컴백", "방송", "결혼". Extract ONLY proper nouns (Specific people or specific titles).
-        
-        Return a valid JSON array of the top 20 most frequently mentioned subjects, sorted by score (highest first).
-        Format: [{{"name": "Official Korean Subject Name", "score": 19}}, ...]
-        
-        Titles to analyze:
-        {json.dumps(title_list, ensure_ascii=False)}
-        """
-        
-        try:
-            ai_res_text = self.model_manager.generate_json(prompt=prompt_frequency)
-            
-            if not ai_res_text:
-                print("    ❌ AI API returned None.")
-                return
-                
-            # JSON 파싱 (strict=False를 넣어 특수문자 에러도 함께 방지합니다)
-            top_20_data = json.loads(ai_res_text, strict=False)
-
-            # 💡 [핵심 안전장치] AI가 딕셔너리 {"data": [...]} 형태로 응답한 경우, 껍데기를 벗기고 안쪽 리스트를 강제로 꺼냅니다.
-            if isinstance(top_20_data, dict):
-                top_20_data = next(iter(top_20_data.values())) if top_20_data else []
-                if isinstance(top_20_data, dict): # 혹시나 또 딕셔너리면 리스트로 한 번 감싸줌
-                    top_20_data = [top_20_data]
-
-            for item in top_20_data:
-                # 💡 안전하게 딕셔너리인지 확인 후 처리
-                if isinstance(item, dict):
-                    item['score'] = int(item.get('score', 0))
-                    print(f"  - {item.get('name', 'Unknown')}: {item['score']}점 (노출 횟수)")
-                    
-        except Exception as e:
-            print(f"    ❌ Frequency Analysis Error: {e}")
-            return
-
-        # =========================================================
-        # Step 5 & 6. 🔍 고속 요약본 풀링 & 100% 팩트 필터링 & 🚫 이미지 중복 방지
-        # =========================================================
-        print(f"  🔍 Step 5 & 6: High-Speed Snippet Pooling & Strict Image Deduplication...")
-        final_results = []
-        used_image_urls = set()
-
+        candidates = self.subject_engine.extract_candidates(title_list)
+        if not candidates:
+            print("    ⏭️ No repeated subjects found in titles. Skipping.")
+            return [], None
+
+        confidence = self.subject_engine.confidence(candidates)
+        print(f"    🧮 Counted {len(candidates)} candidate subjects locally (known: {confidence:.0%})")
+
+        if confidence >= SKIP_LLM_RATIO:
+            # 상위 후보가 거의 다 이미 검증된 주제라면 LLM 호출 없이 바로 확정
+            print("    ⚡ High confidence. Skipping LLM validation.")
+            return candidates, [c for c in candidates if self.subject_engine.is_known(c["name"])]
+        return candidates, None
+
+    def _finish_rank(self, title_list, candidates, subjects):
+        if subjects is None:
+            # LLM이 모두 실패하면 별칭 사전에서 이미 검증된 후보만으로 계속 진행합니다. ('컴백', '결혼' 같은 일반 단어가 주제로 저장되지 않도록)
+            subjects = [c for c in candidates if self.subject_engine.is_known(c["name"])]
+            if not subjects:
+                print("    ⚠️ LLM validation failed and no candidate is a known subject. Skipping.")
+                return []
+            print(f"    ⚠️ LLM validation failed. Falling back to {len(subjects)} known subjects.")
+
+        top_20_data = self.subject_engine.rank(title_list, subjects)
+        self.subject_engine.save()
         for item in top_20_data:
-            name = item.get("name")
-            score = item.get("score")
-            if not name or score <= 0: continue
-
-            print(f"\n    🔎 Deep Dive: {name} (Score: {score})")
-            
-            fetch_count = max(1, min(score, 100))
-            p_url = f"https://openapi.naver.com/v1/search/news.json?query={quote(name)}&display={fetch_count}&sort=sim"
-            
-            try:
-                p_res = requests.get(p_url, headers=self.naver_headers, timeout=10)
-                raw_articles = p_res.json().get('items', [])
-            except Exception as e:
-                print(f"      ⏭️ API Error. Skipping. ({e})")
-                continue
+            print(f"  - {item['name']}: {item['score']}점 (노출 횟수)")
+        return top_20_data
+
+    # =========================================================
+    # Step 5 ~ 9. 🔍 Deep Dive → 🖼️ 이미지 → 🤖 요약 → 💾 저장 (주제 단위 스트리밍)
+    # =========================================================
+    def stream_stage(self, top_20_data, target_category, kst, time_limit):
+        """주제마다 스니펫과 이미지가 준비되는 대로 바로 요약하고, 요약이 끝난 기사는 작은 묶음으로 바로 저장합니다.
+        저장된 행 목록을 돌려줍니다."""
+        targets = _rank_targets(top_20_data)
+        print(f"  🔍 Step 5~9: Streaming {len(targets)} subjects (deep dive {self.max_workers} / image {self.max_workers} / summary {self.summary_workers} workers, up to {self.summary_batch_size} per request)...")
+        used_image_urls = set()
+        dropped = set()   # 도중에 탈락한 주제의 순위 (요약 묶음을 순위대로 채울 때 건너뜀)
 
-            valid_articles = [art for art in raw_articles if parsedate_to_datetime(art['pubDate']).astimezone(kst) >= time_limit]
+        def deep_dive(item):
+            with span("news.deep_dive.subject", category=target_category, subject=item.get("name")):
+                result, log = self._deep_dive_subject(item, kst, time_limit)
+            if result:
+                result["rank"] = item["rank"]
+            else:
+                dropped.add(item["rank"])
+            return result, log
 
-            if not valid_articles:
-                print(f"      ⏭️ No recent valid articles (within 24h) found. Skipping.")
-                continue
+        def attach_image(item):
+            if item is None:
+                return None, []   # 앞 단계에서 탈락한 주제 (탈락 소식만 순위 묶음까지 전달)
+            with span("news.image.subject", category=target_category, subject=item["name"]):
+                result, log = self._attach_image(item)
+            if not result:
+                dropped.add(item["rank"])
+            return result, log
+
+        def pick_image(item):
+            # 순위 순서로 1개씩만 불리므로 Lock 없이 used_image_urls를 씁니다.
+            result, log = self._pick_image(item, used_image_urls)
+            _print_log(log)
+            return result
+
+        def summarize(batch):
+            with span("news.summarize.batch", category=target_category, size=len(batch)):
+                return self._summarize_batch(batch, target_category)
+
+        # 💡 각 단계는 앞 단계에서 끝난 주제부터 바로 받아서 처리합니다. (로그는 주제 단위로 모아서 출력)
+        # 탈락(None)도 흘려보내야 뒤 순위가 앞 순위의 탈락을 바로 알고 버퍼에서 풀려납니다.
+        pooled = _emit(stream_map(deep_dive, targets, self.max_workers), keep_drops=True)
+        imaged = _emit(stream_map(attach_image, pooled, self.max_workers), keep_drops=True)
+        # 이미지 선점과 요약 묶음은 도착 순서가 아니라 점수 순위대로 정해서, 같은 입력이면 항상 같은 결과/프롬프트가 되도록 합니다.
+        batches = _batch_in_rank_order(imaged, dropped, self._fits_summary_batch, pick_image)
+        summarized = _emit(stream_map(summarize, batches, self.summary_workers))
+
+        writer = LiveNewsWriter(self.db)
+        for rows in summarized:
+            for row in rows:
+                writer.add(row)
+        return writer.close()
+
+
+def _scan_queries(target_category):
+    multi_queries_map = {
+        'k-pop': ['보이그룹', '걸그룹', '아이돌', '솔로가수', '신인그룹'],
+        'k-movie': ['영화', '배우', '영화감독'],
+        'k-drama': ['드라마', '안방극장'],
+        'k-entertain': ['예능']
+    }
+    return multi_queries_map.get(target_category, ['연예계'])
+
+
+def _log_scan(query, scan_result):
+    titles, fresh_count, pages = scan_result
+    print(f"    📥 '{query}': {fresh_count} new articles ({pages} page(s)), {len(titles)} titles in 24h window")
+    return titles
+
+
+def _rank_targets(top_20_data):
+    """점수가 있는 주제만 남기고 순위(rank)를 붙입니다. 요약 묶음은 이 순위대로 채워집니다."""
+    targets = [item for item in top_20_data if isinstance(item, dict) and item.get("name") and item.get("score", 0) > 0]
+    # 💡 네이버 일일 한도가 빠듯하면 점수 낮은 주제부터 뺍니다. (주제당 뉴스/이미지 검색 2회)
+    limit = get_naver_quota().subject_limit(len(targets))
+    if limit < len(targets):
+        print(f"    📉 [NaverQuota] Tight budget: deep diving top {limit} of {len(targets)} subjects.")
+    return [dict(item, rank=rank) for rank, item in enumerate(targets[:limit])]
+
+
+def _deep_dive_display(score):
+    # 점수(노출 횟수)에 비례해서 관련 기사를 받습니다 (최대 100개, 한도가 빠듯하면 더 적게)
+    return get_naver_quota().display(max(1, min(score, 100)))
+
+
+def _recent_articles(raw_articles, kst, time_limit):
+    return [art for art in raw_articles if parsedate_to_datetime(art['pubDate']).astimezone(kst) >= time_limit]
+
+
+def _image_links(img_items):
+    return [img_item.get('link', '') for img_item in img_items]
+
+
+def _image_candidates(candidates, used_image_urls):
+    return [url for url in candidates if url not in used_image_urls]
+
+
+def _image_result(item, best_img_url, log):
+    if not best_img_url:
+        log.append(f"      ⏭️ No unique/valid image found. Skipping.")
+        return None, log
+    log.append(f"      ✅ Validated! (Unique Image: OK)")
+    return dict(item, image=best_img_url), log
+
+
+def _snippet_text(snippet):
+    # 근접 중복 비교는 라벨을 뺀 본문끼리
+    return snippet.replace("[Title]:", "").replace("[Summary]:", "")
+
+
+class RankOrderBatcher:
+    """도착 순서와 상관없이 주제를 순위 순서대로 풀어 fits(묶음)을 만족하는 가장 큰 묶음으로 만듭니다.
+    아직 안 끝난 앞 순위가 있으면 기다리고, 탈락한 순위(dropped)는 건너뜁니다."""
+
+    def __init__(self, dropped, fits):
+        self.dropped = dropped
+        self.fits = fits
+        self.buffer = {}
+        self.batch = []
+        self.next_rank = 0
+
+    def release(self, item):
+        """주제 1개를 넣고(None이면 탈락 소식만 반영), 앞 순위가 모두 정해져서 풀려난 주제들을 순위대로 돌려줍니다."""
+        if item is not None:
+            self.buffer[item["rank"]] = item
+        ready = []
+        while True:
+            if self.next_rank in self.buffer:
+                ready.append(self.buffer.pop(self.next_rank))
+            elif self.next_rank not in self.dropped:
+                return ready
+            self.next_rank += 1
+
+    def release_rest(self):
+        """위쪽 단계가 끝났으면 남은 주제를 순위대로 모두 돌려줍니다."""
+        return [self.buffer.pop(rank) for rank in sorted(self.buffer)]
+
+    def add(self, item):
+        """풀려난 주제 1개를 묶음에 넣고, 가득 찬 묶음 리스트를 돌려줍니다."""
+        if self.batch and not self.fits(self.batch + [item]):
+            full, self.batch = self.batch, [item]
+            return [full]
+        self.batch.append(item)
+        return []
 
-            snippets_pool = []
-            main_link = ""
+    def flush(self):
+        """마지막 남은 묶음 (없으면 빈 리스트)."""
+        full, self.batch = ([self.batch] if self.batch else []), []
+        return full
 
-            for art in valid_articles:
-                clean_title = re.sub(r'<[^>]+>', '', html.unescape(art['title']))
-                clean_desc = re.sub(r'<[^>]+>', '', html.unescape(art['description']))
-                
-                if name.lower() in clean_title.lower() or name.lower() in clean_desc.lower():
-                    snippets_pool.append(f"[Title]: {clean_title}\n[Summary]: {clean_desc}")
-                    if not main_link: 
-                        main_link = art['link']
 
-            if len(snippets_pool) < 2:
-                print(f"      ⏭️ Not enough relevant snippets specifically about '{name}'. Dropping.")
-                continue
+def _batch_in_rank_order(items, dropped, fits, pick=None):
+    """스트림으로 들어오는 주제를 RankOrderBatcher로 순위대로 묶어서 내보냅니다.
+    pick이 있으면 풀려난 주제마다 순위 순서대로 불러서 결과로 바꾸고, None이면 그 주제를 뺍니다."""
+    batcher = RankOrderBatcher(dropped, fits)
 
-            final_combined_content = "\n\n".join(snippets_pool[:20])
-            
-            best_img_url = ""
-            img_search_url = f"https://openapi.naver.com/v1/search/image?query={quote(name)}&display=10&sort=sim"
-            try:
-                img_res = requests.get(img_search_url, headers=self.naver_headers, timeout=5)
-                if img_res.status_code == 200:
-                    img_items = img_res.json().get('items', [])
-                    for img_item in img_items:
-                        candidate_url = img_item.get('link', '')
-                        
-                        if candidate_url in used_image_urls:
-                            continue
-                            
-                        try:
-                            check = requests.head(candidate_url, timeout=2, verify=False)
-                            if check.status_code == 200 and check.headers.get('Content-Type', '').startswith('image/'):
-                                best_img_url = candidate_url
-                                used_image_urls.add(candidate_url)
-                                break 
-                        except:
-                            continue
-            except Exception as e:
-                pass
+    def settle(ready):
+        for item in ready:
+            if pick:
+                item = pick(item)
+            if item:
+                yield from batcher.add(item)
 
-            if not best_img_url:
-                print(f"      ⏭️ No unique/valid image found. Skipping.")
-                continue
+    for item in items:
+        yield from settle(batcher.release(item))
+    yield from settle(batcher.release_rest())
+    yield from batcher.flush()
 
-            print(f"      ✅ Validated! (Fetched {len(raw_articles)} based on score, Used {len(snippets_pool)} pure snippets, Unique Image: OK)")
-            final_results.append({
-                "name": name,
-                "score": score,
-                "content": final_combined_content,
-                "image": best_img_url,
-                "link": main_link
-            })
 
-        # =========================================================
-        # Step 7. 📊 살아남은 키워드 최종 정렬
-        # =========================================================
-        final_results = sorted(final_results, key=lambda x: x["score"], reverse=True)
+def _emit(outcomes, keep_drops=False):
+    """(결과, 로그 라인) 스트림에서 로그를 출력하고, 살아남은 결과만 다음 단계로 넘깁니다.
+    keep_drops면 탈락한 주제도 None으로 넘깁니다. (RankOrderBatcher가 그 순위를 건너뛰도록)"""
+    for result, log_lines in outcomes:
+        _print_log(log_lines)
+        if result or keep_drops:
+            yield result
 
-        print(f"\n  🎯 Final Extracted Valid Targets: {len(final_results)} items")
-        for res in final_results:
-            print(f"    - {res['name']} (Score: {res['score']})")
 
-        # =========================================================
-        # Step 8. 🤖 AI 정밀 영문 요약 및 동적 카테고리 분류
-        # =========================================================
-        print(f"\n  🤖 Step 8: AI Summary & Categorization for {len(final_results)} targets...")
-        ai_summarized_results = []
-
-        for item in final_results:
-            name = item["name"]
-            score = item["score"] 
-            content_pool = item["content"]
-            best_img_url = item["image"]
-            main_link = item["link"]
-
-            print(f"    📝 Generating AI summary & Category for: {name}...")
-
-            write_prompt = f"""
-            You are a rigorous and objective K-entertainment news reporter.
-            I have gathered multiple verified news snippets specifically about '{name}'.
-
-            Article Writing Rules:
-            1. Title Format: MUST use the exact format: `[{name}] Catchy English Title`
-            2. Summary: Synthesize the provided news snippets into a single, cohesive English news summary (3-10 lines). Focus strictly on the facts presented about '{name}'.
-            3. ✅ Bullet Points: Use bullet points (-) for the 2-3 most important facts.
-            4. ✅ AEO Optimization: Add a final section strictly titled "Q: Why is this trending?" with a clear 1-sentence answer starting with "A: ".
-            5. Data Preservation: Retain all numbers (dates, rankings, amounts) and proper nouns exactly as they appear.
-            6. ✅ Categorization: Analyze the actual content and assign the most accurate category. You MUST choose EXACTLY ONE from this list: ["k-pop", "k-movie", "k-drama", "k-entertain"]. Do not invent new categories.
-
-            Verified News Snippets to analyze:
-            {content_pool}
-
-            Output valid JSON ONLY:
-            {{
-                "main_subject": "{name}",
-                "category": "<choose one from: k-pop, k-movie, k-drama, k-entertain>",
-                "title": "[{name}] ...",
-                "summary": "...\n\n- Key Point 1...\n- Key Point 2...\n\nQ: Why is this trending?\nA: ..."
-            }}
-            """
-            
-            try:
-                ai_res_text = self.model_manager.generate_json(prompt=write_prompt)
-                
-                if not ai_res_text:
-                    print(f"      ⏭️ [DISCARDED] AI API failed to return JSON.")
-                    continue
-                    
-                data = json.loads(ai_res_text)
-                
-                actual_subject = data.get("main_subject", name).strip()
-                title = data.get("title", "").strip()
-                summary = data.get("summary", "").strip()
-                ai_category = data.get("category", target_category).strip().lower()
-                
-                valid_categories = ['k-pop', 'k-movie', 'k-drama', 'k-entertain']
-                if ai_category not in valid_categories:
-                    ai_category = target_category
-
-                if not title or not summary:
-                    print(f"      ⏭️ [DISCARDED] AI failed to generate content.")
-                    continue
-                
-                final_score = score + 10
-
-                ai_summarized_results.append({
-                    "category": ai_category,
-                    "keyword": actual_subject,
-                    "title": title,
-                    "summary": summary,
-                    "link": main_link,
-                    "image_url": best_img_url,
-                    "score": final_score, 
-                    "likes": 0
-                })
-                print(f"      ✅ Generated: {title} (Categorized as: [{ai_category}])")
-                
-            except Exception as e:
-                print(f"      ❌ AI Generation Error for {name}: {e}")
+def _print_log(log_lines):
+    # 여러 단계의 스레드가 동시에 출력하므로 줄바꿈까지 한 번에 써서 줄이 섞이지 않게 합니다.
+    if log_lines:
+        print("\n".join(log_lines) + "\n", end="")
 
-        # =========================================================
-        # Step 9. 💾 DB 저장 및 UI 최적화 (AI가 정한 카테고리 기준)
-        # =========================================================
-        if ai_summarized_results: 
-            print(f"  💾 Step 9: Saving to DB and Deduplicating based on [Name] & [Category]...")
-            try:
-                for item in ai_summarized_results:
-                    self.db.client.table("live_news").delete().eq("category", item["category"]).eq("keyword", item["keyword"]).execute()
-
-                self.db.client.table("search_archive").insert(ai_summarized_results).execute()
-                self.db.client.table("live_news").insert(ai_summarized_results).execute()
-                print("    ✅ Insertion complete.")
-
-                unique_categories = set([item["category"] for item in ai_summarized_results])
-                
-                # 💡 [핵심 방어벽 2] 속보성 뉴스만 50개 유지 룰을 적용합니다 (K-Culture는 절대 건드리지 않음)
-                safe_categories = ['k-pop', 'k-movie', 'k-drama', 'k-entertain']
-                
-                for cat in unique_categories:
-                    if cat not in safe_categories:
-                        print(f"    🛡️ Skipping cleanup for [{cat}] (Managed by ChartAPI).")
-                        continue
-                        
-                    count_res = self.db.client.table("live_news").select("id", count="exact").eq("category", cat).execute()
-                    total_count = count_res.count
-
-                    if total_count and total_count > 50:
-                        excess = total_count - 50
-                        print(f"    ⚠️ Capacity exceeded for [{cat}] ({total_count}/50). Purging {excess} oldest items...")
-                        
-                        low_res = self.db.client.table("live_news").select("id").eq("category", cat).order("created_at", desc=False).limit(excess).execute()
-                        
-                        if low_res.data:
-                            drop_ids = [item['id'] for item in low_res.data]
-                            self.db.client.table("live_news").delete().in_("id", drop_ids).execute()
-                            print(f"    🧹 Purged {len(drop_ids)} old articles in [{cat}] successfully.")
 
-            except Exception as e:
-                print(f"    ❌ DB Save Error: {e}")
-
-        print(f"🎉 [AI Newsroom] Ultimate Pipeline successfully completed!")
+class LiveNewsWriter:
+    """Step 9: 요약이 끝난 기사를 FLUSH_SIZE개씩 모아 바로 저장합니다."""
+
+    FLUSH_SIZE = int(os.environ.get("NEWS_PERSIST_BATCH", "5"))
+
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+        self.saved = {}
+        self.started = time.perf_counter()
+
+    def add(self, row):
+        if self._accepts(row) and len(self.pending) >= self.FLUSH_SIZE:
+            self.flush()
+
+    def _accepts(self, row):
+        # 같은 (카테고리, 키워드)는 이번 실행에서 점수가 가장 높은 1개만 저장
+        key = (row["category"], row["keyword"])
+        if key in self.saved and self.saved[key]["score"] >= row["score"]:
+            return False
+        self.pending.append(row)
+        return True
+
+    def flush(self):
+        batch = self._take_batch()
+        if not batch:
+            return
+        with span("news.persist.flush", size=len(batch)):
+            saved_count = self.db.save_live_news_batch(batch)
+        self._record_saved(batch, saved_count)
+
+    def _take_batch(self):
+        if not self.pending:
+            return []
+        batch, self.pending = self.pending, []
+        print(f"  💾 Step 9: Saving {len(batch)} articles to DB (Deduplicating based on [Name] & [Category])...")
+        return batch
+
+    def _record_saved(self, batch, saved_count):
+        if not saved_count:
+            return
+        if not self.saved:
+            count("news.time_to_first_article_ms", round((time.perf_counter() - self.started) * 1000))
+        for row in batch:
+            key = (row["category"], row["keyword"])
+            if key not in self.saved or row["score"] > self.saved[key]["score"]:
+                self.saved[key] = row
+
+    def close(self):
+        """남은 기사를 저장하고, 저장된 행 목록을 돌려줍니다. (카테고리별 개수 제한은 실행 끝에 retention이 적용)"""
+        self.flush()
+        return list(self.saved.values())
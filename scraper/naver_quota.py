@@ -0,0 +1,119 @@
+import os
+import math
+import threading
+from datetime import datetime
+
+import pytz
+
+from local_cache import JsonFileCache
+
+# 💡 네이버 검색 API 일일 호출 한도 (앱 1개 기준 25,000회, 한국 시간 자정에 초기화)
+DAILY_QUOTA = int(os.environ.get("NAVER_DAILY_QUOTA", "25000"))
+# 하루 실행 횟수 (뉴스 4시간마다 6번 + 차트 12시간마다 2번). 남은 한도를 남은 실행 수로 나눠 이번 실행 예산을 정합니다.
+RUNS_PER_DAY = int(os.environ.get("NAVER_RUNS_PER_DAY", "8"))
+# 수동 실행/재시도용으로 남겨둘 비율
+QUOTA_RESERVE = float(os.environ.get("NAVER_QUOTA_RESERVE", "0.1"))
+# 예산이 아무리 빠듯해도 이 비율 밑으로는 줄이지 않습니다.
+MIN_SCALE = float(os.environ.get("NAVER_QUOTA_MIN_SCALE", "0.25"))
+
+KST = pytz.timezone('Asia/Seoul')
+
+
+class NaverQuota:
+    """네이버 검색 API 일일 호출 수를 엔드포인트별로 세고(실행 간 유지), 실행 예산에 맞춰 요청 크기를 줄여주는 관리자.
+    한도는 호출 횟수 기준이므로 가장 큰 절약은 Deep Dive 주제 수(주제당 뉴스+이미지 2회)에서 나옵니다."""
+
+    def __init__(self, store=None):
+        self.store = store or JsonFileCache("naver_quota.json", 2 * 24 * 3600)
+        self._lock = threading.Lock()
+        self.run_calls = {}
+        self.budget = None
+        self.scale = 1.0
+
+    def _today(self):
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    def used_today(self):
+        return sum((self.store.get(f"day:{self._today()}") or {}).values())
+
+    def remaining(self):
+        return max(0, DAILY_QUOTA - self.used_today())
+
+    def record(self, endpoint):
+        """실제로 API를 호출할 때마다 1번 부릅니다. (캐시 적중은 한도를 쓰지 않으므로 세지 않음)"""
+        key = f"day:{self._today()}"
+        with self._lock:
+            daily = dict(self.store.get(key) or {})
+            daily[endpoint] = daily.get(endpoint, 0) + 1
+            self.store.set(key, daily)
+            self.run_calls[endpoint] = self.run_calls.get(endpoint, 0) + 1
+
+    def plan(self, job):
+        """이번 실행 예산(호출 수)과 축소 비율을 정합니다. 실행 시작 때 1번 부릅니다."""
+        now = datetime.now(KST)
+        day_left = 1 - (now.hour * 3600 + now.minute * 60 + now.second) / 86400
+        runs_left = max(1, math.ceil(RUNS_PER_DAY * day_left))
+        usable = max(0, self.remaining() - DAILY_QUOTA * QUOTA_RESERVE)
+        fair_share = DAILY_QUOTA * (1 - QUOTA_RESERVE) / RUNS_PER_DAY
+
+        with self._lock:
+            self.run_calls = {}
+            self.budget = int(usable / runs_left)
+            # 앞선 실행들이 몫보다 많이 썼으면 그만큼 이번 실행의 요청 크기를 줄입니다.
+            self.scale = max(MIN_SCALE, min(1.0, self.budget / fair_share)) if fair_share else 1.0
+
+        tight = " → reducing request sizes" if self.scale < 1 else ""
+        print(f"  📊 [NaverQuota] {job}: used today {self.used_today()}/{DAILY_QUOTA}, "
+              f"run budget {self.budget} calls ({runs_left} runs left, scale {self.scale:.2f}){tight}")
+        return self.budget
+
+    def _current_scale(self):
+        # 실행 도중 예산을 넘기면 남은 요청은 가장 작게 보냅니다.
+        if self.budget is not None and sum(self.run_calls.values()) >= self.budget:
+            return MIN_SCALE
+        return self.scale
+
+    def display(self, wanted, minimum=1):
+        """검색 결과 개수(display)를 예산에 맞춰 줄입니다."""
+        return max(minimum, min(wanted, round(wanted * self._current_scale())))
+
+    def subject_limit(self, wanted, minimum=3):
+        """Deep Dive할 주제 수 (주제당 뉴스/이미지 검색 2회)."""
+        return max(min(minimum, wanted), round(wanted * self._current_scale()))
+
+    def image_candidates(self, wanted=10, minimum=3):
+        """이미지 검색 후보 수 (후보마다 HEAD 검사 1번)."""
+        return self.display(wanted, minimum)
+
+    def snapshot(self):
+        """실행 리포트에 남길 요약."""
+        with self._lock:
+            run_calls = dict(self.run_calls)
+        return {
+            "daily_quota": DAILY_QUOTA,
+            "used_today": self.used_today(),
+            "remaining": self.remaining(),
+            "run_budget": self.budget,
+            "run_calls": run_calls,
+            "scale": round(self.scale, 2),
+        }
+
+    def report(self):
+        self.store.save()
+        snap = self.snapshot()
+        used = sum(snap["run_calls"].values())
+        print(f"  📊 [NaverQuota] This run: {used} calls {snap['run_calls']} (budget {snap['run_budget']}), "
+              f"remaining today: {snap['remaining']}/{DAILY_QUOTA}")
+
+
+_shared_quota = None
+_shared_lock = threading.Lock()
+
+
+def get_naver_quota():
+    """네이버 검색을 쓰는 모든 파이프라인이 함께 쓰는 프로세스 단위 공용 NaverQuota."""
+    global _shared_quota
+    with _shared_lock:
+        if _shared_quota is None:
+            _shared_quota = NaverQuota()
+        return _shared_quota
@@ -0,0 +1,134 @@
+import os
+import asyncio
+import threading
+from urllib.parse import quote
+
+from http_client import get_http_client
+from async_http import get_async_http_client
+from local_cache import JsonFileCache
+from naver_quota import get_naver_quota
+from instrumentation import count
+
+SEARCH_BASE_URL = "https://openapi.naver.com/v1/search"
+
+# 💡 같은 실행 안에서는 항상 공유하고, NAVER_SEARCH_CACHE_PERSIST=1이면 짧은 TTL로 다음 실행까지 유지합니다.
+SEARCH_CACHE_TTL = int(os.environ.get("NAVER_SEARCH_CACHE_TTL", str(30 * 60)))
+SEARCH_CACHE_PERSIST = os.environ.get("NAVER_SEARCH_CACHE_PERSIST", "0") == "1"
+
+
+def _cache_key(endpoint, query, sort, start):
+    return f"{endpoint}\x1f{query}\x1f{sort}\x1f{start}"
+
+
+def _search_url(endpoint, query, display, sort, start):
+    url = f"{SEARCH_BASE_URL}/{endpoint}?query={quote(query)}&display={display}&sort={sort}"
+    if start > 1:
+        url += f"&start={start}"
+    return url
+
+
+class NaverSearchClient:
+    """네이버 검색 API(news/image) 공용 클라이언트. (endpoint, query, display, sort, start) 단위로 응답을 공유해 일일 호출 한도를 아낍니다."""
+
+    def __init__(self, client_id=None, client_secret=None, cache=None):
+        self.client_id = client_id or os.environ.get("NAVER_CLIENT_ID")
+        self.client_secret = client_secret or os.environ.get("NAVER_CLIENT_SECRET")
+        self.headers = {
+            "X-Naver-Client-Id": self.client_id,
+            "X-Naver-Client-Secret": self.client_secret
+        }
+        self.http = get_http_client()
+        self.cache = cache or JsonFileCache("naver_search.json", SEARCH_CACHE_TTL, persist=SEARCH_CACHE_PERSIST)
+        self.quota = get_naver_quota()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._async_key_locks = {}
+        self.calls = 0
+        self.saved = 0
+
+    @property
+    def enabled(self):
+        return bool(self.client_id and self.client_secret)
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _cached(self, key, display, endpoint):
+        cached = self.cache.get(key)
+        if cached and cached["display"] >= display:
+            with self._lock:
+                self.saved += 1
+            count("naver.cache_hits", endpoint=endpoint)
+            return cached["items"][:display]
+        return None
+
+    def _store(self, key, display, endpoint, res):
+        # 실패한 호출도 일일 한도에서 빠지므로 상태 확인 전에 셉니다.
+        self.quota.record(endpoint)
+        res.raise_for_status()
+        items = res.json().get("items", [])
+        with self._lock:
+            self.calls += 1
+        count("naver.calls", endpoint=endpoint)
+        self.cache.set(key, {"display": display, "items": items})
+        return items
+
+    def search(self, endpoint, query, display=10, sort="sim", start=1, timeout=10):
+        """검색 결과 items 리스트를 돌려줍니다. HTTP 오류는 예외로 올립니다.
+        같은 검색을 더 큰 display로 이미 받아두었다면 앞부분만 잘라서 재사용합니다."""
+        key = _cache_key(endpoint, query, sort, start)
+
+        # 같은 키를 여러 워커가 동시에 요청하면 한 번만 호출하고 나머지는 결과를 기다립니다.
+        with self._key_lock(key):
+            cached = self._cached(key, display, endpoint)
+            if cached is not None:
+                return cached
+            res = self.http.get(_search_url(endpoint, query, display, sort, start), headers=self.headers, timeout=timeout)
+            return self._store(key, display, endpoint, res)
+
+    async def asearch(self, endpoint, query, display=10, sort="sim", start=1, timeout=10):
+        """search()의 asyncio 버전. 응답 캐시와 호출 통계는 동기 버전과 함께 씁니다."""
+        key = _cache_key(endpoint, query, sort, start)
+        lock = self._async_key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            cached = self._cached(key, display, endpoint)
+            if cached is not None:
+                return cached
+            res = await get_async_http_client().get(_search_url(endpoint, query, display, sort, start), headers=self.headers, timeout=timeout)
+            return self._store(key, display, endpoint, res)
+
+    def news(self, query, display=10, sort="sim", start=1, timeout=10):
+        return self.search("news.json", query, display, sort, start, timeout)
+
+    def images(self, query, display=10, sort="sim", timeout=5):
+        return self.search("image", query, display, sort, timeout=timeout)
+
+    async def anews(self, query, display=10, sort="sim", start=1, timeout=10):
+        return await self.asearch("news.json", query, display, sort, start, timeout)
+
+    async def aimages(self, query, display=10, sort="sim", timeout=5):
+        return await self.asearch("image", query, display, sort, timeout=timeout)
+
+    def reset_async(self):
+        # asyncio.Lock은 만든 이벤트 루프에 묶이므로 루프가 끝나면 비웁니다.
+        self._async_key_locks = {}
+
+    def report(self):
+        self.cache.save()
+        total = self.calls + self.saved
+        if total:
+            print(f"  🔎 [NaverSearch] API calls: {self.calls}, Saved by cache: {self.saved} ({self.saved / total:.0%} of {total} lookups)")
+
+
+_shared_search = None
+_shared_lock = threading.Lock()
+
+
+def get_naver_search():
+    """뉴스/차트 파이프라인이 함께 쓰는 프로세스 단위 공용 NaverSearchClient."""
+    global _shared_search
+    with _shared_lock:
+        if _shared_search is None:
+            _shared_search = NaverSearchClient()
+        return _shared_search
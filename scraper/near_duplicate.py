@@ -0,0 +1,97 @@
+import os
+import re
+import heapq
+import zlib
+
+from token_budget import estimate_tokens
+
+# 💡 글자 3-gram(shingle) 집합의 Jaccard 유사도가 이 값 이상이면 같은 기사(통신사 재송고 등)로 봅니다.
+SNIPPET_THRESHOLD = float(os.environ.get("SNIPPET_DUP_THRESHOLD", "0.6"))
+TITLE_THRESHOLD = float(os.environ.get("TITLE_DUP_THRESHOLD", "0.8"))
+
+# 💡 Step 8 프롬프트에 넣을 스니펫 풀의 토큰 예산
+SNIPPET_TOKEN_BUDGET = int(os.environ.get("SNIPPET_TOKEN_BUDGET", "1500"))
+
+SHINGLE_SIZE = 3
+SKETCH_SIZE = 8   # 후보 탐색용 색인 키 수 (shingle 해시 중 가장 작은 8개)
+
+_NOISE_PATTERN = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """공백/기호를 없앤 소문자 텍스트의 글자 k-gram 해시 집합 (띄어쓰기만 다른 재송고도 같게 보도록)"""
+    normalized = _NOISE_PATTERN.sub("", text.casefold())
+    if len(normalized) <= k:
+        return frozenset([zlib.crc32(normalized.encode("utf-8"))]) if normalized else frozenset()
+    return frozenset(zlib.crc32(normalized[i:i + k].encode("utf-8")) for i in range(len(normalized) - k + 1))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """shingle Jaccard 기반 근접 중복 색인. 비슷한 문서는 가장 작은 shingle 해시(bottom-k)를 공유할 확률이 높다는 점을 이용해
+    전체 쌍을 비교하지 않고 후보만 검사합니다."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self._sets = []
+        self._buckets = {}
+
+    def find(self, shingle_set):
+        """이미 색인된 문서 중 근접 중복의 번호 (없으면 None)"""
+        checked = set()
+        for key in heapq.nsmallest(SKETCH_SIZE, shingle_set):
+            for index in self._buckets.get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                if jaccard(shingle_set, self._sets[index]) >= self.threshold:
+                    return index
+        return None
+
+    def add(self, shingle_set):
+        index = len(self._sets)
+        self._sets.append(shingle_set)
+        for key in heapq.nsmallest(SKETCH_SIZE, shingle_set):
+            self._buckets.setdefault(key, []).append(index)
+        return index
+
+
+def cluster(texts, threshold, key=None):
+    """근접 중복끼리 묶은 번호 목록들 (묶음 순서와 묶음 안의 순서 모두 입력 순서). key로 비교할 부분만 골라낼 수 있습니다."""
+    index = NearDuplicateIndex(threshold)
+    clusters = []
+    owner = []   # 색인 번호 → 묶음 번호
+    for i, text in enumerate(texts):
+        shingle_set = shingles(key(text) if key else text)
+        match = index.find(shingle_set)
+        if match is None:
+            owner.append(len(clusters))
+            clusters.append([i])
+        else:
+            owner.append(owner[match])
+            clusters[owner[match]].append(i)
+        index.add(shingle_set)
+    return clusters
+
+
+def dedupe_titles(titles, threshold=TITLE_THRESHOLD):
+    """근접 중복 제목은 처음 것 하나만 남깁니다."""
+    return [titles[group[0]] for group in cluster(titles, threshold)]
+
+
+def select_snippets(snippets, token_budget=SNIPPET_TOKEN_BUDGET, threshold=SNIPPET_THRESHOLD, key=None):
+    """관련도 순 스니펫에서 근접 중복 묶음마다 가장 정보가 많은(긴) 것 하나만 골라, 토큰 예산 안에서 관련도 순으로 돌려줍니다."""
+    picked, used = [], 0
+    for group in cluster(snippets, threshold, key):
+        best = max(group, key=lambda i: (estimate_tokens(snippets[i]), -i))
+        cost = estimate_tokens(snippets[best])
+        if picked and used + cost > token_budget:
+            continue
+        picked.append(snippets[best])
+        used += cost
+    return picked
@@ -0,0 +1,127 @@
+import io
+import sys
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# 💡 현재 실행 중인 카테고리의 로그 버퍼 (워커 스레드에도 contextvars로 전파됩니다)
+_log_buffer = contextvars.ContextVar("log_buffer", default=None)
+_print_lock = threading.Lock()
+
+
+class _ContextStdout:
+    """현재 컨텍스트에 카테고리 버퍼가 있으면 그쪽으로, 없으면 원래 stdout으로 출력을 보냅니다."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        buffer = _log_buffer.get()
+        if buffer is not None:
+            return buffer.write(text)
+        return self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def _run_one(job_name, category, func, isolate_logs):
+    """카테고리 1개 실행. 예외가 나도 다른 카테고리에 영향을 주지 않도록 결과 딕셔너리로 감싸서 돌려줍니다."""
+    buffer = io.StringIO() if isolate_logs else None
+    token = _log_buffer.set(buffer)
+    started = time.perf_counter()
+    status, items, error = "ok", 0, ""
+    try:
+        items = func(category) or 0
+    except Exception as e:
+        status, error = "failed", str(e)
+        print(f"❌ [{job_name}] Category '{category}' crashed: {e}")
+    finally:
+        _log_buffer.reset(token)
+    return _finish_one(category, buffer, started, status, items, error)
+
+
+async def _arun_one(job_name, category, afunc, isolate_logs):
+    """_run_one의 asyncio 버전. 태스크마다 컨텍스트가 복사되므로 카테고리 로그 버퍼도 태스크 단위로 나뉩니다."""
+    buffer = io.StringIO() if isolate_logs else None
+    token = _log_buffer.set(buffer)
+    started = time.perf_counter()
+    status, items, error = "ok", 0, ""
+    try:
+        items = await afunc(category) or 0
+    except Exception as e:
+        status, error = "failed", str(e)
+        print(f"❌ [{job_name}] Category '{category}' crashed: {e}")
+    finally:
+        _log_buffer.reset(token)
+    return _finish_one(category, buffer, started, status, items, error)
+
+
+def _finish_one(category, buffer, started, status, items, error):
+    duration = time.perf_counter() - started
+    if buffer is not None:
+        # 카테고리가 끝나면 모아둔 로그를 한 덩어리로 출력 (다른 카테고리와 섞이지 않음)
+        with _print_lock:
+            print(f"\n{'-' * 20} [{category}] log {'-' * 20}")
+            print(buffer.getvalue(), end="")
+            sys.stdout.flush()
+
+    return {"category": category, "status": status, "items": items, "duration": duration, "error": error}
+
+
+def run_categories(job_name, categories, func, parallel=1):
+    """카테고리별 파이프라인 func(category)를 최대 parallel개씩 동시에 실행하고, 실행 요약 리스트를 돌려줍니다."""
+    parallel = max(1, min(int(parallel or 1), len(categories) or 1))
+
+    if parallel == 1:
+        # 기존처럼 순차 실행 (로그는 실시간 출력)
+        return [_run_one(job_name, cat, func, isolate_logs=False) for cat in categories]
+
+    print(f"⚡ [{job_name}] Running {len(categories)} categories with {parallel} in parallel (logs are printed per category).")
+    original_stdout = sys.stdout
+    sys.stdout = _ContextStdout(original_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _run_one, job_name, cat, func, True)
+                for cat in categories
+            ]
+            return [f.result() for f in futures]
+    finally:
+        sys.stdout = original_stdout
+
+
+async def run_categories_async(job_name, categories, afunc, parallel=1):
+    """run_categories의 asyncio 버전. 코루틴 afunc(category)를 최대 parallel개씩 같은 이벤트 루프에서 실행합니다."""
+    parallel = max(1, min(int(parallel or 1), len(categories) or 1))
+    if parallel == 1:
+        return [await _arun_one(job_name, cat, afunc, isolate_logs=False) for cat in categories]
+
+    print(f"⚡ [{job_name}] Running {len(categories)} categories with {parallel} in parallel (asyncio, logs are printed per category).")
+    semaphore = asyncio.Semaphore(parallel)
+
+    async def limited(cat):
+        async with semaphore:
+            return await _arun_one(job_name, cat, afunc, True)
+
+    original_stdout = sys.stdout
+    sys.stdout = _ContextStdout(original_stdout)
+    try:
+        return list(await asyncio.gather(*(limited(cat) for cat in categories)))
+    finally:
+        sys.stdout = original_stdout
+
+
+def print_summary(job_name, summary):
+    """카테고리별 소요시간 / 저장 항목 수 요약표를 출력합니다."""
+    print(f"\n📋 [{job_name}] Run Summary")
+    print(f"  {'Category':<14} {'Status':<8} {'Items':>6} {'Time(s)':>9}")
+    for row in summary:
+        print(f"  {row['category']:<14} {row['status']:<8} {row['items']:>6} {row['duration']:>9.1f}")
+        if row["error"]:
+            print(f"    ↳ {row['error']}")
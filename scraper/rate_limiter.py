@@ -0,0 +1,71 @@
+import os
+import time
+import asyncio
+import threading
+
+from instrumentation import count
+
+# 💡 공급자별 초당 요청 수(0이면 제한 없음)와 한 번에 몰아서 보낼 수 있는 요청 수(burst)
+#    네이버 검색 API는 초당 10회, Groq는 키 1개당 분당 30회 수준이 기본 한도입니다.
+RATE_LIMITS = {
+    "naver": (float(os.environ.get("NAVER_RATE_PER_SEC", "8")), 4),
+    "groq": (float(os.environ.get("GROQ_RATE_PER_KEY", "0.5")), 2),   # 키 수를 곱해서 씁니다
+    "gemini": (float(os.environ.get("GEMINI_RATE_PER_SEC", "0.25")), 1),
+    "supabase": (float(os.environ.get("SUPABASE_RATE_PER_SEC", "0")), 10),
+}
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 스레드 안전 속도 제한기. 스레드 파이프라인은 acquire(), asyncio 파이프라인은 acquire_async()로 씁니다."""
+
+    def __init__(self, provider, rate, burst=1):
+        self.provider = provider
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """요청 1건을 보낼 자리를 예약하고, 그 자리까지 기다려야 하는 시간(초)을 돌려줍니다."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 토큰이 음수면 앞서 예약한 요청들이 있다는 뜻이므로, 그만큼 뒤 순번으로 기다립니다.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            count("ratelimit.wait_ms", round(wait * 1000, 1), provider=self.provider)
+        return wait
+
+    def acquire(self):
+        """차례가 올 때까지 스레드를 재우고, 기다린 시간(초)을 돌려줍니다."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        """asyncio 버전의 acquire (이벤트 루프를 막지 않고 기다립니다)."""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_shared_limiters = {}
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(provider, scale=1):
+    """공급자별 프로세스 단위 공용 RateLimiter. scale은 처음 만들 때만 반영됩니다. (예: Groq 키 수)"""
+    with _shared_lock:
+        limiter = _shared_limiters.get(provider)
+        if limiter is None:
+            rate, burst = RATE_LIMITS.get(provider, (0, 1))
+            limiter = RateLimiter(provider, rate * max(1, scale), burst * max(1, scale))
+            _shared_limiters[provider] = limiter
+        return limiter
@@ -0,0 +1,430 @@
+"""
+오프라인 기록/재생(record/replay) 하네스 & 단계별 벤치마크
+
+  python replay.py record news fixtures/news-run     # 실제 API로 1회 실행하며 HTTP/LLM 응답을 기록 (실제 DB에도 저장됩니다)
+  python replay.py replay fixtures/news-run          # 기록된 응답 + 인메모리 PostgREST로 네트워크 없이 재실행
+  python replay.py bench fixtures/news-run --repeat 3 --latency 1.0
+  python replay.py compare fixtures/news-run         # 스레드 / asyncio 뉴스 파이프라인을 같은 픽스처로 돌려 결과와 시간을 비교
+
+tests/test_replay_smoke.py가 tests/fixtures의 작은 픽스처(tests/record_smoke_fixtures.py로 생성)로 하네스 자체를 확인합니다.
+"""
+import os
+import io
+import sys
+import asyncio
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import threading
+import statistics
+import contextlib
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+import requests
+
+# URL에서 지우고 비교할 비밀 파라미터 (기록 파일에 API 키가 남지 않도록)
+SECRET_PARAMS = {"api_key", "key"}
+
+# 재생 시 Supabase 원시 REST 호출을 인메모리 PostgREST로 보내기 위한 가짜 주소
+REPLAY_SUPABASE_URL = "https://replay.supabase.co"
+
+# 기록 시점에 설정돼 있었는지 저장해 둘 환경변수 (재생 때 같은 분기를 타도록 더미 값으로 채움)
+REPLAY_ENV_KEYS = [
+    "NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET", "KOBIS_API_KEY", "TMDB_API_KEY",
+    "YOUTUBE_API_KEY", "GEMINI_API_KEY",
+] + [f"GROQ_API_KEY{i}" for i in range(1, 8)]
+
+# 초기 상태를 스냅샷해 둘 Supabase 테이블
+SEED_TABLES = ["live_news", "system_status"]
+
+
+def request_key(method, url):
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in SECRET_PARAMS]
+    return f"{method.upper()} {urlunparse(parsed._replace(query=urlencode(query)))}"
+
+
+def prompt_hash(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """기록 파일 묶음: meta.json / http.json / llm.json / supabase_seed.json"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.meta = {}
+        self.http = {}
+        self.llm = {}
+        self.seed = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def load(self):
+        for attr, name in [("meta", "meta.json"), ("http", "http.json"), ("llm", "llm.json"), ("seed", "supabase_seed.json")]:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                setattr(self, attr, json.load(f))
+        return self
+
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        for attr, name in [("meta", "meta.json"), ("http", "http.json"), ("llm", "llm.json"), ("seed", "supabase_seed.json")]:
+            with open(self._path(name), "w", encoding="utf-8") as f:
+                json.dump(getattr(self, attr), f, ensure_ascii=False, indent=1)
+
+    def add_http(self, method, url, entry):
+        with self._lock:
+            self.http[request_key(method, url)] = entry
+
+    def add_llm(self, prompt, response, elapsed):
+        with self._lock:
+            self.llm[prompt_hash(prompt)] = {"response": response, "elapsed": elapsed}
+
+
+def _build_response(status, body, headers):
+    res = requests.Response()
+    res.status_code = status
+    res._content = (body or "").encode("utf-8")
+    res.encoding = "utf-8"
+    res.headers.update(headers or {})
+    return res
+
+
+class Recorder:
+    """HttpClient transport: 실제로 요청을 보내고 응답(상태/헤더/본문/소요시간)을 기록합니다."""
+
+    def __init__(self, store, http_client, async_client=None):
+        self.store = store
+        self.http_client = http_client
+        self.async_client = async_client
+
+    def __call__(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            res = self.http_client.send(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            self.store.add_http(method, url, {"error": "timeout", "elapsed": time.perf_counter() - started})
+            raise
+        except requests.exceptions.RequestException as e:
+            self.store.add_http(method, url, {"error": str(e), "elapsed": time.perf_counter() - started})
+            raise
+
+        self._add(method, url, res, started)
+        return res
+
+    async def acall(self, method, url, **kwargs):
+        """AsyncHttpClient transport: 비동기 요청도 같은 기록 파일에 남깁니다."""
+        started = time.perf_counter()
+        try:
+            res = await self.async_client.send(method, url, **kwargs)
+        except requests.exceptions.Timeout:
+            self.store.add_http(method, url, {"error": "timeout", "elapsed": time.perf_counter() - started})
+            raise
+        except requests.exceptions.RequestException as e:
+            self.store.add_http(method, url, {"error": str(e), "elapsed": time.perf_counter() - started})
+            raise
+        self._add(method, url, res, started)
+        return res
+
+    def _add(self, method, url, res, started):
+        self.store.add_http(method, url, {
+            "status": res.status_code,
+            "headers": {"Content-Type": res.headers.get("Content-Type", "")},
+            "body": res.text if method.upper() != "HEAD" else "",
+            "elapsed": time.perf_counter() - started
+        })
+
+
+class Replayer:
+    """HttpClient transport: 기록된 응답을 돌려주고, Supabase REST는 인메모리 PostgREST로 보냅니다."""
+
+    def __init__(self, store, postgrest, latency=0.0):
+        self.store = store
+        self.postgrest = postgrest
+        self.latency = latency
+        self.misses = 0
+        self._supabase_host = urlparse(REPLAY_SUPABASE_URL).netloc
+
+    def __call__(self, method, url, **kwargs):
+        if urlparse(url).netloc == self._supabase_host:
+            return self.postgrest.handle_rest(method, url, kwargs.get("json"), kwargs.get("headers"))
+
+        entry = self.store.http.get(request_key(method, url))
+        if entry is not None and self.latency:
+            time.sleep(entry.get("elapsed", 0) * self.latency)
+        return self._respond(entry, url)
+
+    async def acall(self, method, url, **kwargs):
+        """AsyncHttpClient transport: 기록된 지연은 이벤트 루프를 막지 않는 asyncio.sleep으로 흉내냅니다."""
+        if urlparse(url).netloc == self._supabase_host:
+            return self.postgrest.handle_rest(method, url, kwargs.get("json"), kwargs.get("headers"))
+
+        entry = self.store.http.get(request_key(method, url))
+        if entry is not None and self.latency:
+            await asyncio.sleep(entry.get("elapsed", 0) * self.latency)
+        return self._respond(entry, url)
+
+    def _respond(self, entry, url):
+        if entry is None:
+            self.misses += 1
+            return _build_response(404, '{"message": "not recorded"}', {"Content-Type": "application/json"})
+        if entry.get("error") == "timeout":
+            raise requests.exceptions.Timeout(f"recorded timeout: {url}")
+        if entry.get("error"):
+            raise requests.exceptions.ConnectionError(entry["error"])
+        return _build_response(entry["status"], entry.get("body", ""), entry.get("headers"))
+
+
+def _install_llm_recorder(store):
+    from model_manager import ModelManager
+    original = ModelManager.generate_json
+    original_async = ModelManager.agenerate_json
+
+    def generate_json(self, prompt, *args, **kwargs):
+        started = time.perf_counter()
+        text = original(self, prompt, *args, **kwargs)
+        if text:
+            store.add_llm(prompt, text, time.perf_counter() - started)
+        return text
+
+    async def agenerate_json(self, prompt, *args, **kwargs):
+        started = time.perf_counter()
+        text = await original_async(self, prompt, *args, **kwargs)
+        if text:
+            store.add_llm(prompt, text, time.perf_counter() - started)
+        return text
+
+    ModelManager.generate_json = generate_json
+    ModelManager.agenerate_json = agenerate_json
+
+
+def _install_llm_replayer(store, latency, stats):
+    from model_manager import ModelManager
+
+    def lookup(prompt):
+        entry = store.llm.get(prompt_hash(prompt))
+        if entry is None:
+            stats["llm_misses"] += 1
+            print("⚠️ [Replay] LLM prompt was not recorded. Returning None.")
+        return entry
+
+    def generate_json(self, prompt, *args, **kwargs):
+        entry = lookup(prompt)
+        if entry and latency:
+            time.sleep(entry.get("elapsed", 0) * latency)
+        return entry["response"] if entry else None
+
+    async def agenerate_json(self, prompt, *args, **kwargs):
+        entry = lookup(prompt)
+        if entry and latency:
+            await asyncio.sleep(entry.get("elapsed", 0) * latency)
+        return entry["response"] if entry else None
+
+    ModelManager.generate_json = generate_json
+    ModelManager.agenerate_json = agenerate_json
+
+
+def _freeze_time(frozen_utc, modules):
+    """모듈들의 datetime을 기록 당시 시각에 멈춘 버전으로 교체합니다. (24시간 필터/날짜 파라미터 재현용)"""
+
+    class FrozenDateTime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return frozen_utc.astimezone(tz) if tz else frozen_utc.astimezone().replace(tzinfo=None)
+
+        @classmethod
+        def utcnow(cls):
+            return frozen_utc.astimezone(timezone.utc).replace(tzinfo=None)
+
+    for module in modules:
+        module.datetime = FrozenDateTime
+
+
+def _prepare_env(cache_dir, replay_env=None):
+    os.environ["SCRAPER_CACHE_DIR"] = cache_dir
+    os.environ["RUN_REPORT_DIR"] = os.path.join(cache_dir, "reports")
+    # 기록 때는 LLM 캐시를 꺼서 모든 프롬프트의 실제 응답이 남도록 합니다.
+    os.environ["LLM_CACHE"] = "0"
+    if replay_env is not None:
+        for name in REPLAY_ENV_KEYS:
+            os.environ.pop(name, None)
+        for name in replay_env:
+            os.environ[name] = "replay"
+        os.environ["SUPABASE_URL"] = REPLAY_SUPABASE_URL
+        os.environ["SUPABASE_KEY"] = "replay"
+
+
+def _run_job(app, mode, db, parallel, use_async=False):
+    if mode == "chart":
+        app.run_chart(db, parallel=parallel)
+    else:
+        app.run_news(db, parallel=parallel, use_async=use_async)
+
+
+def record(mode, directory, parallel=1, use_async=False):
+    store = FixtureStore(directory)
+    _prepare_env(tempfile.mkdtemp(prefix="replay-cache-"))
+
+    import main as app
+    from database import Database
+    from http_client import get_http_client
+    from async_http import get_async_http_client
+
+    db = Database()
+    if not db.client:
+        print("❌ [Record] Supabase connection is required for recording.")
+        return
+
+    store.meta = {
+        "mode": mode,
+        "frozen_at": datetime.now(timezone.utc).isoformat(),
+        "env_present": [name for name in REPLAY_ENV_KEYS if os.environ.get(name)],
+    }
+    store.seed = {table: db.client.table(table).select("*").execute().data for table in SEED_TABLES}
+
+    http = get_http_client()
+    recorder = Recorder(store, http, get_async_http_client())
+    http.transport = recorder
+    get_async_http_client().transport = recorder.acall
+    _install_llm_recorder(store)
+
+    _run_job(app, mode, db, parallel, use_async)
+    store.save()
+    print(f"\n📼 [Record] Saved {len(store.http)} HTTP exchanges and {len(store.llm)} LLM responses to {directory}")
+
+
+def replay(directory, parallel=1, latency=0.0, cache_dir=None, quiet=False, use_async=False):
+    """기록된 픽스처로 파이프라인을 오프라인 실행하고, 단계별 시간/요청 수를 돌려줍니다."""
+    store = FixtureStore(directory).load()
+    frozen = datetime.fromisoformat(store.meta["frozen_at"])
+    _prepare_env(cache_dir or tempfile.mkdtemp(prefix="replay-cache-"), replay_env=store.meta.get("env_present", []))
+
+    import main as app
+    import naver_api, chart_api, database, local_cache, http_client, async_http, image_validator, naver_search, naver_quota, instrumentation, retention
+    from fake_postgrest import FakePostgrest
+    from instrumentation import reset, stage_snapshot
+
+    # 반복 실행마다 캐시 폴더와 공용 싱글톤을 새로 시작 (이전 반복의 결과가 섞이지 않도록)
+    local_cache.CACHE_DIR = os.environ["SCRAPER_CACHE_DIR"]
+    instrumentation.REPORT_DIR = os.environ["RUN_REPORT_DIR"]
+    http_client._shared_client = None
+    async_http._shared_client = None
+    image_validator._shared_validator = None
+    naver_search._shared_search = None
+    naver_quota._shared_quota = None
+
+    _freeze_time(frozen, [app, naver_api, chart_api, database, retention, naver_quota])
+    postgrest = FakePostgrest(seed=store.seed, clock=lambda: frozen)
+    stats = {"llm_misses": 0}
+    transport = Replayer(store, postgrest, latency=latency)
+    http_client.get_http_client().transport = transport
+    async_http.get_async_http_client().transport = transport.acall
+    _install_llm_replayer(store, latency, stats)
+
+    reset()
+    started = time.perf_counter()
+    output = io.StringIO() if quiet else None
+    with (contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext()):
+        _run_job(app, store.meta["mode"], database.Database(client=postgrest), parallel, use_async)
+
+    return {
+        "total": time.perf_counter() - started,
+        "stages": stage_snapshot(),
+        "supabase_requests": postgrest.request_count,
+        "http_misses": transport.misses,
+        "llm_misses": stats["llm_misses"],
+        "tables": postgrest.tables,
+        "operations": dict(postgrest.operations),
+    }
+
+
+def bench(directory, repeat=3, parallel=1, latency=1.0, warm=False, use_async=False):
+    """같은 픽스처를 여러 번 재생해서 단계별 소요시간의 중앙값을 출력합니다."""
+    warm_dir = tempfile.mkdtemp(prefix="replay-cache-") if warm else None
+    runs = [replay(directory, parallel=parallel, latency=latency, cache_dir=warm_dir, quiet=True, use_async=use_async)
+            for _ in range(repeat)]
+
+    engine = "asyncio" if use_async else "threads"
+    print(f"\n⏱️ [Bench] {directory} ({engine}, repeat={repeat}, parallel={parallel}, latency x{latency}, {'warm' if warm else 'cold'} cache)")
+    print(f"  {'Stage':<32} {'Median(s)':>10} {'Min(s)':>8} {'Calls':>6}")
+    for name in sorted({name for run in runs for name in run["stages"]}):
+        totals = [run["stages"].get(name, {}).get("total", 0.0) for run in runs]
+        calls = runs[-1]["stages"].get(name, {}).get("count", 0)
+        print(f"  {name:<32} {statistics.median(totals):>10.2f} {min(totals):>8.2f} {calls:>6}")
+
+    totals = [run["total"] for run in runs]
+    print(f"  {'TOTAL':<32} {statistics.median(totals):>10.2f} {min(totals):>8.2f}")
+    last = runs[-1]
+    print(f"  Supabase requests: {last['supabase_requests']}, Unrecorded HTTP: {last['http_misses']}, Unrecorded LLM: {last['llm_misses']}")
+    return runs
+
+
+def _live_rows(tables):
+    # id/created_at은 실행마다 달라지므로 빼고 비교합니다.
+    return sorted(
+        (json.dumps({k: v for k, v in row.items() if k not in ("id", "created_at")}, ensure_ascii=False, sort_keys=True)
+         for row in tables.get("live_news", [])),
+    )
+
+
+def compare(directory, repeat=3, parallel=1, latency=1.0):
+    """스레드 파이프라인과 asyncio 파이프라인을 같은 픽스처로 벤치마크하고, 두 쪽의 live_news 결과가 같은지 확인합니다."""
+    threaded = bench(directory, repeat=repeat, parallel=parallel, latency=latency)
+    asynced = bench(directory, repeat=repeat, parallel=parallel, latency=latency, use_async=True)
+
+    same = _live_rows(threaded[-1]["tables"]) == _live_rows(asynced[-1]["tables"])
+    speedup = statistics.median(r["total"] for r in threaded) / max(statistics.median(r["total"] for r in asynced), 1e-9)
+    print(f"\n⚖️ [Compare] live_news rows identical: {'YES' if same else 'NO'} / asyncio speedup x{speedup:.2f}")
+    return same
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record/replay harness and offline benchmark for the scraper pipelines")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_record = sub.add_parser("record", help="run against live APIs and save fixtures")
+    p_record.add_argument("mode", choices=["news", "chart"])
+    p_record.add_argument("directory")
+    p_record.add_argument("--parallel", type=int, default=1)
+    p_record.add_argument("--async", dest="use_async", action="store_true", help="record the asyncio news pipeline")
+
+    p_replay = sub.add_parser("replay", help="run offline against saved fixtures")
+    p_replay.add_argument("directory")
+    p_replay.add_argument("--parallel", type=int, default=1)
+    p_replay.add_argument("--latency", type=float, default=0.0, help="scale of recorded latency to simulate (0 = none)")
+    p_replay.add_argument("--async", dest="use_async", action="store_true", help="replay with the asyncio news pipeline")
+
+    p_bench = sub.add_parser("bench", help="time each pipeline stage against saved fixtures")
+    p_bench.add_argument("directory")
+    p_bench.add_argument("--repeat", type=int, default=3)
+    p_bench.add_argument("--parallel", type=int, default=1)
+    p_bench.add_argument("--latency", type=float, default=1.0)
+    p_bench.add_argument("--warm", action="store_true", help="keep local caches between repeats")
+    p_bench.add_argument("--async", dest="use_async", action="store_true", help="bench the asyncio news pipeline")
+
+    p_compare = sub.add_parser("compare", help="bench threads vs asyncio news pipeline and check identical rows")
+    p_compare.add_argument("directory")
+    p_compare.add_argument("--repeat", type=int, default=3)
+    p_compare.add_argument("--parallel", type=int, default=1)
+    p_compare.add_argument("--latency", type=float, default=1.0)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.mode, args.directory, parallel=args.parallel, use_async=args.use_async)
+    elif args.command == "compare":
+        return 0 if compare(args.directory, repeat=args.repeat, parallel=args.parallel, latency=args.latency) else 1
+    elif args.command == "replay":
+        result = replay(args.directory, parallel=args.parallel, latency=args.latency, use_async=args.use_async)
+        print(f"\n📼 [Replay] Done in {result['total']:.2f}s (Supabase requests: {result['supabase_requests']}, "
+              f"Unrecorded HTTP: {result['http_misses']}, Unrecorded LLM: {result['llm_misses']})")
+    else:
+        bench(args.directory, repeat=args.repeat, parallel=args.parallel, latency=args.latency, warm=args.warm, use_async=args.use_async)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from instrumentation import count, span
+
+NEWS_MAX_ROWS = 50
+KCULTURE_MAX_ROWS = 15
+NEWS_MAX_AGE_HOURS = 7 * 24
+# 💡 search_archive는 웹(기사 상세 페이지, sitemap, 검색)이 영구 보관소로 읽으므로 기본은 삭제하지 않습니다.
+#    ARCHIVE_MAX_AGE_HOURS(예: 168)를 지정했을 때만 그보다 오래된 보관 기사를 지웁니다.
+ARCHIVE_MAX_AGE_HOURS = int(os.environ.get("ARCHIVE_MAX_AGE_HOURS") or 0) or None
+
+# 💡 보존 정책 표: (테이블, 카테고리)별 최대 행 수 / 최대 보관 시간. None이면 해당 제한 없음, category None은 테이블 전체.
+#    실행마다 서버 함수(supabase/migrations의 apply_retention) 1번 호출로 적용하고, 함수가 없으면 클라이언트에서 같은 규칙을 적용합니다.
+RETENTION_POLICY = [
+    *[{"table": "live_news", "category": cat, "max_rows": NEWS_MAX_ROWS, "max_age_hours": NEWS_MAX_AGE_HOURS}
+      for cat in ["k-pop", "k-movie", "k-drama", "k-entertain"]],
+    # K-Culture 매거진은 ChartAPI가 델타 업데이트로 관리하므로 개수 제한만 둡니다.
+    *[{"table": "live_news", "category": cat, "max_rows": KCULTURE_MAX_ROWS, "max_age_hours": None}
+      for cat in ["k-food", "k-beauty", "k-fashion", "k-lifestyle"]],
+    *([{"table": "search_archive", "category": None, "max_rows": None, "max_age_hours": ARCHIVE_MAX_AGE_HOURS}]
+      if ARCHIVE_MAX_AGE_HOURS else []),
+]
+
+# RETENTION_RPC=0이면 서버 함수 없이 바로 클라이언트 정리를 씁니다.
+USE_RPC = os.environ.get("RETENTION_RPC", "1") != "0"
+
+
+def _group(policy, field):
+    """같은 (테이블, 제한값)을 쓰는 카테고리끼리 묶어 요청 수를 줄입니다."""
+    groups = {}
+    for rule in policy:
+        if rule.get(field) is not None:
+            groups.setdefault((rule["table"], rule[field]), []).append(rule["category"])
+    return groups
+
+
+def _apply_client_side(db, policy):
+    """서버 함수가 없을 때의 대체 경로. 보관 시간은 묶음당 삭제 1번, 개수 제한은 테이블·제한값당 조회 1번 + 삭제 1번."""
+    results = []
+    now = datetime.now(timezone.utc)
+    for (table, hours), categories in _group(policy, "max_age_hours").items():
+        cutoff = (now - timedelta(hours=hours)).isoformat()
+        scoped = None if None in categories else categories
+        deleted = db.delete_older_than(table, cutoff, scoped)
+        results.append({"target_table": table, "category": ",".join(scoped or ["*"]), "deleted": deleted})
+    for (table, cap), categories in _group(policy, "max_rows").items():
+        deleted = db.trim_categories([c for c in categories if c], cap, table=table)
+        results.append({"target_table": table, "category": ",".join(c for c in categories if c), "deleted": deleted})
+    return results
+
+
+def enforce_retention(db, policy=RETENTION_POLICY):
+    """보존 정책을 한 번에 적용하고, 지운 행 수를 돌려줍니다."""
+    if not db.client:
+        return 0
+
+    print("\n🧹 [Retention] Applying retention policy...")
+    with span("db.retention", rules=len(policy)) as attrs:
+        results, mode = None, "rpc"
+        if USE_RPC:
+            try:
+                results = db.apply_retention(policy)
+            except Exception as e:
+                print(f"  ⚠️ [Retention] apply_retention RPC unavailable ({e}). Falling back to client-side cleanup.")
+        if results is None:
+            mode = "client"
+            results = _apply_client_side(db, policy)
+        attrs["mode"] = mode
+
+    deleted = 0
+    for row in results:
+        deleted += row.get("deleted") or 0
+        if row.get("deleted"):
+            print(f"  🗑️ {row['target_table']} [{row['category'] or '*'}]: {row['deleted']} rows removed")
+    count("db.retention_deleted", deleted, mode=mode)
+    print(f"  ✅ [Retention] {deleted} rows removed ({mode}).")
+    return deleted
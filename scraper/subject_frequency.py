@@ -0,0 +1,180 @@
+import os
+import re
+from collections import Counter
+
+from local_cache import JsonFileCache
+from text_normalize import mention_counts
+
+# 💡 학습한 별칭/검증 결과 보관 기간 (실행 간 유지되며 쓸 때마다 연장됩니다)
+ALIAS_TTL = 90 * 24 * 3600
+REJECT_TTL = 30 * 24 * 3600
+
+# 💡 LLM에 검증을 맡길 후보 수, 후보가 되기 위한 최소 언급 횟수
+CANDIDATE_LIMIT = int(os.environ.get("SUBJECT_CANDIDATE_LIMIT", "40"))
+MIN_MENTIONS = int(os.environ.get("SUBJECT_MIN_MENTIONS", "2"))
+
+# 💡 상위 후보 중 이미 검증된 주제의 비율이 이 값 이상이면 LLM 검증을 건너뜁니다. (1.0 초과로 두면 항상 LLM 검증)
+SKIP_LLM_RATIO = float(os.environ.get("SUBJECT_SKIP_LLM_RATIO", "0.9"))
+
+# 기본 별칭 사전 (영문/약칭 → 가장 많이 쓰이는 한국어 공식 명칭). 실행할 때마다 LLM 검증 결과로 늘어납니다.
+SEED_ALIASES = {
+    "bts": "방탄소년단",
+    "방탄": "방탄소년단",
+    "blackpink": "블랙핑크",
+    "newjeans": "뉴진스",
+    "aespa": "에스파",
+    "ive": "아이브",
+    "seventeen": "세븐틴",
+    "twice": "트와이스",
+    "le sserafim": "르세라핌",
+    "lesserafim": "르세라핌",
+    "stray kids": "스트레이 키즈",
+    "스키즈": "스트레이 키즈",
+    "nct": "NCT",
+    "iu": "아이유",
+}
+
+# 제목에 자주 나오지만 주제가 아닌 일반 단어
+STOPWORDS = {
+    "컴백", "방송", "결혼", "공개", "발표", "출연", "화제", "근황", "단독", "종합", "포토", "영상", "인터뷰",
+    "기자", "사진", "데뷔", "신곡", "앨범", "무대", "팬들", "팬", "소식", "논란", "해명", "사과", "열애",
+    "주연", "감독", "배우", "가수", "아이돌", "그룹", "멤버", "드라마", "영화", "예능", "시청률", "관객",
+    "개봉", "첫", "최초", "최고", "역대", "오늘", "내일", "어제", "이번", "올해", "공식", "축하", "눈길",
+    "시선", "강타", "등극", "돌파", "기록", "차트", "1위", "글로벌", "월드투어", "콘서트", "뮤직비디오",
+    "티저", "예고", "촬영", "현장", "미모", "비주얼", "솔로", "신인", "보이그룹", "걸그룹", "안방극장",
+    "the", "and", "mv", "ost", "kbs", "mbc", "sbs", "jtbc", "tvn",
+}
+
+# 토큰 끝에서 떼어낼 조사 (긴 것부터 검사)
+_PARTICLES = sorted([
+    "에게서", "으로서", "으로써", "에서는", "까지", "부터", "에서", "에게", "으로", "처럼", "보다", "라는",
+    "이라", "이며", "와의", "과의", "은", "는", "이", "가", "을", "를", "의", "와", "과", "도", "에", "로", "만",
+], key=len, reverse=True)
+
+_BRACKET_PATTERN = re.compile(r"\[[^\]]*\]|【[^】]*】|<[^>]*>|\([^)]*\)")
+_QUOTED_PATTERN = re.compile(r"[‘'\"“《〈「『]([^‘’'\"“”《》〈〉「」『』]{2,20})[’'\"”》〉」』]")
+_TOKEN_PATTERN = re.compile(r"[가-힣A-Za-z0-9]+(?:[&.'-][가-힣A-Za-z0-9]+)*")
+
+
+def _title_tokens(title):
+    body = _BRACKET_PATTERN.sub(" ", title)
+    return [t for t in _TOKEN_PATTERN.findall(body) if len(t) >= 2 and not t.isdigit()]
+
+
+def _strip_particle(token, vocabulary):
+    """끝의 조사를 뗍니다. 단, 뗀 형태가 다른 제목에 단독으로 나온 적이 있을 때만 ('김고은'이 '김고'가 되지 않도록)"""
+    if not re.match(r"[가-힣]", token[-1]):
+        return token
+    for particle in _PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            stem = token[:-len(particle)]
+            if stem in vocabulary:
+                return stem
+    return token
+
+
+def _title_terms(title, vocabulary):
+    """제목 1개에서 후보 용어(인용 구절, 1-gram, 2-gram)를 뽑습니다. 같은 제목 안의 중복은 한 번만 셉니다."""
+    terms = set()
+    for quoted in _QUOTED_PATTERN.findall(title):
+        quoted = quoted.strip()
+        if quoted:
+            terms.add(quoted)
+
+    tokens = [_strip_particle(t, vocabulary) for t in _title_tokens(title)]
+    for i, token in enumerate(tokens):
+        terms.add(token)
+        if i + 1 < len(tokens):
+            terms.add(f"{token} {tokens[i + 1]}")
+    return terms
+
+
+class SubjectFrequencyEngine:
+    """기사 제목에서 주제(인물/작품) 언급 횟수를 로컬에서 결정적으로 세는 엔진. 별칭 사전은 실행 간에 유지되며 점점 늘어납니다."""
+
+    def __init__(self, store=None):
+        self.store = store if store is not None else JsonFileCache("subject_aliases.json", ALIAS_TTL)
+
+    # ---------- 별칭 사전 ----------
+    def canonical(self, term):
+        folded = term.casefold()
+        return self.store.get(f"alias:{folded}") or SEED_ALIASES.get(folded) or term
+
+    def is_known(self, name):
+        return bool(self.store.get(f"subject:{name.casefold()}"))
+
+    def is_rejected(self, term):
+        folded = term.casefold()
+        return folded in STOPWORDS or bool(self.store.get(f"reject:{folded}"))
+
+    def aliases_of(self, name):
+        known = self.store.get(f"subject:{name.casefold()}") or []
+        seeded = [alias for alias, canonical in SEED_ALIASES.items() if canonical == name]
+        return sorted({name, *known, *seeded})
+
+    def learn(self, name, aliases=()):
+        """검증된 주제와 별칭을 사전에 기록합니다."""
+        forms = sorted({name, *[a for a in aliases if isinstance(a, str) and a.strip()]})
+        self.store.set(f"subject:{name.casefold()}", forms)
+        for form in forms:
+            if form.casefold() != name.casefold():
+                self.store.set(f"alias:{form.casefold()}", name)
+
+    def reject(self, term):
+        self.store.set(f"reject:{term.casefold()}", True, ttl=REJECT_TTL)
+
+    # ---------- 빈도 계산 ----------
+    def extract_candidates(self, titles, limit=CANDIDATE_LIMIT):
+        """제목 목록 → 언급 횟수 순 후보 [{"name", "mentions"}] (별칭은 공식 명칭으로 합산)"""
+        vocabulary = {token for title in titles for token in _title_tokens(title)}
+        counts = Counter()
+        for title in titles:
+            counts.update({self.canonical(term) for term in _title_terms(title, vocabulary)})
+
+        # 2-gram이 구성 단어와 거의 항상 함께 나오면 (예: '오징어 게임') 2-gram 하나로 봅니다.
+        absorbed = set()
+        for term, n in counts.items():
+            if " " not in term or n < MIN_MENTIONS:
+                continue
+            left, right = term.split(" ", 1)
+            if n >= 0.8 * counts[left] and n >= 0.8 * counts[right]:
+                absorbed.update((left, right))
+
+        forms_by_term = {}
+        for term, n in counts.items():
+            if n < MIN_MENTIONS or term in absorbed or self.is_rejected(term):
+                continue
+            if " " in term and any(self.is_rejected(part) for part in term.split(" ")):
+                continue
+            forms_by_term[term] = [f.casefold() for f in self.aliases_of(term)]
+        # 💡 모든 후보의 별칭을 한 매처에 넣고 제목들을 1번만 훑어서 셉니다. (후보 × 제목 반복 검사 대신)
+        merged = mention_counts([t.casefold() for t in titles], forms_by_term)
+
+        ranked = sorted(merged.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [{"name": name, "mentions": n} for name, n in ranked[:limit]]
+
+    def confidence(self, candidates, top_n=20):
+        """상위 후보 중 이미 검증된 주제의 비율 (0~1)"""
+        head = candidates[:top_n]
+        if not head:
+            return 0.0
+        return sum(1 for c in head if self.is_known(c["name"])) / len(head)
+
+    def rank(self, titles, subjects, top_n=20):
+        """검증된 주제 [{"name", "aliases"}] → 점수(언급 횟수 + 10) 순 [{"name", "score"}]"""
+        forms_by_index = {}
+        for i, subject in enumerate(subjects):
+            name = subject["name"]
+            forms_by_index[i] = {f.casefold() for f in self.aliases_of(name)} | {a.casefold() for a in subject.get("aliases", []) if isinstance(a, str)}
+        mentions_by_index = mention_counts([t.casefold() for t in titles], forms_by_index)
+
+        scored = {}
+        for i, subject in enumerate(subjects):
+            mentions = mentions_by_index[i]
+            if mentions > 0:
+                scored[subject["name"]] = max(scored.get(subject["name"], 0), mentions + 10)
+        ranked = sorted(scored.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [{"name": name, "score": score} for name, score in ranked[:top_n]]
+
+    def save(self):
+        self.store.save()
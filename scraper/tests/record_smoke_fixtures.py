@@ -0,0 +1,154 @@
+"""
+스모크 테스트용 작은 픽스처(tests/fixtures/news-smoke, chart-smoke)를 다시 만듭니다.
+
+  python tests/record_smoke_fixtures.py
+
+실제 API 대신 이 파일의 가짜 상위 서비스(네이버/KOBIS/TMDB/YouTube/LLM)를 replay.Recorder로 기록하므로
+키나 네트워크 없이 만들 수 있습니다. 프롬프트나 요청 형식을 바꿔서 스모크 테스트가 '기록 안 된 요청'으로 실패하면 다시 실행하세요.
+"""
+import os
+import re
+import sys
+import json
+import zlib
+import tempfile
+from datetime import datetime, timezone, timedelta
+from email.utils import format_datetime
+from urllib.parse import urlparse, parse_qsl
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = os.path.join(SCRAPER_DIR, "tests", "fixtures")
+sys.path.insert(0, SCRAPER_DIR)
+
+import replay
+
+NAMES = ["아이유", "뉴진스", "에스파", "김수현", "세븐틴"]
+FAKE_ENV = ["NAVER_CLIENT_ID", "NAVER_CLIENT_SECRET", "GROQ_API_KEY1", "KOBIS_API_KEY", "TMDB_API_KEY", "YOUTUBE_API_KEY"]
+
+
+def _stable(text):
+    # 실행마다 달라지는 hash() 대신 고정된 값
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def _seed(now):
+    """보존 정책(오래된 기사 삭제)과 K-Culture 업서트(기존 제목 갱신)가 실제로 일어나도록 넣어 두는 초기 행"""
+    old = (now - timedelta(days=10)).isoformat()
+    return {
+        "live_news": [
+            {"id": 9001, "category": "k-pop", "keyword": "옛날기사", "title": "[옛날기사] Old", "summary": "old",
+             "link": "", "image_url": "", "score": 1, "likes": 0, "created_at": old},
+            {"id": 9002, "category": "k-food", "keyword": "아이유", "title": "Trend 0", "summary": "old summary",
+             "link": "", "image_url": "https://img.example.com/seed.jpg", "score": 3, "likes": 0,
+             "amazon_keyword": "x", "created_at": now.isoformat()},
+        ],
+        "system_status": [],
+    }
+
+
+class FakeUpstream:
+    def __init__(self, now, postgrest):
+        self.now = now
+        self.postgrest = postgrest
+
+    def _news_items(self, query, display):
+        items = []
+        for i in range(min(display, 12)):
+            name = query if query in NAMES else NAMES[(_stable(query) + i) % len(NAMES)]
+            items.append({
+                "title": f"<b>{name}</b> 컴백 소식 {i} &amp; 화제",
+                "description": f"{name} 관련 기사 {i} 내용 &quot;설명&quot;",
+                "link": f"https://news.example.com/{_stable(query) % 997}/{i}",
+                "pubDate": format_datetime(self.now - timedelta(minutes=7 * i)),
+            })
+        return items
+
+    def send(self, http, method, url, **kwargs):
+        parsed = urlparse(url)
+        query = dict(parse_qsl(parsed.query))
+        if parsed.netloc == urlparse(replay.REPLAY_SUPABASE_URL).netloc:
+            return self.postgrest.handle_rest(method, url, kwargs.get("json"), kwargs.get("headers"))
+        if parsed.path.endswith("/news.json"):
+            return _json(200, {"items": self._news_items(query["query"], int(query.get("display", 10)))})
+        if parsed.path.endswith("/image"):
+            links = [f"https://img.example.com/{_stable(query['query']) % 997}/{i}.jpg" for i in range(int(query["display"]))]
+            return _json(200, {"items": [{"link": link} for link in links]})
+        if parsed.netloc == "img.example.com":
+            # 후보 0번은 항상 이미지가 아니라서 다음 후보로 넘어가는 경로도 기록됩니다.
+            ok = not url.endswith("/0.jpg")
+            return replay._build_response(200, "", {"Content-Type": "image/jpeg" if ok else "text/html"})
+        if "kobis" in parsed.netloc:
+            rows = [{"rank": str(i), "movieNm": f"영화{i}", "audiCnt": str(1000 * i)} for i in range(1, 6)]
+            return _json(200, {"boxOfficeResult": {"dailyBoxOfficeList": rows}})
+        if "themoviedb" in parsed.netloc:
+            return _json(200, {"results": [{"name": f"드라마{i}", "popularity": 50 - i} for i in range(5)]})
+        if "googleapis" in parsed.netloc:
+            items = [{"snippet": {"title": f"노래{i}", "channelTitle": "HYBE"}, "statistics": {"viewCount": str(1000 + i)}} for i in range(5)]
+            return _json(200, {"items": items})
+        return _json(404, {})
+
+
+def _json(status, payload):
+    return replay._build_response(status, json.dumps(payload, ensure_ascii=False), {"Content-Type": "application/json"})
+
+
+def fake_llm(model_manager, prompt, *args, **kwargs):
+    if "MAIN SUBJECTS" in prompt:
+        return json.dumps({"subjects": [{"name": n, "aliases": []} for n in NAMES], "rejected": ["컴백", "화제"]}, ensure_ascii=False)
+    if "### SUBJECT:" in prompt:
+        articles = [{"main_subject": n, "category": "k-pop", "title": f"[{n}] Big News", "summary": "S\n\n- a\n\nQ: Why is this trending?\nA: x"}
+                    for n in re.findall(r"### SUBJECT: (.+)", prompt)]
+        return json.dumps({"articles": articles}, ensure_ascii=False)
+    single = re.search(r"specifically about '([^']+)'", prompt)
+    if single:
+        n = single.group(1)
+        return json.dumps({"main_subject": n, "category": "k-pop", "title": f"[{n}] Big News", "summary": "S\n\n- a\n\nQ: Why is this trending?\nA: x"}, ensure_ascii=False)
+    if "Items to translate" in prompt:
+        items = json.loads(prompt.split("Items to translate/clean:")[1].strip())
+        return json.dumps({"items": [{"id": it["id"], "title": "EN " + it["title"], "info": it["info"]} for it in items]}, ensure_ascii=False)
+    if "K-Culture Magazine Editor" in prompt:
+        trends = [{"title": f"Trend {i}", "summary": "s", "keyword": NAMES[i % len(NAMES)], "amazon_keyword": "x", "score": 20 - i} for i in range(4)]
+        return json.dumps({"trends": trends}, ensure_ascii=False)
+    return None
+
+
+def record_fixture(mode, directory):
+    """mode(news/chart) 파이프라인을 가짜 상위 서비스로 1번 실행하며 directory에 픽스처를 기록합니다."""
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for name in FAKE_ENV:
+        os.environ[name] = "fixture"
+    replay._prepare_env(tempfile.mkdtemp(prefix="replay-cache-"))
+    os.environ["SUPABASE_URL"] = replay.REPLAY_SUPABASE_URL
+    os.environ["SUPABASE_KEY"] = "fixture"
+
+    import main as app
+    import database, http_client, model_manager
+    from fake_postgrest import FakePostgrest
+
+    store = replay.FixtureStore(directory)
+    store.meta = {"mode": mode, "frozen_at": now.isoformat(), "env_present": [n for n in replay.REPLAY_ENV_KEYS if os.environ.get(n)]}
+    store.seed = _seed(now)
+    postgrest = FakePostgrest(seed=store.seed, clock=lambda: now)
+    upstream = FakeUpstream(now, postgrest)
+
+    http_client.HttpClient.send = lambda http, method, url, **kwargs: upstream.send(http, method, url, **kwargs)
+    model_manager.ModelManager.generate_json = fake_llm
+    http = http_client.get_http_client()
+    http.transport = replay.Recorder(store, http)
+    replay._install_llm_recorder(store)
+
+    replay._run_job(app, mode, database.Database(client=postgrest), parallel=1)
+    # Supabase REST는 재생 때 인메모리 PostgREST가 처리하므로 기록에서 뺍니다.
+    store.http = {k: v for k, v in store.http.items() if replay.REPLAY_SUPABASE_URL not in k}
+    store.save()
+    print(f"📼 Saved {len(store.http)} HTTP exchanges and {len(store.llm)} LLM responses to {directory}")
+
+
+if __name__ == "__main__":
+    # 파이프라인 모듈의 전역 상태가 섞이지 않도록 모드마다 별도 프로세스로 기록합니다.
+    if len(sys.argv) > 1:
+        record_fixture(sys.argv[1], os.path.join(FIXTURE_DIR, f"{sys.argv[1]}-smoke"))
+    else:
+        import subprocess
+        for mode in ["news", "chart"]:
+            subprocess.run([sys.executable, os.path.abspath(__file__), mode], check=True)
@@ -0,0 +1,70 @@
+"""
+near_duplicate.py(shingle Jaccard 근접 중복 묶기, bottom-k 색인) 단위 테스트.
+
+  python -m unittest discover -s tests        # scraper/ 에서 실행
+"""
+import os
+import sys
+import unittest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+from near_duplicate import shingles, jaccard, cluster, dedupe_titles, select_snippets
+
+THRESHOLD = 0.8   # TITLE_THRESHOLD 기본값 (환경변수와 무관하게 고정)
+ORIGINAL = "아이유 새 앨범 발매 첫날 음원 차트 1위 석권 팬들 축하 이어져"
+# 통신사 재송고처럼 끝 단어만 빠진 제목 (Jaccard 0.87)
+TRIMMED = "아이유 새 앨범 발매 첫날 음원 차트 1위 석권 팬들 축하"
+# 중간 단어가 하나 빠진 다른 기사 (Jaccard 0.76)
+SHORTENED = "아이유 새 앨범 발매 첫날 차트 1위 석권 팬들 축하 이어져"
+
+
+class NearDuplicateTest(unittest.TestCase):
+    def test_pair_just_above_threshold_is_grouped(self):
+        similarity = jaccard(shingles(ORIGINAL), shingles(TRIMMED))
+        self.assertTrue(THRESHOLD <= similarity < 0.9, similarity)
+        self.assertEqual(cluster([ORIGINAL, TRIMMED], THRESHOLD), [[0, 1]])
+        self.assertEqual(dedupe_titles([ORIGINAL, TRIMMED], threshold=THRESHOLD), [ORIGINAL])
+
+    def test_pair_just_below_threshold_is_kept(self):
+        similarity = jaccard(shingles(ORIGINAL), shingles(SHORTENED))
+        self.assertTrue(0.7 < similarity < THRESHOLD, similarity)
+        self.assertEqual(cluster([ORIGINAL, SHORTENED], THRESHOLD), [[0], [1]])
+        self.assertEqual(dedupe_titles([ORIGINAL, SHORTENED], threshold=THRESHOLD), [ORIGINAL, SHORTENED])
+
+    def test_punctuation_and_spacing_only_difference_is_duplicate(self):
+        noisy = "아이유, 새 앨범 발매 첫날… 음원 차트 '1위' 석권!! 팬들  축하 이어져"
+        self.assertEqual(shingles(noisy), shingles(ORIGINAL))
+        self.assertEqual(dedupe_titles([noisy, ORIGINAL], threshold=THRESHOLD), [noisy])
+
+    def test_unrelated_titles_are_not_grouped(self):
+        titles = [ORIGINAL, "뉴진스 월드투어 서울 공연 전석 매진", "김수현 주연 드라마 시청률 두 자릿수 돌파"]
+        self.assertEqual(dedupe_titles(titles, threshold=THRESHOLD), titles)
+
+    def test_index_matches_brute_force_grouping(self):
+        # bottom-k 색인이 후보를 놓치지 않는지: 모든 쌍을 직접 비교한 결과(앞선 묶음에 붙이기)와 같아야 합니다.
+        base = ["아이유 새 앨범 발매", "뉴진스 컴백 무대 공개", "세븐틴 콘서트 티켓 오픈", "에스파 신곡 뮤직비디오"]
+        texts = [f"{b} {suffix}" for b in base for suffix in ["화제", "화제!", "관심 집중", "속보 화제"]]
+        threshold = 0.6
+        sets = [shingles(t) for t in texts]
+        expected, owner = [], []
+        for i, s in enumerate(sets):
+            match = next((j for j in range(i) if jaccard(s, sets[j]) >= threshold), None)
+            if match is None:
+                owner.append(len(expected))
+                expected.append([i])
+            else:
+                owner.append(owner[match])
+                expected[owner[match]].append(i)
+        self.assertEqual(cluster(texts, threshold), expected)
+
+    def test_select_snippets_keeps_longest_of_each_group(self):
+        short = "아이유 새 앨범 발매 첫날 음원 차트 1위"
+        longer = "아이유 새 앨범 발매 첫날 음원 차트 1위 석권"
+        other = "뉴진스 월드투어 서울 공연 전석 매진"
+        self.assertEqual(select_snippets([short, other, longer], threshold=0.6), [longer, other])
+
+
+if __name__ == "__main__":
+    unittest.main()
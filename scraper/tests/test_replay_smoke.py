@@ -0,0 +1,63 @@
+"""
+기록/재생 하네스(replay.py + fake_postgrest.py) 스모크 테스트.
+
+  python -m unittest discover -s tests        # scraper/ 에서 실행
+
+tests/fixtures의 작은 픽스처를 네트워크 없이 재생합니다. 픽스처를 다시 만들려면 tests/record_smoke_fixtures.py를 실행하세요.
+"""
+import os
+import io
+import sys
+import unittest
+import contextlib
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+import replay
+
+NEWS_FIXTURE = os.path.join(SCRAPER_DIR, "tests", "fixtures", "news-smoke")
+CHART_FIXTURE = os.path.join(SCRAPER_DIR, "tests", "fixtures", "chart-smoke")
+
+
+class ReplaySmokeTest(unittest.TestCase):
+    def _replay(self, directory, **kwargs):
+        result = replay.replay(directory, quiet=True, **kwargs)
+        # 기록에 없는 요청이 있으면 프롬프트/요청 형식이 바뀐 것이므로 픽스처를 다시 만들어야 합니다.
+        self.assertEqual(result["http_misses"], 0)
+        self.assertEqual(result["llm_misses"], 0)
+        return result
+
+    def test_news_replay(self):
+        result = self._replay(NEWS_FIXTURE)
+        rows = result["tables"]["live_news"]
+        self.assertTrue([row for row in rows if row["title"].endswith("Big News")])
+        # 10일 지난 seed 기사는 apply_retention RPC가 지웁니다.
+        self.assertNotIn(9001, [row["id"] for row in rows])
+        self.assertIn("filter:in", result["operations"])
+        self.assertIn("rpc:apply_retention", result["operations"])
+
+    def test_news_async_replay_matches_threads(self):
+        threaded = self._replay(NEWS_FIXTURE)
+        asynced = self._replay(NEWS_FIXTURE, use_async=True)
+        self.assertEqual(replay._live_rows(threaded["tables"]), replay._live_rows(asynced["tables"]))
+
+    def test_compare_reports_identical_rows(self):
+        # replay.py compare와 같은 경로: 스레드/asyncio 벤치를 돌리고 두 쪽의 live_news가 같아야 YES
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            same = replay.compare(NEWS_FIXTURE, repeat=1, latency=0.0)
+        self.assertTrue(same, output.getvalue()[-2000:])
+        self.assertIn("rows identical: YES", output.getvalue())
+
+    def test_chart_replay_upserts_existing_trend(self):
+        result = self._replay(CHART_FIXTURE)
+        self.assertIn("upsert:id", result["operations"])
+        self.assertIn("rpc:apply_retention", result["operations"])
+        # 제목이 같은 기존 K-Culture 트렌드는 새 행을 만들지 않고 merge-duplicates 업서트로 갱신됩니다.
+        seeded = [row for row in result["tables"]["live_news"] if (row["category"], row["title"]) == ("k-food", "Trend 0")]
+        self.assertEqual([row["id"] for row in seeded], [9002])
+        self.assertEqual(seeded[0]["summary"], "s")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+subject_frequency.py(제목 기반 주제 후보 추출/순위) 단위 테스트.
+
+  python -m unittest discover -s tests        # scraper/ 에서 실행
+"""
+import io
+import os
+import sys
+import unittest
+import contextlib
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+from local_cache import JsonFileCache
+from subject_frequency import SubjectFrequencyEngine, ALIAS_TTL, _strip_particle, _title_terms
+
+
+def _engine():
+    # 메모리 전용 사전 (실행 간 캐시 파일을 건드리지 않음)
+    return SubjectFrequencyEngine(JsonFileCache("subject_aliases.json", ALIAS_TTL, persist=False))
+
+
+class ParticleStripTest(unittest.TestCase):
+    def test_strips_particle_when_stem_appears_alone(self):
+        vocabulary = {"아이유", "뉴진스"}
+        self.assertEqual(_strip_particle("아이유가", vocabulary), "아이유")
+        self.assertEqual(_strip_particle("뉴진스와의", vocabulary), "뉴진스")
+        self.assertEqual(_strip_particle("아이유에게서", vocabulary), "아이유")
+
+    def test_keeps_token_when_stem_is_unseen(self):
+        # '김고은'의 '은'은 조사가 아니므로, '김고'가 따로 나온 적이 없으면 그대로 둡니다.
+        self.assertEqual(_strip_particle("김고은", {"김고은"}), "김고은")
+        self.assertEqual(_strip_particle("아이유가", set()), "아이유가")
+        # 한 글자만 남는 경우와 영문 토큰은 건드리지 않습니다.
+        self.assertEqual(_strip_particle("진이", {"진"}), "진이")
+        self.assertEqual(_strip_particle("BTS", {"BT"}), "BTS")
+
+    def test_title_terms_use_stripped_tokens(self):
+        terms = _title_terms("[단독] 아이유가 밝힌 '러브 윈즈 올' 비하인드", {"아이유"})
+        self.assertIn("아이유", terms)
+        self.assertNotIn("아이유가", terms)
+        self.assertIn("러브 윈즈 올", terms)
+        self.assertNotIn("단독", terms)
+
+    def test_candidates_merge_particle_forms(self):
+        titles = ["아이유 새 앨범 발매", "아이유가 밝힌 비하인드", "아이유의 콘서트 현장", "뉴진스 하니 팬미팅"]
+        candidates = {c["name"]: c["mentions"] for c in _engine().extract_candidates(titles)}
+        self.assertEqual(candidates.get("아이유"), 3)
+        self.assertNotIn("아이유가", candidates)
+
+
+class BigramAbsorptionTest(unittest.TestCase):
+    def test_bigram_absorbs_words_that_always_appear_together(self):
+        titles = [
+            "오징어 게임 시즌3 공개 일주일 만에 1위",
+            "넷플릭스 오징어 게임 흥행 비결",
+            "오징어 게임 이정재 인터뷰",
+            "아이유 새 앨범 발매",
+            "아이유 콘서트 매진",
+        ]
+        names = [c["name"] for c in _engine().extract_candidates(titles)]
+        self.assertIn("오징어 게임", names)
+        self.assertNotIn("오징어", names)
+        self.assertNotIn("게임", names)
+        self.assertIn("아이유", names)
+
+    def test_word_used_elsewhere_is_not_absorbed(self):
+        titles = [
+            "오징어 게임 시즌3 공개",
+            "오징어 게임 흥행 비결",
+            "모바일 게임 매출 순위",
+            "게임 업계 신작 발표",
+            "신작 게임 사전예약",
+        ]
+        names = [c["name"] for c in _engine().extract_candidates(titles)]
+        self.assertIn("오징어 게임", names)
+        # '게임'은 5번 중 2번만 '오징어 게임'이므로 흡수하지 않고, 그러면 두 단어 모두 따로 셉니다.
+        self.assertIn("게임", names)
+        self.assertIn("오징어", names)
+
+    def test_learned_alias_is_counted_under_canonical_name(self):
+        engine = _engine()
+        engine.learn("아이유", ["IU", "이지은"])
+        titles = ["IU 새 앨범", "이지은 주연 영화", "아이유 콘서트"]
+        ranked = engine.rank(titles, [{"name": "아이유", "aliases": []}])
+        self.assertEqual(ranked, [{"name": "아이유", "score": 13}])
+
+
+class FallbackTest(unittest.TestCase):
+    """LLM 검증이 실패했을 때(NaverNewsAPI._finish_rank) 이미 검증된 주제만 남는지"""
+
+    def setUp(self):
+        from naver_api import NaverNewsAPI
+        self.api = object.__new__(NaverNewsAPI)   # 네트워크/키가 필요한 __init__ 없이 순위 단계만 사용
+        self.api.subject_engine = _engine()
+        self.titles = ["아이유 컴백 확정", "아이유 새 앨범", "뉴진스 컴백 무대", "컴백 소식 화제"]
+
+    def _finish_rank(self, candidates):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.api._finish_rank(self.titles, candidates, None)
+
+    def test_returns_only_known_subjects(self):
+        self.api.subject_engine.learn("아이유")
+        candidates = [{"name": "컴백", "mentions": 3}, {"name": "아이유", "mentions": 2}, {"name": "뉴진스", "mentions": 1}]
+        self.assertEqual(self._finish_rank(candidates), [{"name": "아이유", "score": 12}])
+
+    def test_returns_nothing_without_known_subjects(self):
+        candidates = [{"name": "컴백", "mentions": 3}, {"name": "화제", "mentions": 1}]
+        self.assertEqual(self._finish_rank(candidates), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
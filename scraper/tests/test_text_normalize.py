@@ -0,0 +1,103 @@
+"""
+text_normalize.py(네이버 항목 정리, Aho–Corasick 다중 패턴 매처) 단위 테스트.
+
+  python -m unittest discover -s tests        # scraper/ 에서 실행
+"""
+import os
+import re
+import sys
+import unittest
+
+SCRAPER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_DIR)
+
+from text_normalize import MultiPatternMatcher, mention_counts, clean_items
+
+TITLES = [
+    "아이유, 새 앨범 'The Winning' 발매 첫날 음원 차트 1위",
+    "IVE 장원영, 파리 패션위크 참석… 아이브 해외 팬들 환호",
+    "FIVE 멤버 개인 활동 시작 (아이브와 무관)",
+    "아이유가 직접 밝힌 콘서트 비하인드",
+    "NewJeans 뉴진스 하니, 일본 도쿄돔 팬미팅 매진",
+    "뉴진스의 새 뮤직비디오 공개 하루 만에 1000만 뷰",
+    "에스파 aespa 'Supernova' 빌보드 진입",
+    "BTS 진, 전역 후 첫 예능 출연 ... bts 팬덤 아미 들썩",
+    "IVEs 라는 이름의 신인 그룹 데뷔",
+    "live 공연 실황 공개, 라이브 무대 화제",
+]
+
+FORMS = {
+    "아이유": ["아이유", "iu"],
+    "아이브": ["아이브", "ive"],
+    "뉴진스": ["뉴진스", "newjeans"],
+    "에스파": ["에스파", "aespa"],
+    "BTS": ["bts", "방탄소년단"],
+}
+
+
+def _old_form_pattern(form):
+    # 다중 패턴 매처 이전의 주제별 정규식 검사 (영문/숫자로 시작·끝나는 별칭만 단어 경계)
+    pattern = re.escape(form)
+    if re.match(r"[a-z0-9]", form[0]):
+        pattern = r"(?<![a-z0-9])" + pattern
+    if re.match(r"[a-z0-9]", form[-1]):
+        pattern += r"(?![a-z0-9])"
+    return pattern
+
+
+def _old_mentions(titles_folded, forms):
+    matcher = re.compile("|".join(_old_form_pattern(f) for f in sorted(set(forms))))
+    return sum(1 for title in titles_folded if matcher.search(title))
+
+
+class MultiPatternMatcherTest(unittest.TestCase):
+    def test_overlapping_patterns_report_every_key(self):
+        # 한 패턴이 다른 패턴의 접두/접미/부분이어도 모두 찾습니다. (실패 링크의 출력 합치기)
+        matcher = MultiPatternMatcher({"뉴진스": "A", "진스": "B", "뉴진": "C", "스하니": "D"})
+        self.assertEqual(matcher.search("뉴진스하니"), {"A", "B", "C", "D"})
+        self.assertEqual(matcher.search("진스"), {"B"})
+
+    def test_same_key_from_several_aliases(self):
+        matcher = MultiPatternMatcher([("아이브", "ive"), ("ive", "ive")])
+        self.assertEqual(matcher.search("아이브 ive"), {"ive"})
+        self.assertEqual(matcher.count(["아이브 컴백", "ive 컴백", "아이브(ive)", "무관"]), {"ive": 3})
+
+    def test_ascii_forms_need_word_boundaries(self):
+        matcher = MultiPatternMatcher({"ive": "ive"})
+        self.assertEqual(matcher.search("ive 컴백"), {"ive"})
+        self.assertEqual(matcher.search("신곡(ive) 공개"), {"ive"})
+        self.assertEqual(matcher.search("아이브ive"), {"ive"})   # 한글은 경계로 봅니다.
+        for text in ["ives 데뷔", "five 멤버", "live 공연", "ive2 유닛"]:
+            self.assertEqual(matcher.search(text), set(), text)
+
+    def test_hangul_forms_match_with_particles(self):
+        matcher = MultiPatternMatcher({"아이유": "iu", "뉴진스": "nj"})
+        for text in ["아이유가 컴백", "아이유의 신곡", "아이유는", "뉴진스와 아이유"]:
+            self.assertTrue(matcher.search(text), text)
+        self.assertEqual(matcher.search("뉴진스와 아이유"), {"iu", "nj"})
+
+    def test_mention_counts_match_old_regex_check(self):
+        folded = [t.casefold() for t in TITLES]
+        expected = {key: _old_mentions(folded, [f.casefold() for f in forms]) for key, forms in FORMS.items()}
+        self.assertEqual(mention_counts(folded, FORMS), expected)
+        self.assertEqual(expected, {"아이유": 2, "아이브": 2, "뉴진스": 2, "에스파": 1, "BTS": 1})
+
+    def test_mention_counts_differ_from_plain_substring_only_on_ascii_boundaries(self):
+        # 예전 스니펫 모으기의 단순 부분 문자열 검사는 'ives'/'live' 같은 단어 안에서도 'ive'를 셌습니다.
+        folded = [t.casefold() for t in TITLES]
+        substring = {key: sum(1 for t in folded if any(f in t for f in forms)) for key, forms in FORMS.items()}
+        counts = mention_counts(folded, FORMS)
+        self.assertEqual(substring["아이브"] - counts["아이브"], 2)   # 'ives', 'live' 제목
+        self.assertEqual({k: v for k, v in substring.items() if k != "아이브"}, {k: v for k, v in counts.items() if k != "아이브"})
+
+
+class CleanItemsTest(unittest.TestCase):
+    def test_strips_tags_and_entities_once(self):
+        items = clean_items([{"title": "<b>아이유</b> &amp; IVE", "description": "&quot;컴백&quot;"}])
+        self.assertEqual(items[0]["clean_title"], "아이유 & IVE")
+        self.assertEqual(items[0]["clean_description"], '"컴백"')
+        self.assertEqual(items[0]["folded"], '아이유 & ive\n"컴백"')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import re
+import html
+from collections import Counter
+
+# 💡 네이버 검색 결과의 <b> 강조 태그 등을 지우는 패턴 (모듈 로드 때 1번만 컴파일)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# 네이버 items에서 정리할 필드
+ITEM_FIELDS = ("title", "description")
+
+
+def clean_text(text):
+    """HTML 엔티티를 풀고 태그를 지운 문자열"""
+    return _TAG_PATTERN.sub("", html.unescape(text or ""))
+
+
+def clean_items(items, fields=ITEM_FIELDS):
+    """네이버 items 묶음을 한 번에 정리합니다. 정리된 값(clean_title 등)과 소문자화한 본문(folded)을 항목에 붙여 두므로
+    같은 응답을 여러 단계/카테고리가 다시 써도 정리는 처음 1번만 합니다. 같은 리스트를 돌려줍니다."""
+    for item in items:
+        if "folded" in item:
+            continue
+        cleaned = [clean_text(item.get(field)) for field in fields]
+        for field, value in zip(fields, cleaned):
+            item[f"clean_{field}"] = value
+        # 필드 사이에 줄바꿈을 넣어 제목 끝과 요약 앞이 이어져 우연히 매칭되지 않게 합니다.
+        item["folded"] = "\n".join(cleaned).casefold()
+    return items
+
+
+def _is_word_char(ch):
+    return "a" <= ch <= "z" or "0" <= ch <= "9"
+
+
+class MultiPatternMatcher:
+    """Aho–Corasick 다중 패턴 매처. 여러 주제의 별칭을 한 번에 등록해 두고, 문서를 1번 훑어서 등장한 주제(key)를 모두 찾습니다.
+    패턴은 소문자(casefold)로 등록하고 소문자 문서에 씁니다. 영문/숫자로 시작·끝나는 패턴은 단어 경계에서만 인정합니다
+    ('ive'가 'live'에 걸리지 않도록). 한글은 조사가 붙으므로 부분 일치."""
+
+    def __init__(self, patterns):
+        # patterns: {패턴: key} 또는 (패턴, key) 목록
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for form, key in (patterns.items() if isinstance(patterns, dict) else patterns):
+            if form:
+                self._add(form, key)
+        self._build()
+
+    def _add(self, form, key):
+        state = 0
+        for ch in form:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(form), key, _is_word_char(form[0]), _is_word_char(form[-1])))
+
+    def _build(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def search(self, text):
+        """text에 등장한 key 집합"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state, last = 0, len(text) - 1
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, key, word_start, word_end in out[state]:
+                if key in found:
+                    continue
+                start = i - length + 1
+                if word_start and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if word_end and i < last and _is_word_char(text[i + 1]):
+                    continue
+                found.add(key)
+        return found
+
+    def count(self, texts):
+        """key별로 key가 등장한 문서 수 (문서당 1회)"""
+        counts = Counter()
+        for text in texts:
+            counts.update(self.search(text))
+        return counts
+
+
+def mention_counts(texts_folded, forms_by_key):
+    """{key: [별칭...]}의 각 key가 언급된 문서 수를 문서들을 1번씩만 훑어서 셉니다."""
+    matcher = MultiPatternMatcher([(form, key) for key, forms in forms_by_key.items() for form in set(forms) if form])
+    counts = matcher.count(texts_folded)
+    return {key: counts.get(key, 0) for key in forms_by_key}
@@ -0,0 +1,88 @@
+import os
+import asyncio
+import functools
+import re
+import json
+
+_HANGUL_PATTERN = re.compile(r"[가-힣ㄱ-ㅎㅏ-ㅣ]")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text):
+    """토크나이저 없이 토큰 수를 보수적으로 추정합니다. (한글은 글자당 약 1토큰, 그 외는 4글자당 약 1토큰)"""
+    if not text:
+        return 0
+    hangul = len(_HANGUL_PATTERN.findall(text))
+    other = len(_SPACE_PATTERN.sub("", text)) - hangul
+    return hangul + (other + 3) // 4
+
+
+# 💡 모델 계열별 컨텍스트 길이(입력+출력 토큰). 동적으로 고른 모델마다 다르므로 작은 쪽에 맞춰 보수적으로 잡습니다.
+CONTEXT_TOKENS = {"groq": 8192, "gemini": 32768}
+MAX_OUTPUT_TOKENS = 4000
+SAFETY_RATIO = 0.9   # 추정 오차 여유분
+
+
+def prompt_budget(family="groq"):
+    """프롬프트(입력)에 쓸 수 있는 토큰 수. LLM_PROMPT_TOKEN_BUDGET 환경변수로 직접 지정할 수 있습니다."""
+    override = os.environ.get("LLM_PROMPT_TOKEN_BUDGET")
+    if override:
+        return int(override)
+    return int((CONTEXT_TOKENS.get(family, CONTEXT_TOKENS["groq"]) - MAX_OUTPUT_TOKENS) * SAFETY_RATIO)
+
+
+def _render_item(item):
+    return item if isinstance(item, str) else json.dumps(item, ensure_ascii=False)
+
+
+def chunk_items(items, make_prompt, budget=None, item_budget=None):
+    """make_prompt(묶음)으로 만든 프롬프트가 예산을 넘지 않도록 items를 순서대로 여러 묶음으로 나눕니다.
+    item_budget을 주면 묶음 안 항목들의 토큰 합도 그 이하로 맞춥니다. (응답이 입력 크기에 비례하는 번역 등)"""
+    budget = budget or prompt_budget()
+    room = budget - estimate_tokens(make_prompt([]))
+    if item_budget:
+        room = min(room, item_budget)
+
+    chunks, current, used = [], [], 0
+    for item in items:
+        cost = estimate_tokens(_render_item(item)) + 2   # 구분자(쉼표/따옴표) 몫
+        if current and used + cost > room:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def fit_items(items, make_prompt, budget=None):
+    """예산 안에 들어가는 앞쪽 항목들만 돌려줍니다. (넘치는 뒤쪽은 버림)"""
+    chunks = chunk_items(items, make_prompt, budget)
+    return chunks[0] if chunks else []
+
+
+def _chunk_validator(validate, chunk):
+    # validate(묶음, 응답 텍스트) → generate_json이 받는 validate(응답 텍스트)
+    return functools.partial(validate, chunk) if validate else None
+
+
+def generate_chunked(model_manager, items, make_prompt, budget=None, item_budget=None, validate=None):
+    """map 단계: 묶음마다 LLM을 호출하고 [(묶음, 응답 텍스트)]를 돌려줍니다. 합치는(reduce) 방법은 호출부가 정합니다.
+    validate(묶음, 응답 텍스트)가 주어지면 True인 응답만 LLM 캐시에 남깁니다."""
+    chunks = chunk_items(items, make_prompt, budget, item_budget)
+    if len(chunks) > 1:
+        print(f"    ✂️ [PromptBudget] Split {len(items)} items into {len(chunks)} prompts to fit the token budget.")
+    return [(chunk, model_manager.generate_json(prompt=make_prompt(chunk), validate=_chunk_validator(validate, chunk)))
+            for chunk in chunks]
+
+
+async def agenerate_chunked(model_manager, items, make_prompt, budget=None, item_budget=None, validate=None):
+    """generate_chunked()의 asyncio 버전. 묶음들을 동시에 요청하고 결과는 묶음 순서대로 돌려줍니다."""
+    chunks = chunk_items(items, make_prompt, budget, item_budget)
+    if len(chunks) > 1:
+        print(f"    ✂️ [PromptBudget] Split {len(items)} items into {len(chunks)} prompts to fit the token budget.")
+    responses = await asyncio.gather(*(
+        model_manager.agenerate_json(prompt=make_prompt(chunk), validate=_chunk_validator(validate, chunk)) for chunk in chunks
+    ))
+    return list(zip(chunks, responses))
@@ -0,0 +1,68 @@
+-- 보존 정책(테이블/카테고리별 최대 행 수, 최대 보관 시간)을 서버에서 한 번에 적용하는 함수.
+-- 정책 목록은 scraper/retention.py의 RETENTION_POLICY가 인자로 넘겨줍니다.
+-- 행을 지우는 함수이므로 스크레이퍼가 쓰는 service_role 키로만 호출할 수 있습니다. (anon 키로는 실행 불가)
+--
+--   select * from apply_retention('[
+--     {"table": "live_news", "category": "k-pop", "max_rows": 50, "max_age_hours": 168},
+--     {"table": "live_news", "category": "k-food", "max_rows": 15, "max_age_hours": null}
+--   ]'::jsonb);
+--
+-- search_archive는 영구 보관소라 기본 정책에는 없고, 스크레이퍼에 ARCHIVE_MAX_AGE_HOURS를 지정했을 때만 규칙이 넘어옵니다.
+
+create index if not exists live_news_category_created_at_idx on public.live_news (category, created_at desc);
+create index if not exists search_archive_created_at_idx on public.search_archive (created_at);
+
+create or replace function public.apply_retention(policy jsonb)
+returns table (target_table text, category text, deleted bigint)
+language plpgsql
+set search_path = public
+as $$
+declare
+    rule jsonb;
+    rule_table text;
+    rule_category text;
+    max_rows integer;
+    max_age_hours numeric;
+    removed bigint;
+begin
+    for rule in select * from jsonb_array_elements(policy)
+    loop
+        rule_table := rule->>'table';
+        rule_category := rule->>'category';
+        max_rows := (rule->>'max_rows')::integer;
+        max_age_hours := (rule->>'max_age_hours')::numeric;
+        removed := 0;
+
+        -- 정책이 클라이언트에서 오므로 테이블 이름은 허용 목록으로만 받습니다.
+        if rule_table not in ('live_news', 'search_archive') then
+            raise exception 'apply_retention: table % is not managed', rule_table;
+        end if;
+
+        if max_age_hours is not null then
+            execute format(
+                'with gone as (delete from public.%I where created_at < now() - make_interval(secs => $1 * 3600)
+                               and ($2::text is null or category = $2) returning 1)
+                 select count(*) from gone', rule_table)
+            into removed using max_age_hours, rule_category;
+        end if;
+
+        if max_rows is not null then
+            execute format(
+                'with gone as (delete from public.%I where id in (
+                     select id from public.%I where ($1::text is null or category = $1)
+                     order by created_at desc, id desc offset $2) returning 1)
+                 select count(*) + $3 from gone', rule_table, rule_table)
+            into removed using rule_category, max_rows, removed;
+        end if;
+
+        target_table := rule_table;
+        category := rule_category;
+        deleted := removed;
+        return next;
+    end loop;
+end;
+$$;
+
+-- 함수는 기본적으로 PUBLIC에 실행 권한이 열려 있으므로 먼저 모두 거두고 service_role에만 줍니다.
+revoke execute on function public.apply_retention(jsonb) from public, anon, authenticated;
+grant execute on function public.apply_retention(jsonb) to service_role;